@@ -0,0 +1,79 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.core.handler import ColorHandler
+from smartlogger.core.async_handler import AsyncColorHandler
+
+RECORDS = 5000
+TICK = 0.001
+
+def slow_consumer(fd, stop):
+    while not stop.is_set():
+        try:
+            if not os.read(fd, 4096):
+                return
+        except OSError:
+            return
+        time.sleep(0.002)
+
+async def measure(handler_factory):
+    read_fd, write_fd = os.pipe()
+    stream = os.fdopen(write_fd, 'w')
+    stop = threading.Event()
+    reader = threading.Thread(target=slow_consumer, args=(read_fd, stop), daemon=True)
+    reader.start()
+    
+    handler = handler_factory(stream)
+    lags = []
+    producing = True
+    
+    async def ticker():
+        loop = asyncio.get_running_loop()
+        while producing:
+            expected = loop.time() + TICK
+            await asyncio.sleep(TICK)
+            lags.append(max(0.0, loop.time() - expected))
+    
+    async def producer():
+        for i in range(RECORDS):
+            handler.handle(logging.LogRecord('bench', logging.INFO, __file__, 1, 'request %d %s', (i, 'x' * 120), None))
+            if i % 10 == 0:
+                await asyncio.sleep(0)
+    
+    tick_task = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await producer()
+    elapsed = time.perf_counter() - start
+    producing = False
+    await tick_task
+    
+    if isinstance(handler, AsyncColorHandler):
+        await handler.aclose()
+    else:
+        handler.close()
+    stop.set()
+    stream.close()
+    os.close(read_fd)
+    
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+    return elapsed, p99, lags[-1] if lags else 0.0
+
+def main():
+    cases = [
+        ('ColorHandler (blocking)', lambda stream: ColorHandler(stream)),
+        ('AsyncColorHandler thread', lambda stream: AsyncColorHandler(stream)),
+        ('AsyncColorHandler nonblock', lambda stream: AsyncColorHandler(stream, nonblocking=True)),
+    ]
+    for label, factory in cases:
+        elapsed, p99, worst = asyncio.run(measure(factory))
+        print(f"{label:28} producer {elapsed * 1e3:8.1f} ms  loop lag p99 {p99 * 1e3:7.2f} ms  max {worst * 1e3:7.2f} ms")
+
+if __name__ == '__main__':
+    main()
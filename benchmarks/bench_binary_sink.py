@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+import time
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.core.binary_sink import BinaryLogHandler, BinaryLogReader, index_path
+from smartlogger.config.defaults import DEFAULT_FORMAT
+
+RECORDS = 200000
+NAMES = ['app.api', 'app.db', 'app.cache', 'app.worker']
+TEMPLATES = [
+    ('request %s %s took %dms', lambda i: ('GET', '/users/%d' % (i % 5000), i % 900)),
+    ('cache miss for key %s', lambda i: ('session:%08x' % i,)),
+    ('query returned %d rows in %.3fs', lambda i: (i % 250, (i % 97) / 1000)),
+]
+
+def make_records():
+    records = []
+    for i in range(RECORDS):
+        msg, args = TEMPLATES[i % len(TEMPLATES)]
+        records.append(logging.LogRecord(NAMES[i % len(NAMES)], logging.INFO, __file__, 1, msg, args(i), None))
+    return records
+
+def run(handler, records):
+    start = time.perf_counter()
+    for record in records:
+        handler.handle(record)
+    handler.close()
+    return RECORDS / (time.perf_counter() - start)
+
+def main():
+    records = make_records()
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'app.log')
+        binary_path = os.path.join(directory, 'app.slog')
+        
+        text_handler = logging.FileHandler(text_path, 'w')
+        text_handler.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+        text_rate = run(text_handler, records)
+        binary_rate = run(BinaryLogHandler(binary_path, 'w'), records)
+        
+        text_size = os.path.getsize(text_path)
+        binary_size = os.path.getsize(binary_path) + os.path.getsize(index_path(binary_path))
+        
+        start = time.perf_counter()
+        count = sum(1 for _ in BinaryLogReader(binary_path))
+        read_rate = count / (time.perf_counter() - start)
+        
+        print(f"{RECORDS:,} records")
+        print(f"text FileHandler     {text_rate:12,.0f} records/sec  {text_size / RECORDS:6.1f} bytes/record")
+        print(f"BinaryLogHandler     {binary_rate:12,.0f} records/sec  {binary_size / RECORDS:6.1f} bytes/record (with index)")
+        print(f"write speedup {binary_rate / text_rate:.2f}x, {text_size / binary_size:.2f}x smaller, reader {read_rate:,.0f} records/sec")
+
+if __name__ == '__main__':
+    main()
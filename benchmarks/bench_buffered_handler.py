@@ -0,0 +1,45 @@
+import io
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.core.handler import ColorHandler
+
+N = 50000
+
+class CountingFileIO(io.FileIO):
+    writes = 0
+    
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+def run(**options):
+    raw = CountingFileIO(os.devnull, 'w')
+    stream = io.TextIOWrapper(io.BufferedWriter(raw), encoding='utf-8')
+    handler = ColorHandler(stream, **options)
+    record = logging.LogRecord('bench', logging.INFO, __file__, 1, 'request %s took %dms', ('/api', 42), None)
+    
+    start = time.perf_counter()
+    for _ in range(N):
+        handler.handle(record)
+    handler.flush()
+    elapsed = time.perf_counter() - start
+    
+    handler.close()
+    stream.close()
+    return raw.writes, N / elapsed
+
+def main():
+    for label, options in [
+        ('per-line flush', {}),
+        ('buffered 64KiB', {'buffer_size': 65536, 'flush_interval': 0.5}),
+    ]:
+        writes, rate = run(**options)
+        print(f"{label:15} write syscalls: {writes:6d}  records/sec: {rate:10.0f}")
+
+if __name__ == '__main__':
+    main()
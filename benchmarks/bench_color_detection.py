@@ -0,0 +1,24 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.utils.terminal import is_terminal_supports_color, get_color_capability
+
+N = 200000
+
+def main():
+    capability = get_color_capability(sys.stderr)
+    
+    before = timeit.timeit(is_terminal_supports_color, number=N)
+    after = timeit.timeit(lambda: capability.enabled, number=N)
+    lookup = timeit.timeit(lambda: get_color_capability(sys.stderr).enabled, number=N)
+    
+    print(f"probe per record (is_terminal_supports_color): {before / N * 1e9:8.1f} ns")
+    print(f"cached capability attribute:                  {after / N * 1e9:8.1f} ns")
+    print(f"cached capability lookup by stream:           {lookup / N * 1e9:8.1f} ns")
+    print(f"speedup (attribute vs probe): {before / after:.1f}x")
+
+if __name__ == '__main__':
+    main()
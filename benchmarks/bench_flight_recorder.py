@@ -0,0 +1,55 @@
+import collections
+import os
+import sys
+import time
+import tracemalloc
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.core.handler import ColorHandler
+from smartlogger.core.flight_recorder import FlightRecorder
+
+CAPACITY = 10000
+
+NAMES = ['app.worker.%d' % i for i in range(8)]
+
+def make_records(count):
+    for i in range(count):
+        yield logging.LogRecord(NAMES[i % 8], logging.DEBUG, __file__, 1, 'step %d of %s', (i, 'job'), None)
+
+def measure_memory(factory, store):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    buffer = factory()
+    for record in make_records(CAPACITY * 2):
+        store(buffer, record)
+    del record
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, 'filename')) / CAPACITY
+
+def measure_rate(store, buffer, records):
+    start = time.perf_counter()
+    for record in records:
+        store(buffer, record)
+    return len(records) / (time.perf_counter() - start)
+
+def main():
+    records = list(make_records(CAPACITY * 2))
+    target = ColorHandler(open(os.devnull, 'w'))
+    
+    cases = [
+        ('deque of LogRecords', lambda: collections.deque(maxlen=CAPACITY), lambda buffer, record: buffer.append(record)),
+        ('FlightRecorder', lambda: FlightRecorder(CAPACITY, target), lambda buffer, record: buffer.handle(record)),
+        ('FlightRecorder(render_args=True)', lambda: FlightRecorder(CAPACITY, target, render_args=True), lambda buffer, record: buffer.handle(record)),
+    ]
+    
+    print(f"{CAPACITY:,} slots, {len(records):,} DEBUG records, memory retained after the run")
+    for name, factory, store in cases:
+        per_slot = measure_memory(factory, store)
+        rate = measure_rate(store, factory(), records)
+        print(f"{name:<34} {per_slot:8.1f} bytes/slot {rate:12,.0f} records/sec")
+
+if __name__ == '__main__':
+    main()
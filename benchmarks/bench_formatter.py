@@ -0,0 +1,54 @@
+import os
+import sys
+import timeit
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.core.formatter import ColorFormatter
+from smartlogger.config.defaults import DEFAULT_DATE_FORMAT
+
+N = 100000
+REPEAT = 7
+
+# The compiled renderer must be at least this much faster on DEFAULT_FORMAT.
+TARGET_SPEEDUP = 2.0
+
+FORMATS = [
+    ('DEFAULT_FORMAT', None),
+    ('no asctime', '%(name)s - %(levelname)s - %(message)s'),
+]
+
+def per_record(formatter, record):
+    formatter.format(record)
+    return min(timeit.repeat(lambda: formatter.format(record), number=N, repeat=REPEAT)) / N * 1e9
+
+def main():
+    record = logging.LogRecord('bench', logging.INFO, __file__, 1, 'request %s took %dms', ('/api', 42), None)
+    failed = False
+    
+    for label, fmt in FORMATS:
+        mutating = ColorFormatter(fmt, compiled=False)
+        compiled = ColorFormatter(fmt)
+        mutating.enable_colors()
+        compiled.enable_colors()
+        
+        assert mutating.format(record) == compiled.format(record)
+        
+        before = per_record(mutating, record)
+        after = per_record(compiled, record)
+        status = ''
+        if fmt is None:
+            status = 'ok' if before / after >= TARGET_SPEEDUP else f'BELOW {TARGET_SPEEDUP:.1f}x TARGET'
+            failed = failed or before / after < TARGET_SPEEDUP
+        print(f"{label:15} mutating: {before:8.1f} ns  compiled: {after:8.1f} ns  speedup: {before / after:.2f}x  {status}")
+    
+    stdlib = logging.Formatter(datefmt=DEFAULT_DATE_FORMAT)
+    cached = ColorFormatter()
+    before = timeit.timeit(lambda: stdlib.formatTime(record, DEFAULT_DATE_FORMAT), number=N) / N * 1e9
+    after = timeit.timeit(lambda: cached.formatTime(record, DEFAULT_DATE_FORMAT), number=N) / N * 1e9
+    print(f"{'formatTime':15} stdlib:   {before:8.1f} ns  cached:   {after:8.1f} ns  speedup: {before / after:.2f}x")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
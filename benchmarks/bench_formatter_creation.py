@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+import logging
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core.monkey_patch import patch_logging, unpatch_logging
+
+N = 10000
+FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def measure(factory):
+    tracemalloc.start()
+    start = time.perf_counter()
+    formatters = [factory() for _ in range(N)]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del formatters
+    return elapsed, size
+
+def report(label, elapsed, size):
+    print(f"{label:32} {elapsed * 1e3:8.1f} ms  {size / 1024:9.1f} KiB  ({size / N:6.0f} B/formatter)")
+
+def eager_patched_formatter():
+    formatter = logging.Formatter(FORMAT)
+    formatter._eager = ColorFormatter(FORMAT)
+    return formatter
+
+def main():
+    report('stdlib Formatter', *measure(lambda: logging.Formatter(FORMAT)))
+    
+    patch_logging()
+    try:
+        report('patched, eager delegate (old)', *measure(eager_patched_formatter))
+        report('patched, lazy shared delegate', *measure(lambda: logging.Formatter(FORMAT)))
+    finally:
+        unpatch_logging()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import os
+import re
+import sys
+import timeit
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.config.colors import Colors
+from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core.highlighter import DEFAULT_RULES, Highlighter
+
+N = 20000
+MESSAGES = 5000
+
+def make_records(unique):
+    records = []
+    for i in range(N):
+        n = i % unique
+        records.append(logging.LogRecord(
+            'bench', logging.INFO, __file__, 1, 'GET %s from %s took %dms status "%s" timeout=%s',
+            (f'https://api.example.com/users/{n}', f'10.0.{n % 256}.{n % 7}', n % 900, 'ok', n % 2 == 0), None))
+    return records
+
+def per_record(formatter, records):
+    for record in records[:100]:
+        formatter.format(record)
+    elapsed = timeit.timeit(lambda: [formatter.format(record) for record in records], number=1)
+    return elapsed / len(records) * 1e9
+
+def sequential(rules):
+    compiled = [(re.compile(pattern), color) for _, pattern, color in rules]
+    
+    def highlight(text):
+        for pattern, color in compiled:
+            text = pattern.sub(lambda match: f"{color}{match.group()}{Colors.RESET}", text)
+        return text
+    return highlight
+
+def main():
+    unique = make_records(N)
+    repeated = make_records(MESSAGES // 50)
+    words = [f'keyword{i}' for i in range(200)]
+    
+    plain = ColorFormatter()
+    plain.enable_colors()
+    baseline = per_record(plain, unique)
+    print(f"{'no highlighting':38} {baseline:8.0f} ns/record")
+    
+    for keywords in (0, 10, 50, 200):
+        highlighter = Highlighter(keywords=words[:keywords], cache_size=0)
+        formatter = ColorFormatter(highlighter=highlighter)
+        formatter.enable_colors()
+        cost = per_record(formatter, unique)
+        print(f"{'default rules + %d keywords, no cache' % keywords:38} {cost:8.0f} ns/record  (+{cost - baseline:.0f})")
+    
+    naive = Highlighter(cache_size=0)
+    naive._cached = sequential(DEFAULT_RULES)
+    formatter = ColorFormatter(highlighter=naive)
+    formatter.enable_colors()
+    cost = per_record(formatter, unique)
+    print(f"{'default rules, one regex per rule':38} {cost:8.0f} ns/record  (+{cost - baseline:.0f})")
+    
+    formatter = ColorFormatter(highlighter=Highlighter(keywords=words[:10]))
+    formatter.enable_colors()
+    cost = per_record(formatter, repeated)
+    print(f"{'10 keywords, LRU hits (repeated msgs)':38} {cost:8.0f} ns/record  (+{cost - baseline:.0f})")
+
+if __name__ == '__main__':
+    main()
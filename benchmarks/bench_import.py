@@ -0,0 +1,49 @@
+import os
+import sys
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+RUNS = 7
+
+# Budgets are import cost in milliseconds on top of `import logging`.
+BUDGETS = {
+    'smartlogger': 1.0,
+    'smartlogger.auto': 5.0,
+}
+
+def cumulative_import_us(statement, module):
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            total = int(parts[1])
+    return total
+
+def measure(module):
+    cumulative_import_us(f'import {module}', module)
+    baseline = statistics.median(cumulative_import_us('import logging', 'logging') for _ in range(RUNS))
+    total = statistics.median(
+        cumulative_import_us(f'import logging; import {module}', module) for _ in range(RUNS)
+    )
+    return total / 1000, baseline / 1000
+
+def main():
+    failed = False
+    for module, budget in BUDGETS.items():
+        cost, baseline = measure(module)
+        status = 'ok' if cost <= budget else 'OVER BUDGET'
+        failed = failed or cost > budget
+        print(f"{module:18} {cost:6.2f} ms (budget {budget:.1f} ms, logging itself {baseline:.2f} ms)  {status}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import json
+import os
+import sys
+import timeit
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.core.json_formatter import JSONFormatter
+
+N = 100000
+
+def per_record(function):
+    function()
+    return timeit.timeit(function, number=N) / N * 1e9
+
+def make_record(extras):
+    record = logging.LogRecord('app.api', logging.INFO, __file__, 1, 'request %s took %dms', ('/users', 42), None)
+    for index in range(extras):
+        setattr(record, f'extra_{index}', index)
+    return record
+
+def main():
+    formatter = JSONFormatter()
+    formatter.disable_colors()
+    
+    for extras in (0, 4, 16):
+        record = make_record(extras)
+        naive = per_record(lambda: json.dumps(record.__dict__, default=str))
+        selected = per_record(lambda: json.dumps(dict(
+            {'time': record.created, 'level': record.levelname, 'logger': record.name, 'message': record.getMessage()},
+            **{key: value for key, value in record.__dict__.items() if key.startswith('extra_')})))
+        ours = per_record(lambda: formatter.format(record))
+        print(f"{extras:2d} extras  json.dumps(__dict__): {naive:8.1f} ns  dict + json.dumps: {selected:8.1f} ns  "
+              f"JSONFormatter: {ours:8.1f} ns  speedup vs __dict__: {naive / ours:.2f}x")
+    
+    formatter.enable_colors()
+    record = make_record(4)
+    pretty = per_record(lambda: formatter.format(record))
+    print(f"colored key/value view, 4 extras: {pretty:8.1f} ns")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.config.colors import Colors
+from smartlogger.utils.logfile import strip_file, colorize_file
+
+SIZE_MB = 64
+
+LINES = [
+    Colors.colorize('INFO', Colors.GREEN),
+    Colors.colorize('WARNING', Colors.YELLOW),
+    Colors.colorize('ERROR', Colors.RED),
+]
+
+def write_sample(path):
+    line_count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while f.tell() < SIZE_MB * 1024 * 1024:
+            for level in LINES:
+                f.write(f"2024-01-06 12:00:00 - app.worker - {level} - request {line_count} handled in 12ms\n")
+                line_count += 1
+    return os.path.getsize(path)
+
+def per_line_strip(src_path, dst_path):
+    with open(src_path, encoding='utf-8') as src, open(dst_path, 'w', encoding='utf-8') as dst:
+        for line in src:
+            dst.write(Colors.strip_colors(line))
+
+def rate(label, function, *args, size):
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:28} {size / elapsed / 1024 / 1024:8.1f} MiB/s")
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        colored = os.path.join(directory, 'colored.log')
+        plain = os.path.join(directory, 'plain.log')
+        recolored = os.path.join(directory, 'recolored.log')
+        size = write_sample(colored)
+        
+        rate('copy (disk speed)', lambda: open(plain, 'wb').write(open(colored, 'rb').read()), size=size)
+        rate('per-line strip_colors', per_line_strip, colored, plain, size=size)
+        rate('strip_file (chunked bytes)', strip_file, colored, plain, size=size)
+        rate('colorize_file', colorize_file, plain, recolored, size=os.path.getsize(plain))
+
+if __name__ == '__main__':
+    main()
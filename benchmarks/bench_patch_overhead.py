@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.core.monkey_patch import patch_logging, unpatch_logging
+
+N = 50000
+ROUNDS = 5
+
+def file_handler_rate():
+    handler = logging.FileHandler(os.devnull)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    record = logging.LogRecord('bench', logging.INFO, __file__, 1, 'request %s took %dms', ('/api', 42), None)
+    
+    best = 0.0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(N):
+            handler.handle(record)
+        best = max(best, N / (time.perf_counter() - start))
+    handler.close()
+    return best
+
+def main():
+    unpatched = file_handler_rate()
+    patch_logging()
+    try:
+        patched = file_handler_rate()
+    finally:
+        unpatch_logging()
+    
+    print(f"FileHandler unpatched: {unpatched:10.0f} records/sec")
+    print(f"FileHandler patched:   {patched:10.0f} records/sec  ({patched / unpatched:.2f}x)")
+
+if __name__ == '__main__':
+    main()
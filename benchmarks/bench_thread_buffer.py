@@ -0,0 +1,50 @@
+import os
+import sys
+import threading
+import time
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.core.handler import ColorHandler
+from smartlogger.core.thread_buffer import ThreadBufferedColorHandler
+
+THREADS = 64
+RECORDS_PER_THREAD = 2000
+
+def run(handler):
+    barrier = threading.Barrier(THREADS + 1)
+    waits = []
+    
+    def work(worker):
+        record = logging.LogRecord('bench', logging.INFO, __file__, 1, 'worker %d record %d', (worker, 0), None)
+        barrier.wait()
+        slowest = 0.0
+        for i in range(RECORDS_PER_THREAD):
+            record.args = (worker, i)
+            start = time.perf_counter()
+            handler.handle(record)
+            slowest = max(slowest, time.perf_counter() - start)
+        waits.append(slowest)
+    
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    handler.close()
+    elapsed = time.perf_counter() - start
+    return THREADS * RECORDS_PER_THREAD / elapsed, max(waits)
+
+def main():
+    with open(os.devnull, 'w') as devnull:
+        print(f"{THREADS} threads x {RECORDS_PER_THREAD:,} records to /dev/null")
+        for name, factory in (('ColorHandler', lambda: ColorHandler(devnull)),
+                              ('ThreadBufferedColorHandler', lambda: ThreadBufferedColorHandler(devnull))):
+            rate, slowest = run(factory())
+            print(f"{name:28} {rate:12,.0f} records/sec  slowest handle(): {slowest * 1000:8.2f} ms")
+
+if __name__ == '__main__':
+    main()
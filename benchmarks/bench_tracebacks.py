@@ -0,0 +1,61 @@
+import os
+import sys
+import timeit
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smartlogger.core.formatter import ColorFormatter
+
+N = 2000
+DEPTH = 20
+
+def fetch(attempt, depth=DEPTH):
+    if depth:
+        return fetch(attempt, depth - 1)
+    raise ConnectionError(f"attempt {attempt}: connection reset")
+
+def make_records():
+    records = []
+    for attempt in range(N):
+        try:
+            fetch(attempt)
+        except ConnectionError:
+            records.append(logging.LogRecord('bench', logging.ERROR, __file__, 1, 'retrying', None, sys.exc_info()))
+    return records
+
+def per_record(formatter, records):
+    def run():
+        for record in records:
+            record.exc_text = None
+            formatter.format(record)
+    elapsed = timeit.timeit(run, number=1)
+    return elapsed / len(records) * 1e6
+
+def output_bytes(formatter, records):
+    total = 0
+    for record in records:
+        record.exc_text = None
+        total += len(formatter.format(record))
+    return total / len(records)
+
+def main():
+    records = make_records()
+    modes = [
+        ('logging.Formatter', logging.Formatter()),
+        ('ColorFormatter, no cache', ColorFormatter(traceback_cache=0)),
+        ('ColorFormatter, cached', ColorFormatter()),
+        ('ColorFormatter, cached + colored', ColorFormatter()),
+        ('ColorFormatter, window=60s', ColorFormatter(traceback_window=60.0)),
+    ]
+    modes[3][1].enable_colors()
+    
+    print(f"{N} records, same traceback ({DEPTH + 2} frames), different messages")
+    for name, formatter in modes:
+        per_record(formatter, records[:100])
+        cost = per_record(formatter, records)
+        size = output_bytes(formatter, records)
+        print(f"{name:34} {cost:8.1f} us/record  {size:8.0f} bytes/record")
+
+if __name__ == '__main__':
+    main()
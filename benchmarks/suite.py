@@ -0,0 +1,240 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import logging
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import smartlogger
+from smartlogger.config.defaults import DEFAULT_FORMAT, DEFAULT_DATE_FORMAT
+from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core.handler import ColorHandler
+from smartlogger.core.queue_handler import QueueColorHandler
+from smartlogger.core.monkey_patch import patch_logging, unpatch_logging
+from smartlogger.utils.terminal import invalidate_color_cache
+
+ALLOCATION_SAMPLE = 200
+
+class Sink:
+    def __init__(self, name):
+        self.name = name
+        self.stream = None
+        self._fds = []
+        self._reader = None
+    
+    def open(self):
+        if self.name == 'devnull':
+            self.stream = open(os.devnull, 'w')
+        elif self.name == 'pipe':
+            read_fd, write_fd = os.pipe()
+            self._start_reader(read_fd)
+            self.stream = os.fdopen(write_fd, 'w')
+        elif self.name == 'pty':
+            import pty
+            master_fd, slave_fd = pty.openpty()
+            self._start_reader(master_fd)
+            self.stream = os.fdopen(slave_fd, 'w')
+        else:
+            raise ValueError(f"Unknown sink: {self.name!r}")
+        return self.stream
+    
+    def _start_reader(self, fd):
+        self._fds.append(fd)
+        self._reader = threading.Thread(target=self._drain, args=(fd,), daemon=True)
+        self._reader.start()
+    
+    def _drain(self, fd):
+        try:
+            while os.read(fd, 65536):
+                pass
+        except OSError:
+            pass
+    
+    def close(self):
+        self.stream.close()
+        if self._reader is not None:
+            self._reader.join(timeout=1)
+        for fd in self._fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+def stdlib_handler(stream):
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(DEFAULT_FORMAT, DEFAULT_DATE_FORMAT))
+    return handler
+
+def color_formatter_handler(enabled):
+    def factory(stream):
+        handler = logging.StreamHandler(stream)
+        formatter = ColorFormatter()
+        formatter.enable_colors() if enabled else formatter.disable_colors()
+        handler.setFormatter(formatter)
+        return handler
+    return factory
+
+def color_handler(stream):
+    return ColorHandler(stream)
+
+def buffered_color_handler(stream):
+    return ColorHandler(stream, buffer_size=65536, flush_interval=0.5)
+
+def queue_color_handler(stream):
+    return QueueColorHandler(stream)
+
+def patched_handler(stream):
+    original_stderr = sys.stderr
+    sys.stderr = stream
+    try:
+        invalidate_color_cache()
+        patch_logging()
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(DEFAULT_FORMAT, DEFAULT_DATE_FORMAT))
+        handler.handle(make_record(0))
+    finally:
+        sys.stderr = original_stderr
+    return handler
+
+MODES = {
+    'stdlib': stdlib_handler,
+    'color_formatter_on': color_formatter_handler(True),
+    'color_formatter_off': color_formatter_handler(False),
+    'color_handler': color_handler,
+    'color_handler_buffered': buffered_color_handler,
+    'queue_handler': queue_color_handler,
+    'patched': patched_handler,
+}
+
+def make_record(i):
+    return logging.LogRecord('bench.worker', logging.INFO, __file__, 42, 'request %d handled in %.2fms', (i, 1.5), None)
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def allocation_bytes_per_record(handler):
+    if not hasattr(tracemalloc, 'reset_peak'):
+        return None
+    records = [make_record(i) for i in range(ALLOCATION_SAMPLE)]
+    tracemalloc.start()
+    total = 0
+    for record in records:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        handler.handle(record)
+        total += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return total / ALLOCATION_SAMPLE
+
+def run_case(mode, sink_name, threads, records):
+    sink = Sink(sink_name)
+    stream = sink.open()
+    handler = MODES[mode](stream)
+    per_thread = max(1, records // threads)
+    latencies = [None] * threads
+    barrier = threading.Barrier(threads + 1)
+    
+    def produce(index):
+        batch = [make_record(i) for i in range(per_thread)]
+        timings = [0] * per_thread
+        clock = time.perf_counter_ns
+        handle = handler.handle
+        barrier.wait()
+        for i, record in enumerate(batch):
+            start = clock()
+            handle(record)
+            timings[i] = clock() - start
+        latencies[index] = timings
+    
+    workers = [threading.Thread(target=produce, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    handler.flush()
+    elapsed = time.perf_counter() - start
+    
+    allocations = allocation_bytes_per_record(handler)
+    handler.close()
+    if mode == 'patched':
+        unpatch_logging()
+    sink.close()
+    
+    samples = sorted(value for timings in latencies for value in timings)
+    return {
+        'mode': mode,
+        'sink': sink_name,
+        'threads': threads,
+        'records': per_thread * threads,
+        'records_per_sec': round(per_thread * threads / elapsed, 1),
+        'p50_ns': percentile(samples, 0.50),
+        'p99_ns': percentile(samples, 0.99),
+        'alloc_bytes_per_record': None if allocations is None else round(allocations, 1),
+    }
+
+def available_sinks():
+    sinks = ['devnull', 'pipe']
+    if os.name == 'posix':
+        sinks.append('pty')
+    return sinks
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['mode'], r['sink'], r['threads']): r for r in json.load(f)['results']}
+    print()
+    print(f"{'mode':24} {'sink':8} {'thr':>3} {'rec/s ratio':>12} {'p99 ratio':>10}")
+    for result in results:
+        old = baseline.get((result['mode'], result['sink'], result['threads']))
+        if old is None:
+            continue
+        rate = result['records_per_sec'] / old['records_per_sec'] if old['records_per_sec'] else 0
+        p99 = result['p99_ns'] / old['p99_ns'] if old['p99_ns'] else 0
+        print(f"{result['mode']:24} {result['sink']:8} {result['threads']:>3} {rate:>12.2f} {p99:>10.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='SmartLogger throughput and latency benchmarks')
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--modes', nargs='+', choices=sorted(MODES), default=list(MODES))
+    parser.add_argument('--sinks', nargs='+', choices=['devnull', 'pipe', 'pty'], default=available_sinks())
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', metavar='BASELINE_JSON')
+    args = parser.parse_args(argv)
+    
+    results = []
+    print(f"{'mode':24} {'sink':8} {'thr':>3} {'rec/s':>10} {'p50 ns':>9} {'p99 ns':>9} {'alloc B':>8}")
+    for mode in args.modes:
+        for sink in args.sinks:
+            for threads in args.threads:
+                result = run_case(mode, sink, threads, args.records)
+                results.append(result)
+                alloc = result['alloc_bytes_per_record']
+                print(f"{mode:24} {sink:8} {threads:>3} {result['records_per_sec']:>10.0f} "
+                      f"{result['p50_ns']:>9} {result['p99_ns']:>9} {'-' if alloc is None else f'{alloc:.0f}':>8}")
+    
+    report = {
+        'smartlogger_version': smartlogger.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,22 @@ __author__ = "Mohammad Rasol Esfandiari"
 __email__ = "mrasolesfandiari@gmail.com"
 __license__ = "MIT"
 
-from .core.formatter import ColorFormatter
-from .core.handler import ColorHandler
-from .config.colors import Colors
-from .utils.terminal import is_terminal_supports_color 
\ No newline at end of file
+_LAZY_ATTRIBUTES = {
+    'ColorFormatter': 'core.formatter',
+    'ColorHandler': 'core.handler',
+    'Colors': 'config.colors',
+    'is_terminal_supports_color': 'utils.terminal',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__import__(module_name, globals(), fromlist=[name], level=1), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,118 @@
+import argparse
+import logging
+import sys
+from contextlib import ExitStack
+from datetime import datetime
+from .utils.logfile import strip_stream, colorize_stream, CHUNK_SIZE
+
+def _open_input(stack, path):
+    if path == '-':
+        return sys.stdin.buffer
+    return stack.enter_context(open(path, 'rb'))
+
+def _open_output(stack, path):
+    if path is None or path == '-':
+        return sys.stdout.buffer
+    return stack.enter_context(open(path, 'wb'))
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m smartlogger', description='SmartLogger log file tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    for name, help_text in (('strip', 'remove ANSI escape sequences from a log'),
+                            ('colorize', 'add level colors to a plain log')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('input', help="log file to read, '-' for stdin")
+        command.add_argument('-o', '--output', help='file to write (default: stdout)')
+        command.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='read size in bytes')
+    
+    view = commands.add_parser('view', help='render a binary log written by BinaryLogHandler')
+    view.add_argument('input', help='binary log file to read')
+    view.add_argument('-l', '--level', type=_parse_level, default=logging.NOTSET, help='lowest level to show (name or number)')
+    view.add_argument('-n', '--logger', action='append', help='only show this logger and its children (repeatable)')
+    view.add_argument('--since', type=_parse_time, help='first timestamp to show (epoch seconds or ISO 8601)')
+    view.add_argument('--until', type=_parse_time, help='last timestamp to show (epoch seconds or ISO 8601)')
+    view.add_argument('--format', dest='fmt', help='%%-style format string (default: ColorFormatter default)')
+    view.add_argument('--datefmt', help='date format for %%(asctime)s')
+    view.add_argument('--color', choices=('auto', 'always', 'never'), default='auto', help='colorize output')
+    
+    return parser
+
+def _parse_level(value):
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    if not isinstance(level, int):
+        raise argparse.ArgumentTypeError(f"unknown level {value!r}")
+    return level
+
+def _parse_time(value):
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid timestamp {value!r}") from None
+
+def _format_record(formatter, record):
+    try:
+        return formatter.format(record)
+    except (TypeError, ValueError, KeyError) as e:
+        return f"<unformattable record: msg={record.msg!r} args={record.args!r}: {e}>"
+
+def _view(args):
+    from .core.binary_sink import BinaryLogReader
+    from .core.formatter import ColorFormatter
+    
+    formatter = ColorFormatter(args.fmt, args.datefmt)
+    if args.color == 'always':
+        formatter.enable_colors()
+    elif args.color == 'never':
+        formatter.disable_colors()
+    
+    write = sys.stdout.write
+    lines = []
+    try:
+        records = BinaryLogReader(args.input).records(args.level, args.logger, args.since, args.until)
+        for record in records:
+            lines.append(_format_record(formatter, record))
+            if len(lines) >= 1024:
+                lines.append('')
+                write('\n'.join(lines))
+                lines.clear()
+        if lines:
+            lines.append('')
+            write('\n'.join(lines))
+        sys.stdout.flush()
+    except BrokenPipeError:
+        return 1
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"python -m smartlogger view: error: {e}\n")
+        return 2
+    return 0
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'view':
+        return _view(args)
+    
+    try:
+        with ExitStack() as stack:
+            src = _open_input(stack, args.input)
+            dst = _open_output(stack, args.output)
+            if args.command == 'strip':
+                strip_stream(src, dst, args.chunk_size)
+            elif args.command == 'colorize':
+                colorize_stream(src, dst, args.chunk_size)
+            dst.flush()
+    except BrokenPipeError:
+        return 1
+    except OSError as e:
+        sys.stderr.write(f"python -m smartlogger {args.command}: error: {e}\n")
+        return 2
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
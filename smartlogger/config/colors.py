@@ -1,9 +1,15 @@
 import sys
 import os
+import re
+
+ANSI_ESCAPE_PATTERN = r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])'
+_ansi_escape = re.compile(ANSI_ESCAPE_PATTERN)
+_ansi_escape_bytes = re.compile(ANSI_ESCAPE_PATTERN.encode('ascii'))
 
 class Colors:
     RESET = '\033[0m'
     BOLD = '\033[1m'
+    DIM = '\033[2m'
     
     BLACK = '\033[30m'
     RED = '\033[31m'
@@ -23,16 +29,17 @@ class Colors:
     BRIGHT_CYAN = '\033[96m'
     BRIGHT_WHITE = '\033[97m'
     
+    LEVEL_COLORS = {
+        'DEBUG': BLUE,
+        'INFO': GREEN,
+        'WARNING': YELLOW,
+        'ERROR': RED,
+        'CRITICAL': BRIGHT_RED + BOLD,
+    }
+    
     @classmethod
     def get_color_for_level(cls, level_name):
-        level_colors = {
-            'DEBUG': cls.BLUE,
-            'INFO': cls.GREEN,
-            'WARNING': cls.YELLOW,
-            'ERROR': cls.RED,
-            'CRITICAL': cls.BRIGHT_RED + cls.BOLD
-        }
-        return level_colors.get(level_name, cls.RESET)
+        return cls.LEVEL_COLORS.get(level_name, cls.RESET)
     
     @classmethod
     def colorize(cls, text, color):
@@ -40,6 +47,6 @@ class Colors:
     
     @classmethod
     def strip_colors(cls, text):
-        import re
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        return ansi_escape.sub('', text) 
\ No newline at end of file
+        if isinstance(text, (bytes, bytearray)):
+            return _ansi_escape_bytes.sub(b'', text)
+        return _ansi_escape.sub('', text) 
\ No newline at end of file
@@ -0,0 +1,291 @@
+import json
+import logging
+import os
+import sys
+from .colors import Colors
+from ..utils.terminal import DEPTH_NONE, DEPTH_256, DEPTH_TRUECOLOR, stream_color_depth
+
+_NAMED_COLORS = {
+    'black': 0, 'red': 1, 'green': 2, 'yellow': 3,
+    'blue': 4, 'magenta': 5, 'cyan': 6, 'white': 7,
+    'bright_black': 8, 'bright_red': 9, 'bright_green': 10, 'bright_yellow': 11,
+    'bright_blue': 12, 'bright_magenta': 13, 'bright_cyan': 14, 'bright_white': 15,
+    'gray': 8, 'grey': 8,
+}
+
+_ATTRIBUTES = {'bold': 1, 'dim': 2, 'italic': 3, 'underline': 4}
+
+_ANSI_RGB = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+_MAX_LOGGER_NAMES = 4096
+
+def _distance(a, b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+def _index_to_rgb(index):
+    if index < 16:
+        return _ANSI_RGB[index]
+    if index < 232:
+        index -= 16
+        return (_CUBE_LEVELS[index // 36], _CUBE_LEVELS[index // 6 % 6], _CUBE_LEVELS[index % 6])
+    level = 8 + (index - 232) * 10
+    return (level, level, level)
+
+def _nearest_cube_level(value):
+    return min(range(6), key=lambda i: abs(_CUBE_LEVELS[i] - value))
+
+def rgb_to_256(rgb):
+    r, g, b = rgb
+    cube = 16 + 36 * _nearest_cube_level(r) + 6 * _nearest_cube_level(g) + _nearest_cube_level(b)
+    gray = 232 + min(23, max(0, round((sum(rgb) / 3 - 8) / 10)))
+    return min((cube, gray), key=lambda index: _distance(_index_to_rgb(index), rgb))
+
+def rgb_to_16(rgb):
+    return min(range(16), key=lambda index: _distance(_ANSI_RGB[index], rgb))
+
+def _parse_color(token):
+    if isinstance(token, int) and not isinstance(token, bool):
+        if 0 <= token <= 255:
+            return ('index', token)
+        raise ValueError(f"color index out of range: {token!r}")
+    
+    if token in _NAMED_COLORS:
+        return ('index', _NAMED_COLORS[token])
+    if token.startswith('color(') and token.endswith(')'):
+        return _parse_color(int(token[6:-1]))
+    if token.isdigit():
+        return _parse_color(int(token))
+    if token.startswith('#'):
+        digits = token[1:]
+        if len(digits) == 3:
+            digits = ''.join(c * 2 for c in digits)
+        if len(digits) == 6:
+            try:
+                return ('rgb', (int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16)))
+            except ValueError:
+                pass
+    raise ValueError(f"unknown color: {token!r}")
+
+def _color_code(color, depth, base):
+    kind, value = color
+    if kind == 'rgb':
+        if depth >= DEPTH_TRUECOLOR:
+            return f'{base + 8};2;{value[0]};{value[1]};{value[2]}'
+        value = rgb_to_256(value) if depth >= DEPTH_256 else rgb_to_16(value)
+    elif value >= 16 and depth < DEPTH_256:
+        value = rgb_to_16(_index_to_rgb(value))
+    
+    if value >= 16:
+        return f'{base + 8};5;{value}'
+    if value >= 8:
+        return str(base + 60 + value - 8)
+    return str(base + value)
+
+class Style:
+    __slots__ = ('fg', 'bg', 'attributes')
+    
+    def __init__(self, fg=None, bg=None, attributes=()):
+        self.fg = fg
+        self.bg = bg
+        self.attributes = tuple(attributes)
+    
+    def escape(self, depth):
+        if depth == DEPTH_NONE:
+            return ''
+        codes = [str(_ATTRIBUTES[name]) for name in self.attributes]
+        if self.fg is not None:
+            codes.append(_color_code(self.fg, depth, 30))
+        if self.bg is not None:
+            codes.append(_color_code(self.bg, depth, 40))
+        return f"\033[{';'.join(codes)}m" if codes else ''
+
+def parse_style(spec):
+    if isinstance(spec, Style):
+        return spec
+    if spec is None:
+        return Style()
+    if isinstance(spec, int) and not isinstance(spec, bool):
+        return Style(_parse_color(spec))
+    
+    fg = bg = None
+    attributes = []
+    background = False
+    for token in str(spec).lower().split():
+        if token == 'on':
+            background = True
+        elif background:
+            bg = _parse_color(token)
+            background = False
+        elif token in _ATTRIBUTES:
+            attributes.append(token)
+        else:
+            fg = _parse_color(token)
+    if background:
+        raise ValueError(f"missing background color in style: {spec!r}")
+    return Style(fg, bg, attributes)
+
+def _paint(text, code):
+    return f"{code}{text}{Colors.RESET}" if code else text
+
+class CompiledTheme:
+    def __init__(self, theme, depth):
+        self.theme = theme
+        self.depth = depth
+        
+        by_number = {}
+        self._named_codes = {}
+        for key, style in theme.levels.items():
+            levelno = key if isinstance(key, int) else logging._nameToLevel.get(key)
+            if levelno is None:
+                self._named_codes[key] = style.escape(depth)
+            else:
+                by_number[levelno] = style.escape(depth)
+        
+        self.level_codes = [''] * (max([logging.CRITICAL, *by_number]) + 1)
+        code = ''
+        for levelno in range(len(self.level_codes)):
+            code = by_number.get(levelno, code)
+            self.level_codes[levelno] = code
+        
+        self.level_names = {}
+        for name in logging._nameToLevel:
+            self.color_level(name)
+        
+        self._logger_codes = {name: style.escape(depth) for name, style in theme.loggers.items() if name != '*'}
+        default = theme.loggers.get('*')
+        self.default_logger_code = default.escape(depth) if default is not None else ''
+        self.logger_names = {}
+        
+        self.highlights = {name: style.escape(depth) for name, style in theme.highlights.items()}
+    
+    @property
+    def colors_loggers(self):
+        return bool(self.default_logger_code) or any(self._logger_codes.values())
+    
+    def level_code(self, levelno):
+        codes = self.level_codes
+        if levelno < 0:
+            return ''
+        return codes[levelno] if levelno < len(codes) else codes[-1]
+    
+    def color_level(self, levelname, levelno=None):
+        code = self._named_codes.get(levelname)
+        if code is None:
+            if levelno is None:
+                levelno = logging._nameToLevel.get(levelname)
+            code = self.level_code(levelno) if levelno is not None else ''
+        colored = _paint(levelname, code)
+        self.level_names[levelname] = colored
+        return colored
+    
+    def logger_code(self, name):
+        key = name
+        while True:
+            code = self._logger_codes.get(key)
+            if code is not None:
+                return code
+            if '.' not in key:
+                return self.default_logger_code
+            key = key.rpartition('.')[0]
+    
+    def color_logger(self, name):
+        colored = _paint(name, self.logger_code(name))
+        if len(self.logger_names) < _MAX_LOGGER_NAMES:
+            self.logger_names[sys.intern(name)] = colored
+        return colored
+
+class Theme:
+    def __init__(self, name, levels=None, loggers=None, highlights=None):
+        self.name = name
+        self.levels = {}
+        for key, spec in (levels or {}).items():
+            if isinstance(key, str):
+                key = int(key) if key.isdigit() else key.upper()
+            self.levels[key] = parse_style(spec)
+        self.loggers = {name: parse_style(spec) for name, spec in (loggers or {}).items()}
+        self.highlights = {name: parse_style(spec) for name, spec in (highlights or {}).items()}
+        self._compiled = {}
+    
+    @classmethod
+    def from_dict(cls, data, name=None):
+        unknown = set(data) - {'name', 'levels', 'loggers', 'highlights'}
+        if unknown:
+            raise ValueError(f"unknown theme sections: {', '.join(sorted(unknown))}")
+        return cls(data.get('name', name), data.get('levels'), data.get('loggers'), data.get('highlights'))
+    
+    def compile(self, depth):
+        compiled = self._compiled.get(depth)
+        if compiled is None:
+            compiled = self._compiled[depth] = CompiledTheme(self, depth)
+        return compiled
+    
+    def for_stream(self, stream=None):
+        return self.compile(stream_color_depth(stream))
+
+def _load_toml(data):
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ImportError("TOML themes require Python 3.11+ or the 'tomli' package") from None
+    return tomllib.loads(data.decode('utf-8'))
+
+def load_theme(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    name = os.path.splitext(os.path.basename(path))[0]
+    if path.endswith('.toml'):
+        return Theme.from_dict(_load_toml(data), name)
+    return Theme.from_dict(json.loads(data), name)
+
+THEMES = {}
+
+def register_theme(theme):
+    THEMES[theme.name] = theme
+    return theme
+
+def get_theme(name):
+    theme = THEMES.get(name)
+    if theme is None:
+        if os.path.isfile(name):
+            return load_theme(name)
+        raise ValueError(f"unknown theme: {name!r}")
+    return theme
+
+register_theme(Theme(
+    'default',
+    levels={'DEBUG': 'blue', 'INFO': 'green', 'WARNING': 'yellow', 'ERROR': 'red', 'CRITICAL': 'bold bright_red'},
+    highlights={
+        'url': 'cyan', 'uuid': 'magenta', 'ipv4': 'bright_magenta', 'ipv6': 'bright_magenta',
+        'string': 'green', 'number': 'bright_cyan', 'keyword': 'bold bright_red',
+    },
+))
+
+register_theme(Theme(
+    'nord',
+    levels={'DEBUG': '#81a1c1', 'INFO': '#a3be8c', 'WARNING': '#ebcb8b', 'ERROR': '#bf616a', 'CRITICAL': 'bold #eceff4 on #bf616a'},
+    loggers={'*': '#88c0d0'},
+    highlights={
+        'url': 'underline #88c0d0', 'uuid': '#b48ead', 'ipv4': '#b48ead', 'ipv6': '#b48ead',
+        'string': '#a3be8c', 'number': '#d08770', 'keyword': 'bold #bf616a',
+    },
+))
+
+register_theme(Theme(
+    'monokai',
+    levels={'DEBUG': 'color(244)', 'INFO': 'color(148)', 'WARNING': 'color(208)', 'ERROR': 'color(197)', 'CRITICAL': 'bold color(231) on color(197)'},
+    loggers={'*': 'color(81)'},
+    highlights={
+        'url': 'underline color(81)', 'uuid': 'color(141)', 'ipv4': 'color(141)', 'ipv6': 'color(141)',
+        'string': 'color(186)', 'number': 'color(141)', 'keyword': 'bold color(197)',
+    },
+))
@@ -1,3 +1,40 @@
-from .formatter import ColorFormatter
-from .handler import ColorHandler
-from .monkey_patch import patch_logging, unpatch_logging, is_patched 
\ No newline at end of file
+_LAZY_ATTRIBUTES = {
+    'ColorFormatter': 'formatter',
+    'JSONFormatter': 'json_formatter',
+    'Highlighter': 'highlighter',
+    'ColorHandler': 'handler',
+    'QueueColorHandler': 'queue_handler',
+    'TeeColorHandler': 'tee_handler',
+    'ThreadBufferedColorHandler': 'thread_buffer',
+    'AsyncColorHandler': 'async_handler',
+    'DedupHandler': 'dedup_handler',
+    'BinaryLogHandler': 'binary_sink',
+    'BinaryLogReader': 'binary_sink',
+    'LoadShedder': 'load_shedding',
+    'FlightRecorder': 'flight_recorder',
+    'Metrics': 'metrics',
+    'MetricsExporter': 'metrics',
+    'CallSiteProfiler': 'profiler',
+    'Lazy': 'lazy',
+    'lazy': 'lazy',
+    'enable_lazy_messages': 'lazy',
+    'disable_lazy_messages': 'lazy',
+    'LogCollector': 'multiprocess',
+    'install_worker_logging': 'multiprocess',
+    'patch_logging': 'monkey_patch',
+    'unpatch_logging': 'monkey_patch',
+    'is_patched': 'monkey_patch',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__import__(module_name, globals(), fromlist=[name], level=1), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,256 @@
+import asyncio
+import collections
+import logging
+import os
+import select
+import stat
+import sys
+import threading
+from .formatter import ColorFormatter
+from .queue_handler import QueueColorHandler, OVERFLOW_DROP_OLDEST
+
+class AsyncColorHandler(logging.Handler):
+    terminator = '\n'
+    
+    def __init__(self, stream=None, *, nonblocking=False, loop=None, maxsize=10000,
+                 overflow=OVERFLOW_DROP_OLDEST, max_buffer=1024 * 1024):
+        super().__init__()
+        self.stream = stream or sys.stderr
+        self.max_buffer = max_buffer
+        self._dropped = 0
+        self.formatter = ColorFormatter(stream=self.stream)
+        
+        self._loop = None
+        self._fd = None
+        self._encoding = getattr(self.stream, 'encoding', None) or 'utf-8'
+        self._buffer = collections.deque()
+        self._buffered = 0
+        self._partial = b''
+        self._writer_registered = False
+        self._waiters = []
+        self._queue_handler = None
+        
+        if nonblocking:
+            self._setup_nonblocking(loop)
+        if self._fd is None:
+            self._queue_handler = QueueColorHandler(self.stream, maxsize=maxsize, overflow=overflow)
+            self._queue_handler.setFormatter(self.formatter)
+    
+    @property
+    def nonblocking(self):
+        return self._fd is not None
+    
+    def _setup_nonblocking(self, loop):
+        if os.name != 'posix':
+            return
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+        try:
+            fd = self.stream.fileno()
+            info = os.fstat(fd)
+        except (AttributeError, OSError, ValueError):
+            return
+        if not (stat.S_ISFIFO(info.st_mode) or stat.S_ISCHR(info.st_mode)):
+            return
+        
+        private = _reopen(fd, info)
+        if private is None:
+            return
+        self.stream.flush()
+        self._fd = private
+        self._loop = loop
+    
+    @property
+    def dropped(self):
+        if self._queue_handler is not None:
+            return self._queue_handler.dropped
+        return self._dropped
+    
+    def setFormatter(self, fmt):
+        if isinstance(fmt, ColorFormatter) and fmt.stream is None:
+            fmt.stream = self.stream
+        super().setFormatter(fmt)
+        if self._queue_handler is not None:
+            self._queue_handler.setFormatter(fmt)
+    
+    def queue_depth(self):
+        if self._queue_handler is not None:
+            return self._queue_handler.queue_depth()
+        return len(self._buffer) + (1 if self._partial else 0)
+    
+    def _in_loop_thread(self):
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+    
+    def emit(self, record):
+        if self._queue_handler is not None:
+            self._queue_handler.emit(record)
+            return
+        
+        try:
+            if self._fd is None:
+                self.stream.write(self.format(record) + self.terminator)
+                self.stream.flush()
+                return
+            
+            data = (self.format(record) + self.terminator).encode(self._encoding, 'replace')
+            if self._in_loop_thread():
+                self._enqueue(data)
+            elif self._loop.is_closed():
+                self._enqueue(data)
+                self._drain_blocking()
+            else:
+                self._loop.call_soon_threadsafe(self._enqueue, data)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _enqueue(self, data):
+        with self.lock:
+            self._buffer.append(data)
+            self._buffered += len(data)
+            while self._buffered > self.max_buffer and len(self._buffer) > 1:
+                self._buffered -= len(self._buffer.popleft())
+                self._dropped += 1
+        if not self._writer_registered:
+            self._on_writable()
+    
+    def _write_some(self):
+        with self.lock:
+            while self._partial or self._buffer:
+                chunks = None
+                if self._partial:
+                    data = self._partial
+                else:
+                    chunks = list(self._buffer)
+                    self._buffer.clear()
+                    data = b''.join(chunks) if len(chunks) > 1 else chunks[0]
+                try:
+                    written = os.write(self._fd, data)
+                except BlockingIOError:
+                    written = 0
+                except OSError:
+                    self._partial = b''
+                    self._buffered = 0
+                    return True
+                
+                if written < len(data):
+                    if chunks is None:
+                        self._partial = data[written:]
+                    else:
+                        self._requeue(chunks, written)
+                    self._buffered = len(self._partial) + sum(len(chunk) for chunk in self._buffer)
+                    return False
+                self._partial = b''
+            self._buffered = 0
+            return True
+    
+    def _requeue(self, chunks, written):
+        offset = 0
+        for index, chunk in enumerate(chunks):
+            if offset + len(chunk) > written:
+                break
+            offset += len(chunk)
+        if written > offset:
+            self._partial = chunk[written - offset:]
+            index += 1
+        self._buffer.extend(chunks[index:])
+    
+    def _on_writable(self):
+        done = self._write_some()
+        if not done:
+            if not self._writer_registered:
+                self._loop.add_writer(self._fd, self._on_writable)
+                self._writer_registered = True
+            return
+        
+        if self._writer_registered:
+            self._loop.remove_writer(self._fd)
+            self._writer_registered = False
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+    
+    def _drain_blocking(self, timeout=5.0):
+        while not self._write_some():
+            _, writable, _ = select.select([], [self._fd], [], timeout)
+            if not writable:
+                return
+    
+    def flush(self):
+        if self._queue_handler is not None:
+            if not self._queue_handler.closed:
+                self._queue_handler.flush()
+        elif self._fd is None:
+            return
+        elif self._in_loop_thread():
+            self._on_writable()
+        elif not self._loop.is_running():
+            self._drain_blocking()
+            if not self._loop.is_closed():
+                self._on_writable()
+        else:
+            done = threading.Event()
+            self._loop.call_soon_threadsafe(self._notify_when_drained, done)
+            done.wait(5.0)
+    
+    async def aflush(self):
+        if self._queue_handler is not None:
+            if not self._queue_handler.closed:
+                await asyncio.get_running_loop().run_in_executor(None, self._queue_handler.flush)
+        elif self._fd is not None:
+            if not self._in_loop_thread():
+                await asyncio.get_running_loop().run_in_executor(None, self.flush)
+            elif self._buffer or self._partial:
+                waiter = self._loop.create_future()
+                self._waiters.append(waiter)
+                await waiter
+    
+    def _notify_when_drained(self, done):
+        if not self._buffer and not self._partial:
+            done.set()
+            return
+        waiter = self._loop.create_future()
+        waiter.add_done_callback(lambda _: done.set())
+        self._waiters.append(waiter)
+    
+    async def aclose(self):
+        await self.aflush()
+        self.close()
+    
+    def close(self):
+        if self._queue_handler is not None:
+            self._queue_handler.close()
+        elif self._fd is not None:
+            if self._writer_registered:
+                try:
+                    self._loop.remove_writer(self._fd)
+                except Exception:
+                    pass
+                self._writer_registered = False
+            self._drain_blocking()
+            os.close(self._fd)
+            self._fd = None
+        super().close()
+
+def _reopen(fd, info):
+    try:
+        path = os.ttyname(fd) if os.isatty(fd) else f'/proc/self/fd/{fd}'
+        private = os.open(path, os.O_WRONLY | os.O_NOCTTY | os.O_NONBLOCK | getattr(os, 'O_CLOEXEC', 0))
+    except OSError:
+        return None
+    try:
+        reopened = os.fstat(private)
+    except OSError:
+        reopened = None
+    if reopened is None or (reopened.st_dev, reopened.st_ino) != (info.st_dev, info.st_ino):
+        os.close(private)
+        return None
+    return private
@@ -0,0 +1,391 @@
+import bisect
+import contextlib
+import logging
+import mmap
+import os
+import struct
+
+MAGIC = b'SLOG\x02'
+
+FRAME_STRING = 1
+FRAME_RECORD = 2
+FRAME_POINT = 3
+
+FLAG_EXC_TEXT = 0x10
+FLAG_INLINE_MESSAGE = 0x20
+FLAG_ABSOLUTE_TIME = 0x40
+
+_INT64 = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+_POINT = struct.Struct('<qQ')
+
+_ARG_NONE = 0
+_ARG_TRUE = 1
+_ARG_FALSE = 2
+_ARG_INT = 3
+_ARG_FLOAT = 4
+_ARG_STR = 5
+
+_SMALL = [bytes((i,)) for i in range(128)]
+
+def index_path(path):
+    return os.fspath(path) + '.idx'
+
+def _varint(n):
+    if n < 0x80:
+        return _SMALL[n]
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+def _zigzag(n):
+    return _varint(n << 1 if n >= 0 else ((-n) << 1) - 1)
+
+def _text(text):
+    data = text.encode('utf-8', 'surrogateescape')
+    return _varint(len(data)) + data
+
+def _pack_args(args):
+    if not isinstance(args, tuple) or len(args) > 127:
+        return None
+    parts = [_SMALL[len(args)]]
+    append = parts.append
+    for arg in args:
+        kind = type(arg)
+        if kind is str:
+            append(_SMALL[_ARG_STR])
+            append(_text(arg))
+        elif kind is int:
+            append(_SMALL[_ARG_INT])
+            append(_zigzag(arg))
+        elif kind is float:
+            append(_SMALL[_ARG_FLOAT])
+            append(_FLOAT.pack(arg))
+        elif arg is None:
+            append(_SMALL[_ARG_NONE])
+        elif arg is True:
+            append(_SMALL[_ARG_TRUE])
+        elif arg is False:
+            append(_SMALL[_ARG_FALSE])
+        else:
+            return None
+    return b''.join(parts)
+
+def _frame(body):
+    return _varint(len(body)) + body
+
+def _string_frame(string_id, text):
+    return _frame(_SMALL[FRAME_STRING] + _varint(string_id) + text.encode('utf-8', 'surrogateescape'))
+
+class BinaryLogHandler(logging.Handler):
+    def __init__(self, filename, mode='a', *, index_interval=1024, flush_level=logging.ERROR, buffer_size=1 << 16):
+        super().__init__()
+        if mode not in ('a', 'w'):
+            raise ValueError("mode must be 'a' or 'w'")
+        self.baseFilename = os.path.abspath(os.fspath(filename))
+        self.index_interval = index_interval
+        self.flush_level = flush_level
+        self._strings = {}
+        self._since_point = 0
+        self._last_time = None
+        
+        if mode == 'a' and os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+            reader = BinaryLogReader(self.baseFilename)
+            strings = reader.load_strings()
+            self._strings = {text: string_id for string_id, text in enumerate(strings)}
+            self._offset = reader.end_offset
+            os.truncate(self.baseFilename, self._offset)
+            self._stream = open(self.baseFilename, 'ab', buffering=buffer_size)
+            self._index = self._reopen_index(strings, buffer_size)
+        else:
+            self._stream = open(self.baseFilename, 'wb', buffering=buffer_size)
+            self._index = open(index_path(self.baseFilename), 'wb', buffering=buffer_size)
+            self._stream.write(MAGIC)
+            self._index.write(MAGIC)
+            self._offset = len(MAGIC)
+    
+    def _reopen_index(self, strings, buffer_size):
+        path = index_path(self.baseFilename)
+        index_strings, points = BinaryLogReader(self.baseFilename).load_index()
+        if index_strings is None or strings[:len(index_strings)] != index_strings:
+            points = []
+        if index_strings == strings and all(offset < self._offset for _, offset in points):
+            os.truncate(path, _valid_length(path))
+            return open(path, 'ab', buffering=buffer_size)
+        
+        index = open(path, 'wb', buffering=buffer_size)
+        index.write(MAGIC)
+        for string_id, text in enumerate(strings):
+            index.write(_string_frame(string_id, text))
+        for micros, offset in points:
+            if offset < self._offset:
+                index.write(_frame(_SMALL[FRAME_POINT] + _POINT.pack(micros, offset)))
+        return index
+    
+    def _intern(self, text):
+        string_id = self._strings.get(text)
+        if string_id is None:
+            string_id = self._strings[text] = len(self._strings)
+            frame = _string_frame(string_id, text)
+            self._stream.write(frame)
+            self._index.write(frame)
+            self._offset += len(frame)
+        return string_id
+    
+    def emit(self, record):
+        try:
+            if self._stream is None:
+                return
+            name_id = self._intern(record.name)
+            msg = record.msg
+            packed = _pack_args(record.args) if type(msg) is str else None
+            if packed is not None and record.args:
+                try:
+                    msg % record.args
+                except (TypeError, ValueError, KeyError):
+                    packed = None
+            if packed is None:
+                kind = FRAME_RECORD | FLAG_INLINE_MESSAGE
+                body = [_text(record.getMessage())]
+            else:
+                kind = FRAME_RECORD
+                body = [_varint(self._intern(msg)), packed]
+            
+            exc_text = record.exc_text
+            if record.exc_info and not exc_text:
+                exc_text = (self.formatter or logging._defaultFormatter).formatException(record.exc_info)
+            if record.stack_info:
+                exc_text = f"{exc_text}\n{record.stack_info}" if exc_text else record.stack_info
+            if exc_text:
+                kind |= FLAG_EXC_TEXT
+                body.append(_text(exc_text))
+            
+            micros = round(record.created * 1e6)
+            self._since_point -= 1
+            if self._since_point <= 0 or self._last_time is None:
+                self._since_point = self.index_interval
+                self._index.write(_frame(_SMALL[FRAME_POINT] + _POINT.pack(micros, self._offset)))
+                kind |= FLAG_ABSOLUTE_TIME
+                timestamp = _INT64.pack(micros)
+            else:
+                timestamp = _zigzag(micros - self._last_time)
+            self._last_time = micros
+            
+            frame = _frame(b''.join([_SMALL[kind], timestamp, _varint(record.levelno), _varint(name_id)] + body))
+            self._stream.write(frame)
+            self._offset += len(frame)
+            
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        self.acquire()
+        try:
+            if self._stream is not None:
+                self._stream.flush()
+                self._index.flush()
+        finally:
+            self.release()
+    
+    def close(self):
+        self.acquire()
+        try:
+            if self._stream is not None:
+                try:
+                    self._stream.close()
+                finally:
+                    self._index.close()
+                    self._stream = None
+                    self._index = None
+        finally:
+            self.release()
+            super().close()
+
+def _read_varint(data, offset):
+    byte = data[offset]
+    if byte < 0x80:
+        return byte, offset + 1
+    value = byte & 0x7f
+    shift = 7
+    while True:
+        offset += 1
+        byte = data[offset]
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset + 1
+        shift += 7
+
+def _read_zigzag(data, offset):
+    value, offset = _read_varint(data, offset)
+    return (value >> 1) ^ -(value & 1), offset
+
+def _read_text(data, offset):
+    length, offset = _read_varint(data, offset)
+    end = offset + length
+    return str(data[offset:end], 'utf-8', 'surrogateescape'), end
+
+def _read_args(data, offset):
+    count = data[offset]
+    offset += 1
+    args = []
+    for _ in range(count):
+        tag = data[offset]
+        offset += 1
+        if tag == _ARG_STR:
+            value, offset = _read_text(data, offset)
+        elif tag == _ARG_INT:
+            value, offset = _read_zigzag(data, offset)
+        elif tag == _ARG_FLOAT:
+            value = _FLOAT.unpack_from(data, offset)[0]
+            offset += 8
+        elif tag == _ARG_NONE:
+            value = None
+        elif tag == _ARG_TRUE:
+            value = True
+        elif tag == _ARG_FALSE:
+            value = False
+        else:
+            raise ValueError(f"unknown argument tag {tag}")
+        args.append(value)
+    return tuple(args), offset
+
+@contextlib.contextmanager
+def _mapped(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a smartlogger binary log")
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield data
+    finally:
+        data.close()
+
+def _valid_length(path):
+    reader = BinaryLogReader(path)
+    with _mapped(path) as data:
+        for _ in reader._frames(data, len(MAGIC)):
+            pass
+    return reader.end_offset
+
+class BinaryLogReader:
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.end_offset = len(MAGIC)
+    
+    def _frames(self, data, start):
+        size = len(data)
+        offset = self.end_offset = start
+        while offset < size:
+            try:
+                length, body = _read_varint(data, offset)
+            except IndexError:
+                return
+            end = body + length
+            if end > size or not length:
+                return
+            yield body, end
+            offset = self.end_offset = end
+    
+    def _load(self, path):
+        strings = []
+        points = []
+        with _mapped(path) as data:
+            for body, end in self._frames(data, len(MAGIC)):
+                kind = data[body]
+                if kind == FRAME_STRING:
+                    _, offset = _read_varint(data, body + 1)
+                    strings.append(str(data[offset:end], 'utf-8', 'surrogateescape'))
+                elif kind == FRAME_POINT:
+                    points.append(_POINT.unpack_from(data, body + 1))
+        return strings, points
+    
+    def load_strings(self):
+        return self._load(self.path)[0]
+    
+    def load_index(self):
+        try:
+            return self._load(index_path(self.path))
+        except (OSError, ValueError):
+            return None, None
+    
+    def _seek_start(self, since):
+        if since is None:
+            return None, len(MAGIC)
+        strings, points = self.load_index()
+        if not points:
+            return None, len(MAGIC)
+        position = bisect.bisect_left([micros for micros, _ in points], round(since * 1e6)) - 1
+        if position < 0:
+            return None, len(MAGIC)
+        return strings, points[position][1]
+    
+    def records(self, level=logging.NOTSET, loggers=None, since=None, until=None):
+        strings, start = self._seek_start(since)
+        strings = list(strings) if strings else []
+        if not strings:
+            start = len(MAGIC)
+        prefixes = tuple(loggers) if loggers else None
+        micros = 0
+        
+        with _mapped(self.path) as data:
+            try:
+                for body, end in self._frames(data, start):
+                    kind = data[body]
+                    frame_type = kind & 0x0f
+                    if frame_type == FRAME_STRING:
+                        string_id, offset = _read_varint(data, body + 1)
+                        if string_id == len(strings):
+                            strings.append(str(data[offset:end], 'utf-8', 'surrogateescape'))
+                        continue
+                    if frame_type != FRAME_RECORD:
+                        continue
+                    
+                    if kind & FLAG_ABSOLUTE_TIME:
+                        micros = _INT64.unpack_from(data, body + 1)[0]
+                        offset = body + 9
+                    else:
+                        delta, offset = _read_zigzag(data, body + 1)
+                        micros += delta
+                    levelno, offset = _read_varint(data, offset)
+                    name_id, offset = _read_varint(data, offset)
+                    
+                    created = micros / 1e6
+                    if levelno < level:
+                        continue
+                    if since is not None and created < since:
+                        continue
+                    if until is not None and created > until:
+                        continue
+                    name = strings[name_id]
+                    if prefixes and not any(name == prefix or name.startswith(prefix + '.') for prefix in prefixes):
+                        continue
+                    
+                    if kind & FLAG_INLINE_MESSAGE:
+                        msg, offset = _read_text(data, offset)
+                        args = None
+                    else:
+                        msg_id, offset = _read_varint(data, offset)
+                        msg = strings[msg_id]
+                        args, offset = _read_args(data, offset)
+                    exc_text = _read_text(data, offset)[0] if kind & FLAG_EXC_TEXT else None
+                    
+                    record = logging.LogRecord(name, levelno, '', 0, msg, None, None)
+                    record.args = args
+                    record.created = created
+                    record.msecs = (created - int(created)) * 1000
+                    record.relativeCreated = (created - logging._startTime) * 1000
+                    record.exc_text = exc_text
+                    yield record
+            
+            except (IndexError, struct.error) as e:
+                raise ValueError(f"{self.path}: corrupt record frame at offset {body}") from e
+    
+    def __iter__(self):
+        return self.records()
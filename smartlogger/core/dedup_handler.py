@@ -0,0 +1,111 @@
+import collections
+import logging
+from .handler import ColorHandler
+from .formatter import ColorFormatter
+from ..config.colors import Colors
+
+class _Window:
+    __slots__ = ('start', 'last_seen', 'count', 'record')
+    
+    def __init__(self, record):
+        self.start = record.created
+        self.last_seen = record.created
+        self.count = 0
+        self.record = record
+
+class DedupHandler(logging.Handler):
+    def __init__(self, target=None, window=10.0, maxsize=1024, summary_color=Colors.MAGENTA):
+        super().__init__()
+        self._owns_target = target is None
+        self.target = ColorHandler() if target is None else target
+        self.window = window
+        self.maxsize = maxsize
+        self.summary_color = summary_color
+        self.suppressed = 0
+        self._windows = collections.OrderedDict()
+    
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+    
+    @staticmethod
+    def _key(record):
+        msg = record.msg if isinstance(record.msg, str) else type(record.msg).__qualname__
+        return (record.name, record.levelno, msg, record.pathname, record.lineno)
+    
+    def emit(self, record):
+        try:
+            windows = self._windows
+            self._expire(record.created)
+            key = self._key(record)
+            entry = windows.get(key)
+            
+            if entry is not None:
+                windows.move_to_end(key)
+                if record.created - entry.start < self.window:
+                    entry.count += 1
+                    entry.last_seen = record.created
+                    self.suppressed += 1
+                    return
+                self._summarize(entry)
+                windows[key] = _Window(record)
+            else:
+                windows[key] = _Window(record)
+                if len(windows) > self.maxsize:
+                    self._summarize(windows.popitem(last=False)[1])
+            
+            self.target.handle(record)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _expire(self, now):
+        windows = self._windows
+        while windows:
+            key, entry = next(iter(windows.items()))
+            if now - entry.last_seen < self.window:
+                return
+            del windows[key]
+            self._summarize(entry)
+    
+    def _summarize(self, entry):
+        if not entry.count:
+            return
+        original = entry.record
+        elapsed = max(entry.last_seen - entry.start, 0.0)
+        times = 'time' if entry.count == 1 else 'times'
+        text = f"repeated {entry.count:,} {times} in {elapsed:.0f}s"
+        
+        formatter = self.target.formatter
+        if isinstance(formatter, ColorFormatter) and formatter.color_enabled and self.summary_color:
+            text = Colors.colorize(text, self.summary_color)
+        
+        summary = logging.makeLogRecord(original.__dict__)
+        summary.msg = "%s [%s]"
+        summary.args = (original.getMessage(), text)
+        summary.exc_info = None
+        summary.exc_text = None
+        summary.stack_info = None
+        summary.created = entry.last_seen
+        summary.msecs = (entry.last_seen - int(entry.last_seen)) * 1000
+        summary.relativeCreated = (entry.last_seen - logging._startTime) * 1000
+        entry.count = 0
+        self.target.handle(summary)
+    
+    def flush(self):
+        self.acquire()
+        try:
+            for entry in self._windows.values():
+                self._summarize(entry)
+        finally:
+            self.release()
+        self.target.flush()
+    
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self._owns_target:
+                self.target.close()
+            super().close()
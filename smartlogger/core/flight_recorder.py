@@ -0,0 +1,108 @@
+import logging
+from array import array
+from .handler import ColorHandler
+
+class FlightRecorder(logging.Handler):
+    def __init__(self, capacity=1000, target=None, trigger_level=logging.ERROR, *, render_args=False):
+        super().__init__()
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.trigger_level = trigger_level
+        self.render_args = render_args
+        self._owns_target = target is None
+        self.target = ColorHandler() if target is None else target
+        self.dumps = 0
+        
+        self._levelno = array('i', bytes(4 * capacity))
+        self._created = array('d', bytes(8 * capacity))
+        self._name_id = array('I', bytes(4 * capacity))
+        self._msg = [None] * capacity
+        self._args = [None] * capacity
+        self._name_ids = {}
+        self._names = []
+        self._next = 0
+        self._size = 0
+    
+    def __len__(self):
+        return self._size
+    
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+    
+    def emit(self, record):
+        try:
+            if record.levelno >= self.trigger_level:
+                self._dump(record)
+            else:
+                self._store(record)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _store(self, record):
+        name_id = self._name_ids.get(record.name)
+        if name_id is None:
+            name_id = self._name_ids[record.name] = len(self._names)
+            self._names.append(record.name)
+        
+        i = self._next
+        self._levelno[i] = record.levelno
+        self._created[i] = record.created
+        self._name_id[i] = name_id
+        if self.render_args:
+            self._msg[i] = record.getMessage()
+            self._args[i] = None
+        else:
+            self._msg[i] = record.msg
+            self._args[i] = record.args
+        
+        i += 1
+        self._next = 0 if i == self.capacity else i
+        if self._size < self.capacity:
+            self._size += 1
+    
+    def records(self):
+        capacity = self.capacity
+        factory = logging.getLogRecordFactory()
+        start = (self._next - self._size) % capacity
+        for offset in range(self._size):
+            i = (start + offset) % capacity
+            record = factory(self._names[self._name_id[i]], self._levelno[i], '', 0, self._msg[i], None, None)
+            record.args = self._args[i]
+            created = self._created[i]
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            record.relativeCreated = (created - logging._startTime) * 1000
+            yield record
+    
+    def _dump(self, trigger):
+        context = list(self.records())
+        self.clear()
+        self.dumps += 1
+        target = self.target
+        for record in context:
+            target.handle(record)
+        target.handle(trigger)
+    
+    def clear(self):
+        self.acquire()
+        try:
+            self._msg[:] = [None] * self.capacity
+            self._args[:] = [None] * self.capacity
+            self._next = 0
+            self._size = 0
+        finally:
+            self.release()
+    
+    def flush(self):
+        self.target.flush()
+    
+    def close(self):
+        try:
+            if self._owns_target:
+                self.target.close()
+        finally:
+            super().close()
@@ -1,36 +1,447 @@
+import functools
 import logging
+import re
+import time
 from ..config.colors import Colors
 from ..config.defaults import DEFAULT_FORMAT, DEFAULT_DATE_FORMAT
-from ..utils.terminal import is_terminal_supports_color
+from ..utils.terminal import DEPTH_16, stream_supports_color, stream_color_depth
 from ..utils.compatibility import ensure_color_support
+from .tracebacks import TracebackCache
+
+_FIELD_PATTERN = re.compile(r'%%|%\((\w+)\)([#0+ -]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[diouxefgcrsa])', re.I)
+
+def _build_level_table():
+    table = {}
+    for name in logging._nameToLevel:
+        table[name] = Colors.colorize(name, Colors.get_color_for_level(name))
+    return table
+
+def _to_positional(fmt):
+    fields = []
+    
+    def replace(match):
+        name, spec = match.groups()
+        if name is None:
+            return '%%'
+        if '*' in spec:
+            raise ValueError('star width is not supported in a mapping format')
+        fields.append(name)
+        return '%' + spec
+    
+    positional = _FIELD_PATTERN.sub(replace, fmt)
+    if positional.replace('%%', '').count('%') != len(fields):
+        raise ValueError('unsupported format string')
+    return positional, fields
+
+def _value_expression(name):
+    if name == 'message':
+        return 'message'
+    if name == 'asctime':
+        return 'asctime'
+    if name == 'levelname':
+        return 'levelname'
+    if name == 'name':
+        return 'name'
+    return f'd[{name!r}]'
+
+def _render_prologue(fields, highlight=False, cached_time=False):
+    lines = ['    d = record.__dict__']
+    if 'message' in fields:
+        lines.append('    message = record.getMessage()')
+        if highlight:
+            lines.append('    message = self._highlighter.highlight(message)')
+    if 'name' in fields:
+        lines.append('    name = d["name"]')
+    if 'asctime' in fields and cached_time:
+        lines.append('    datefmt = self.datefmt')
+        lines.append('    cache = self._time_cache')
+        lines.append('    if (datefmt and cache is not None and cache[0] == int(d["created"]) and cache[1] == datefmt')
+        lines.append('            and cache[2] is self.converter and cache[3] is _time.tzname):')
+        lines.append('        asctime = cache[4]')
+        lines.append('    else:')
+        lines.append('        asctime = self.formatTime(record, datefmt)')
+    elif 'asctime' in fields:
+        lines.append('    asctime = self.formatTime(record, self.datefmt)')
+    return lines
+
+def _tuple_expression(fields):
+    values = [_value_expression(name) for name in fields]
+    return f'({", ".join(values)}{"," if values else ""})'
+
+def _fstring_expression(fmt):
+    template = []
+    bindings = []
+    start = 0
+    for match in _FIELD_PATTERN.finditer(fmt):
+        name, spec = match.groups()
+        template.append(fmt[start:match.start()].replace('{', '{{').replace('}', '}}'))
+        start = match.end()
+        if name is None:
+            template.append('%')
+        elif spec != 's':
+            return None, ()
+        elif name in ('message', 'asctime', 'levelname', 'name'):
+            template.append(f'{{{name}!s}}')
+        else:
+            variable = f'v{len(bindings)}'
+            bindings.append(f'    {variable} = d[{name!r}]')
+            template.append(f'{{{variable}!s}}')
+    template.append(fmt[start:].replace('{', '{{').replace('}', '}}'))
+    return 'f' + repr(''.join(template)), bindings
+
+@functools.lru_cache(maxsize=256)
+def _compile_percent_format(fmt, color=False, highlight=False, loggers=False, cached_time=False):
+    positional, fields = _to_positional(fmt)
+    
+    lines = ['def render(self, record):'] + _render_prologue(fields, highlight and color, cached_time)
+    if 'levelname' in fields:
+        lines.append('    levelname = d["levelname"]')
+        if color:
+            lines.append('    levelname = self._level_table.get(levelname) or self._color_level(levelname, d["levelno"])')
+    if 'name' in fields and color and loggers:
+        lines.append('    name = self._logger_table.get(name) or self._color_logger(name)')
+    expression, bindings = _fstring_expression(fmt)
+    if expression is None:
+        lines.append(f'    return _FMT % {_tuple_expression(fields)}')
+    else:
+        lines.extend(bindings)
+        lines.append(f'    return {expression}')
+    
+    namespace = {'_FMT': positional, '_time': time}
+    exec('\n'.join(lines), namespace)
+    return namespace['render']
+
+@functools.lru_cache(maxsize=256)
+def _compile_percent_segments(fmt, split=('levelname',)):
+    chunks = []
+    splits = []
+    start = 0
+    for match in _FIELD_PATTERN.finditer(fmt):
+        if match.group(1) in split:
+            chunks.append(fmt[start:match.start()])
+            splits.append((match.group(1), '%' + match.group(2)))
+            start = match.end()
+    chunks.append(fmt[start:])
+    
+    compiled = [_to_positional(chunk) for chunk in chunks]
+    all_fields = [name for _, fields in compiled for name in fields]
+    
+    namespace = {}
+    renders = []
+    for index, (positional, fields) in enumerate(compiled):
+        namespace[f'_F{index}'] = positional
+        renders.append(f'_F{index} % {_tuple_expression(fields)}')
+    
+    lines = ['def render_segments(self, record):'] + _render_prologue(all_fields)
+    lines.append(f'    return ({", ".join(renders)},)')
+    
+    exec('\n'.join(lines), namespace)
+    return namespace['render_segments'], tuple(splits)
+
+def _measured_format(self, record):
+    start = time.perf_counter()
+    s = type(self).format(self, record)
+    self._metrics.observe('format_time', time.perf_counter() - start)
+    return s
 
 class ColorFormatter(logging.Formatter):
-    def __init__(self, fmt=None, datefmt=None, style='%', validate=True, *, defaults=None):
+    _metrics = None
+    _compiled = False
+    _color_enabled = False
+    _color_forced = False
+    _highlighter = None
+    _theme = None
+    _palette = None
+    _logger_table = None
+    _themed_highlighter = None
+    _source_highlighter = None
+    
+    def __init__(self, fmt=None, datefmt=None, style='%', validate=True, *, defaults=None, compiled=True, metrics=None, highlighter=None, theme=None, stream=None, traceback_cache=256, traceback_window=None):
         super().__init__(fmt or DEFAULT_FORMAT, datefmt or DEFAULT_DATE_FORMAT, style, validate, defaults=defaults)
-        self.color_enabled = is_terminal_supports_color()
-        if self.color_enabled:
+        self._color_enabled = stream_supports_color(stream)
+        if self._color_enabled:
             ensure_color_support()
+        
+        self._highlighter = highlighter
+        self._stream = stream
+        self._time_cache = None
+        self._level_table = _build_level_table()
+        self.tracebacks = TracebackCache(traceback_cache, traceback_window) if traceback_cache else None
+        self._compiled = compiled
+        self._segment_render = None
+        if theme is not None:
+            self.theme = theme
+        self._refresh_render()
+        if metrics is not None:
+            self.metrics = metrics
+    
+    @property
+    def metrics(self):
+        return self._metrics
+    
+    @metrics.setter
+    def metrics(self, metrics):
+        from .metrics import instrument
+        instrument(self, metrics, {'format': _measured_format})
+    
+    @property
+    def color_enabled(self):
+        return self._color_enabled
+    
+    @color_enabled.setter
+    def color_enabled(self, enabled):
+        self._color_enabled = enabled
+        self._color_forced = True
+        self._refresh_render()
+    
+    @property
+    def stream(self):
+        return self._stream
+    
+    @stream.setter
+    def stream(self, stream):
+        self._stream = stream
+        if not self._color_forced:
+            self._color_enabled = stream_supports_color(stream)
+            if self._color_enabled:
+                ensure_color_support()
+        if self._theme is not None:
+            self.theme = self._theme
+        else:
+            self._refresh_render()
+    
+    @property
+    def highlighter(self):
+        return self._highlighter
+    
+    @highlighter.setter
+    def highlighter(self, highlighter):
+        self._highlighter = highlighter
+        self._refresh_render()
+    
+    @property
+    def theme(self):
+        return self._theme
+    
+    @theme.setter
+    def theme(self, theme):
+        if self.highlighter is not None and self.highlighter is self._themed_highlighter:
+            self.highlighter = self._source_highlighter
+        self._themed_highlighter = self._source_highlighter = None
+        if theme is None:
+            self._theme = self._palette = self._logger_table = None
+            self._level_table = _build_level_table()
+            self._refresh_render()
+            return
+        
+        from ..config.themes import get_theme
+        if isinstance(theme, str):
+            theme = get_theme(theme)
+        palette = theme.compile(stream_color_depth(self._stream) or DEPTH_16)
+        self._theme = theme
+        self._palette = palette
+        self._level_table = palette.level_names
+        self._logger_table = palette.logger_names if palette.colors_loggers else None
+        if self.highlighter is not None and palette.highlights:
+            self._source_highlighter = self.highlighter
+            self.highlighter = self._themed_highlighter = self.highlighter.recolored(palette.highlights)
+        self._refresh_render()
+    
+    def _refresh_render(self):
+        self._render = None
+        self._segment_render = None
+        if self._compiled:
+            color = self._color_enabled
+            self._render = self._compile(_compile_percent_format, color, color and self._highlighter is not None,
+                                         color and self._logger_table is not None,
+                                         type(self).formatTime is ColorFormatter.formatTime)
+    
+    def _compile(self, compiler, *options):
+        if type(self._style) is not logging.PercentStyle or getattr(self._style, '_defaults', None):
+            return None
+        if type(self).formatMessage is not logging.Formatter.formatMessage:
+            return None
+        try:
+            return compiler(self._fmt, *options)
+        except (ValueError, SyntaxError):
+            return None
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cache = self._time_cache
+        if (cache is None or cache[0] != second or cache[1] != datefmt
+                or cache[2] is not self.converter or cache[3] is not time.tzname):
+            cache = self._render_second(second, datefmt)
+            if cache is None:
+                return super().formatTime(record, datefmt)
+        
+        if datefmt:
+            return cache[4]
+        if self.default_msec_format:
+            return self.default_msec_format % (cache[4], record.msecs)
+        return cache[4]
+    
+    def _render_second(self, second, datefmt):
+        if datefmt and '%f' in datefmt:
+            return None
+        tzname = time.tzname
+        converter = self.converter
+        text = time.strftime(datefmt or self.default_time_format, converter(second))
+        cache = (second, datefmt, converter, tzname, text)
+        self._time_cache = cache
+        return cache
+    
+    def formatException(self, ei):
+        if self.tracebacks is not None:
+            s = self.tracebacks.render(ei)
+            if s is not None:
+                return s
+        return super().formatException(ei)
+    
+    def _format_exception(self, record, color):
+        if self.tracebacks is not None and type(self).formatException is ColorFormatter.formatException:
+            s = self.tracebacks.render(record.exc_info, color, record)
+            if s is not None:
+                return s
+        return self.formatException(record.exc_info)
+    
+    def _cache_exc_text(self, record):
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._format_exception(record, False)
+    
+    def _color_level(self, levelname, levelno=None):
+        if self._palette is not None:
+            return self._palette.color_level(levelname, levelno)
+        colored = Colors.colorize(levelname, Colors.get_color_for_level(levelname))
+        self._level_table[levelname] = colored
+        return colored
+    
+    def _color_logger(self, name):
+        return self._palette.color_logger(name)
     
     def format(self, record):
-        if not self.color_enabled:
+        render = self._render
+        if render is not None:
+            try:
+                s = render(self, record)
+                if record.exc_info or record.exc_text or record.stack_info:
+                    s = self._append_details(s, record, self._details(record, self._color_enabled))
+                return s
+            except (KeyError, TypeError, ValueError):
+                pass
+        
+        if not self._color_enabled:
+            self._cache_exc_text(record)
             return super().format(record)
         
-        original_levelname = record.levelname
-        color = Colors.get_color_for_level(record.levelname)
+        original_levelname, original_name = record.levelname, record.name
+        original_msg, original_args = record.msg, record.args
         
-        if color:
-            record.levelname = Colors.colorize(record.levelname, color)
+        record.levelname = self._level_table.get(record.levelname) or self._color_level(record.levelname, record.levelno)
+        if self._logger_table is not None:
+            record.name = self._logger_table.get(record.name) or self._color_logger(record.name)
+        if self._highlighter is not None:
+            record.msg = self._highlighter.highlight(record.getMessage())
+            record.args = None
+        original_exc_text = record.exc_text
+        if record.exc_info:
+            record.exc_text = self._format_exception(record, True)
         
         try:
             formatted = super().format(record)
         finally:
-            record.levelname = original_levelname
+            record.levelname, record.name = original_levelname, original_name
+            record.msg, record.args = original_msg, original_args
+            record.exc_text = original_exc_text
         
         return formatted
     
+    def _details(self, record, color=False):
+        exc_text = record.exc_text
+        if record.exc_info and (color or not exc_text):
+            exc_text = self._format_exception(record, color)
+        stack_text = self.formatStack(record.stack_info) if record.stack_info else None
+        return exc_text, stack_text
+    
+    def _append_details(self, s, record, details):
+        exc_text, stack_text = details
+        if exc_text:
+            if s[-1:] != "\n":
+                s = s + "\n"
+            s = s + exc_text
+        if stack_text:
+            if s[-1:] != "\n":
+                s = s + "\n"
+            s = s + stack_text
+        return s
+    
+    def format_segments(self, record):
+        if self._segment_render is None:
+            split = ()
+            if self._color_enabled:
+                split = ('levelname',)
+                if self._logger_table is not None:
+                    split += ('name',)
+                if self._highlighter is not None:
+                    split += ('message',)
+            compiled = self._compile(_compile_percent_segments, split) if self._compiled else None
+            self._segment_render = compiled or False
+        
+        if self._segment_render:
+            try:
+                return self._format_segments_compiled(record)
+            except (KeyError, TypeError, ValueError):
+                pass
+        
+        self._cache_exc_text(record)
+        plain = logging.Formatter.format(self, record)
+        if not self._color_enabled:
+            return plain, plain
+        return plain, self.format(record)
+    
+    def _segment_values(self, record, field):
+        if field == 'levelname':
+            plain = record.levelname
+            return plain, self._level_table.get(plain) or self._color_level(plain, record.levelno)
+        if field == 'name':
+            plain = record.name
+            return plain, self._logger_table.get(plain) or self._color_logger(plain)
+        plain = record.getMessage()
+        return plain, self._highlighter.highlight(plain)
+    
+    def _format_segments_compiled(self, record):
+        render, splits = self._segment_render
+        texts = render(self, record)
+        
+        if splits:
+            values = {}
+            plain_parts = [texts[0]]
+            colored_parts = [texts[0]]
+            for (field, spec), text in zip(splits, texts[1:]):
+                value = values.get(field)
+                if value is None:
+                    value = values[field] = self._segment_values(record, field)
+                plain_parts.append(spec % value[0])
+                plain_parts.append(text)
+                colored_parts.append(spec % value[1])
+                colored_parts.append(text)
+            plain = ''.join(plain_parts)
+            colored = ''.join(colored_parts)
+        else:
+            plain = colored = texts[0]
+        
+        if record.exc_info or record.exc_text or record.stack_info:
+            plain_details = self._details(record)
+            if colored is plain:
+                plain = colored = self._append_details(plain, record, plain_details)
+            else:
+                plain = self._append_details(plain, record, plain_details)
+                colored = self._append_details(colored, record, self._details(record, True))
+        return plain, colored
+    
     def enable_colors(self):
         self.color_enabled = True
         ensure_color_support()
     
     def disable_colors(self):
-        self.color_enabled = False 
\ No newline at end of file
+        self.color_enabled = False
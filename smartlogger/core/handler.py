@@ -1,15 +1,197 @@
 import logging
 import sys
+import threading
+import time
+import weakref
 from .formatter import ColorFormatter
-from ..utils.terminal import is_terminal_supports_color
+from ..config.colors import Colors
+
+def _measured_acquire(self):
+    lock = self.lock
+    if lock._is_owned():
+        lock.acquire()
+        return
+    start = time.perf_counter()
+    lock.acquire()
+    self._metrics.observe('lock_wait', time.perf_counter() - start)
+
+def _measured_emit(self, record):
+    self._metrics.record(record.levelname)
+    return type(self).emit(self, record)
+
+def _measured_write(self, msg, record):
+    start = time.perf_counter()
+    type(self)._write(self, msg, record)
+    metrics = self._metrics
+    metrics.observe('write_time', time.perf_counter() - start)
+    metrics.increment('chars_written', len(msg))
+
+def _measured_write_buffer(self):
+    start = time.perf_counter()
+    type(self)._write_buffer(self)
+    self._metrics.observe('flush_time', time.perf_counter() - start)
+
+_MEASURED_METHODS = {
+    'acquire': _measured_acquire,
+    'emit': _measured_emit,
+    '_write': _measured_write,
+    '_write_buffer': _measured_write_buffer,
+}
+
+def _flush_loop(handler_ref, stop, interval):
+    wait = interval
+    while not stop.wait(wait):
+        handler = handler_ref()
+        if handler is None:
+            return
+        wait = handler._flush_expired(interval)
+        handler = None
 
 class ColorHandler(logging.StreamHandler):
-    def __init__(self, stream=None):
+    _metrics = None
+    
+    def __init__(self, stream=None, *, buffer_size=0, flush_interval=None, flush_level=logging.ERROR, shedder=None, metrics=None):
         super().__init__(stream or sys.stderr)
-        self.setFormatter(ColorFormatter())
+        self.setFormatter(ColorFormatter(metrics=metrics, stream=self.stream))
+        
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self.shedder = shedder
+        self._buffer = []
+        self._buffered = 0
+        self._buffer_started = 0.0
+        self._flusher = None
+        self._stop_flusher = threading.Event()
+        
+        if metrics is not None:
+            self.metrics = metrics
+        
+        if buffer_size and flush_interval:
+            self._flusher = threading.Thread(target=_flush_loop, args=(weakref.ref(self), self._stop_flusher, flush_interval),
+                                             name='smartlogger-flusher', daemon=True)
+            self._flusher.start()
+            weakref.finalize(self, self._stop_flusher.set)
+    
+    @property
+    def metrics(self):
+        return self._metrics
+    
+    @metrics.setter
+    def metrics(self, metrics):
+        from .metrics import instrument
+        instrument(self, metrics, _MEASURED_METHODS)
+    
+    def setFormatter(self, fmt):
+        if isinstance(fmt, ColorFormatter) and fmt.stream is None:
+            fmt.stream = self.stream
+        super().setFormatter(fmt)
+    
+    def setStream(self, stream):
+        old = super().setStream(stream)
+        formatter = self.formatter
+        if old is not None and isinstance(formatter, ColorFormatter) and formatter.stream is old:
+            formatter.stream = self.stream
+        return old
+    
+    def handle(self, record):
+        shedder = self.shedder
+        if shedder is None:
+            return super().handle(record)
+        if not shedder.admit(record.levelno):
+            if self._metrics is not None:
+                self._metrics.increment('dropped.' + record.levelname)
+            return False
+        
+        start = time.perf_counter()
+        rv = super().handle(record)
+        now = time.perf_counter()
+        shedder.observe(now - start, now)
+        
+        counts = shedder.take_report(now)
+        if counts:
+            self._write_shed_marker(counts, shedder.stage)
+        return rv
+    
+    def _write_shed_marker(self, counts, stage):
+        shed = ', '.join(f"{count:,} {logging.getLevelName(levelno)}" for levelno, count in sorted(counts.items()))
+        text = f"smartlogger: shed {shed} records under load (stage {stage})"
+        if getattr(self.formatter, 'color_enabled', False):
+            text = Colors.colorize(text, Colors.MAGENTA)
+        
+        record = logging.makeLogRecord({'name': 'smartlogger', 'levelno': logging.WARNING, 'levelname': 'WARNING', 'msg': text})
+        self.acquire()
+        try:
+            if self.stream:
+                self._write(text + self.terminator, record)
+        except Exception:
+            self.handleError(record)
+        finally:
+            self.release()
     
     def emit(self, record):
         try:
-            super().emit(record)
+            self._write(self.format(record) + self.terminator, record)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _write(self, msg, record):
+        if not self.buffer_size:
+            self.stream.write(msg)
+            self.flush()
+            return
+        
+        if not self._buffer:
+            self._buffer_started = time.monotonic()
+        self._buffer.append(msg)
+        self._buffered += len(msg)
+        
+        if self._buffered >= self.buffer_size or record.levelno >= self.flush_level:
+            self._write_buffer()
+    
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+        data = ''.join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+        self.stream.write(data)
+        if hasattr(self.stream, 'flush'):
+            self.stream.flush()
+    
+    def _flush_expired(self, interval):
+        self.acquire()
+        try:
+            if self._buffer:
+                remaining = self._buffer_started + interval - time.monotonic()
+                if remaining <= 0:
+                    self._write_buffer()
+                else:
+                    return remaining
         except Exception:
-            self.handleError(record) 
\ No newline at end of file
+            pass
+        finally:
+            self.release()
+        return interval
+    
+    def flush(self):
+        self.acquire()
+        try:
+            if self._buffer and self.stream:
+                self._write_buffer()
+        finally:
+            self.release()
+        super().flush()
+    
+    def close(self):
+        try:
+            if self.shedder is not None:
+                counts = self.shedder.take_report()
+                if counts:
+                    self._write_shed_marker(counts, self.shedder.stage)
+            self.flush()
+        finally:
+            self._stop_flusher.set()
+            super().close()
@@ -0,0 +1,110 @@
+import functools
+import re
+from ..config.colors import Colors, ANSI_ESCAPE_PATTERN
+
+DEFAULT_RULES = (
+    ('url', r'\b(?:https?|wss?|ftp)://[^\s"\'<>]+', Colors.CYAN),
+    ('uuid', r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b', Colors.MAGENTA),
+    ('ipv4', r'\b(?:\d{1,3}\.){3}\d{1,3}(?::\d{1,5})?\b', Colors.BRIGHT_MAGENTA),
+    ('ipv6', r'(?<![\w:])(?=[0-9a-fA-F]{0,4}:[0-9a-fA-F]{0,4}:)(?:(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}|(?:[0-9a-fA-F]{1,4}:){0,6}(?:[0-9a-fA-F]{1,4})?::(?:[0-9a-fA-F]{1,4}(?::[0-9a-fA-F]{1,4}){0,6})?)(?![\w:])', Colors.BRIGHT_MAGENTA),
+    ('string', r'(?<!\w)(?:"[^"\n]*"|\'[^\'\n]*\'(?!\w))', Colors.GREEN),
+    ('number', r'(?<![\w.])[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?', Colors.BRIGHT_CYAN),
+)
+
+KEYWORD_COLOR = Colors.BRIGHT_RED + Colors.BOLD
+
+class Highlighter:
+    def __init__(self, rules=DEFAULT_RULES, keywords=(), *, keyword_color=KEYWORD_COLOR, ignore_case=True, cache_size=1024, cache_max_length=256):
+        self._rules = [tuple(rule) for rule in rules]
+        self._keywords = {}
+        self.keyword_color = keyword_color
+        self.ignore_case = ignore_case
+        self.cache_size = cache_size
+        self.cache_max_length = cache_max_length
+        for keyword in keywords:
+            if isinstance(keyword, str):
+                self._keywords[keyword] = keyword_color
+            else:
+                word, color = keyword
+                self._keywords[word] = color
+        self._compile()
+    
+    @property
+    def rules(self):
+        return tuple(self._rules)
+    
+    @property
+    def keywords(self):
+        return dict(self._keywords)
+    
+    def add_rule(self, name, pattern, color, first=False):
+        if not name.isidentifier() or name.startswith('_'):
+            raise ValueError(f"invalid rule name: {name!r}")
+        self._rules = [rule for rule in self._rules if rule[0] != name]
+        if first:
+            self._rules.insert(0, (name, pattern, color))
+        else:
+            self._rules.append((name, pattern, color))
+        self._compile()
+    
+    def remove_rule(self, name):
+        self._rules = [rule for rule in self._rules if rule[0] != name]
+        self._compile()
+    
+    def add_keyword(self, word, color=None):
+        self._keywords[word] = color or self.keyword_color
+        self._compile()
+    
+    def remove_keyword(self, word):
+        self._keywords.pop(word, None)
+        self._compile()
+    
+    def recolored(self, colors):
+        keyword_color = colors.get('keyword') or self.keyword_color
+        keywords = [(word, keyword_color if color == self.keyword_color else color) for word, color in self._keywords.items()]
+        rules = [(name, pattern, colors.get(name, color)) for name, pattern, color in self._rules]
+        return type(self)(rules, keywords, keyword_color=keyword_color, ignore_case=self.ignore_case,
+                          cache_size=self.cache_size, cache_max_length=self.cache_max_length)
+    
+    def _compile(self):
+        groups = [f'(?P<_ansi>{ANSI_ESCAPE_PATTERN})']
+        colors = {'_ansi': None}
+        
+        if self._keywords:
+            words = sorted(self._keywords, key=len, reverse=True)
+            alternation = '|'.join(re.escape(word) for word in words)
+            flags = '(?i:' if self.ignore_case else '(?:'
+            groups.append(f'(?P<_keyword>(?<!\\w){flags}{alternation})(?!\\w))')
+            colors['_keyword'] = None
+        
+        for name, pattern, color in self._rules:
+            groups.append(f'(?P<{name}>{pattern})')
+            colors[name] = color
+        
+        self._colors = colors
+        self._keyword_colors = {word.lower() if self.ignore_case else word: color for word, color in self._keywords.items()}
+        self._pattern = re.compile('|'.join(groups))
+        self._cached = functools.lru_cache(maxsize=self.cache_size)(self._highlight) if self.cache_size else self._highlight
+    
+    def _replace(self, match):
+        name = match.lastgroup
+        text = match.group()
+        if name == '_keyword':
+            color = self._keyword_colors.get(text.lower() if self.ignore_case else text)
+        else:
+            color = self._colors[name]
+        if not color:
+            return text
+        return f"{color}{text}{Colors.RESET}"
+    
+    def _highlight(self, text):
+        return self._pattern.sub(self._replace, text)
+    
+    def highlight(self, text):
+        if len(text) > self.cache_max_length:
+            return self._highlight(text)
+        return self._cached(text)
+    
+    def cache_info(self):
+        info = getattr(self._cached, 'cache_info', None)
+        return info() if info else None
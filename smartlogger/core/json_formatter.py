@@ -0,0 +1,168 @@
+import json
+import logging
+import math
+from json.encoder import encode_basestring
+from ..config.colors import Colors
+from ..utils.terminal import stream_supports_color
+from ..utils.compatibility import ensure_color_support
+
+DEFAULT_FIELDS = (
+    ('time', 'created'),
+    ('level', 'levelname'),
+    ('logger', 'name'),
+    ('message', 'message'),
+)
+
+RESERVED_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {'message', 'asctime'}
+
+def _finite(value):
+    if type(value) is float and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+def encode_value(value):
+    kind = type(value)
+    if kind is str:
+        return encode_basestring(value)
+    if kind is int:
+        return int.__repr__(value)
+    if kind is float:
+        return float.__repr__(value) if math.isfinite(value) else 'null'
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    try:
+        return json.dumps(value, default=str, ensure_ascii=False, allow_nan=False)
+    except ValueError:
+        pass
+    except TypeError:
+        return encode_basestring(str(value))
+    try:
+        return json.dumps(_finite(value), default=str, ensure_ascii=False, allow_nan=False)
+    except (ValueError, TypeError, RecursionError):
+        return encode_basestring(str(value))
+
+class JSONFormatter(logging.Formatter):
+    def __init__(self, fields=DEFAULT_FIELDS, datefmt=None, *, extras=True, stream=None):
+        super().__init__(datefmt=datefmt)
+        if isinstance(fields, dict):
+            fields = tuple(fields.items())
+        self.fields = tuple((field, field) if isinstance(field, str) else tuple(field) for field in fields)
+        self.extras = extras
+        self.color_enabled = stream is not None and stream_supports_color(stream)
+        if self.color_enabled:
+            ensure_color_support()
+        
+        self._prefixes = tuple(
+            ('{' if index == 0 else ', ') + encode_basestring(key) + ': '
+            for index, (key, _) in enumerate(self.fields)
+        )
+        self._key_cache = {}
+        self._skipped = RESERVED_ATTRS | {key for key, _ in self.fields} | {'exc_info', 'stack_info'}
+    
+    def _value(self, record, attr):
+        if attr == 'message':
+            return record.getMessage()
+        if attr == 'asctime':
+            return self.formatTime(record, self.datefmt)
+        return record.__dict__.get(attr)
+    
+    def _extra_items(self, record):
+        for key, value in record.__dict__.items():
+            if key not in self._skipped and key[:1] != '_':
+                yield key, value
+    
+    def _details(self, record):
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = self.formatException(record.exc_info)
+        stack_text = self.formatStack(record.stack_info) if record.stack_info else None
+        return exc_text, stack_text
+    
+    def format(self, record):
+        if self.color_enabled:
+            return self.format_pretty(record)
+        return self.format_json(record)
+    
+    def format_json(self, record):
+        d = record.__dict__
+        parts = []
+        for prefix, (_, attr) in zip(self._prefixes, self.fields):
+            if attr == 'message':
+                value = record.getMessage()
+            elif attr == 'asctime':
+                value = self.formatTime(record, self.datefmt)
+            else:
+                value = d.get(attr)
+            parts.append(prefix)
+            parts.append(encode_basestring(value) if type(value) is str else encode_value(value))
+        
+        if self.extras:
+            key_cache = self._key_cache
+            skipped = self._skipped
+            for key, value in d.items():
+                if key in skipped or key[:1] == '_':
+                    continue
+                prefix = key_cache.get(key)
+                if prefix is None:
+                    prefix = key_cache[key] = ', ' + encode_basestring(key) + ': '
+                parts.append(prefix)
+                parts.append(encode_basestring(value) if type(value) is str else encode_value(value))
+        
+        if record.exc_info or record.exc_text or record.stack_info:
+            exc_text, stack_text = self._details(record)
+            if exc_text:
+                parts.append(', "exc_info": ')
+                parts.append(encode_basestring(exc_text))
+            if stack_text:
+                parts.append(', "stack_info": ')
+                parts.append(encode_basestring(stack_text))
+        
+        if not parts:
+            return '{}'
+        if not self.fields:
+            parts[0] = '{' + parts[0][2:]
+        parts.append('}')
+        return ''.join(parts)
+    
+    def _pretty_value(self, key, attr, value, record):
+        if attr == 'levelname':
+            return Colors.colorize(value, Colors.get_color_for_level(value))
+        if attr == 'created':
+            return self.formatTime(record, self.datefmt)
+        if attr == 'message':
+            return value
+        if type(value) is str and value and ' ' not in value and '"' not in value:
+            return value
+        return encode_value(value)
+    
+    def format_pretty(self, record):
+        parts = []
+        for key, attr in self.fields:
+            value = self._pretty_value(key, attr, self._value(record, attr), record)
+            parts.append(f"{Colors.colorize(key, Colors.CYAN)}={value}")
+        
+        if self.extras:
+            for key, value in self._extra_items(record):
+                parts.append(f"{Colors.colorize(key, Colors.CYAN)}={self._pretty_value(key, None, value, record)}")
+        
+        s = ' '.join(parts)
+        if record.exc_info or record.exc_text or record.stack_info:
+            for text in self._details(record):
+                if text:
+                    s = s + '\n' + text
+        return s
+    
+    def enable_colors(self):
+        self.color_enabled = True
+        ensure_color_support()
+    
+    def disable_colors(self):
+        self.color_enabled = False
@@ -0,0 +1,103 @@
+import logging
+import operator
+
+_UNSET = object()
+
+class Lazy:
+    __slots__ = ('_func', '_args', '_kwargs', '_value')
+    
+    def __init__(self, func, *args, **kwargs):
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._value = _UNSET
+    
+    @property
+    def evaluated(self):
+        return self._value is not _UNSET
+    
+    def value(self):
+        value = self._value
+        if value is _UNSET:
+            value = self._value = self._func(*self._args, **self._kwargs)
+            self._func = self._args = self._kwargs = None
+        return value
+    
+    def __str__(self):
+        return str(self.value())
+    
+    def __repr__(self):
+        return repr(self.value())
+    
+    def __format__(self, spec):
+        return format(self.value(), spec)
+    
+    def __int__(self):
+        return int(self.value())
+    
+    def __float__(self):
+        return float(self.value())
+    
+    def __index__(self):
+        return operator.index(self.value())
+
+def lazy(func, *args, **kwargs):
+    return Lazy(func, *args, **kwargs)
+
+def _resolve(value):
+    if isinstance(value, Lazy):
+        return value.value()
+    return value
+
+def resolve_args(args):
+    if isinstance(args, tuple):
+        return tuple(_resolve(arg) for arg in args)
+    if isinstance(args, dict):
+        return {key: _resolve(value) for key, value in args.items()}
+    return args
+
+class LazyLogRecord(logging.LogRecord):
+    def getMessage(self):
+        msg = self.msg
+        args = self.args
+        cache = self.__dict__.get('_lazy_message')
+        if cache is not None and cache[0] is msg and cache[1] is args:
+            return cache[2]
+        
+        text = str(msg)
+        if args:
+            resolved = self.__dict__.get('_lazy_args')
+            if resolved is None or resolved[0] is not args:
+                resolved = self._lazy_args = (args, resolve_args(args))
+            text = text % resolved[1]
+        self._lazy_message = (msg, args, text)
+        return text
+
+_previous_factory = None
+
+def _lazy_record_factory(*args, **kwargs):
+    record = _previous_factory(*args, **kwargs)
+    if type(record) is logging.LogRecord:
+        record.__class__ = LazyLogRecord
+    return record
+
+def enable_lazy_messages():
+    global _previous_factory
+    
+    current = logging.getLogRecordFactory()
+    if current is LazyLogRecord or current is _lazy_record_factory:
+        return
+    _previous_factory = current
+    logging.setLogRecordFactory(LazyLogRecord if current is logging.LogRecord else _lazy_record_factory)
+
+def disable_lazy_messages():
+    global _previous_factory
+    
+    current = logging.getLogRecordFactory()
+    if _previous_factory is not None and (current is LazyLogRecord or current is _lazy_record_factory):
+        logging.setLogRecordFactory(_previous_factory)
+    _previous_factory = None
+
+def lazy_messages_enabled():
+    current = logging.getLogRecordFactory()
+    return current is LazyLogRecord or current is _lazy_record_factory
@@ -0,0 +1,96 @@
+import logging
+import threading
+import time
+
+DEFAULT_STAGES = (
+    {logging.DEBUG: 10},
+    {logging.DEBUG: 0, logging.INFO: 10},
+    {logging.DEBUG: 0, logging.INFO: 0},
+)
+
+class LoadShedder:
+    def __init__(self, high_latency=0.005, low_latency=0.001, *, stages=DEFAULT_STAGES, smoothing=0.1,
+                 escalate_after=0.5, recover_after=5.0, report_interval=10.0):
+        if low_latency > high_latency:
+            raise ValueError("low_latency must not exceed high_latency")
+        self.high_latency = high_latency
+        self.low_latency = low_latency
+        self.smoothing = smoothing
+        self.escalate_after = escalate_after
+        self.recover_after = recover_after
+        self.report_interval = report_interval
+        
+        self.stage = 0
+        self.latency = 0.0
+        self.shed = {}
+        self.total_shed = 0
+        self._stages = [{}] + [dict(stage) for stage in stages]
+        self._levels = sorted({level for stage in stages for level in stage}, reverse=True)
+        self._sampled = {}
+        now = time.perf_counter()
+        self._changed = now
+        self._observed = now
+        self._reported = now
+        self._calm_since = None
+        self._report_due = False
+        self._lock = threading.Lock()
+    
+    def _keep_every(self, levelno):
+        for level in self._levels:
+            if levelno >= level:
+                return level, self._stages[self.stage].get(level, 1)
+        return None, 1
+    
+    def admit(self, levelno):
+        if not self.stage or levelno >= logging.WARNING:
+            return True
+        
+        with self._lock:
+            level, every = self._keep_every(levelno)
+            if every == 1:
+                return True
+            if every:
+                count = self._sampled.get(level, 0) + 1
+                self._sampled[level] = count
+                if count % every == 0:
+                    return True
+            elif time.perf_counter() - self._observed >= self.recover_after:
+                return True
+            
+            self.shed[levelno] = self.shed.get(levelno, 0) + 1
+            self.total_shed += 1
+            return False
+    
+    def observe(self, elapsed, now):
+        with self._lock:
+            self._observed = now
+            self.latency += self.smoothing * (elapsed - self.latency)
+            
+            if self.latency >= self.low_latency:
+                self._calm_since = None
+                if self.latency > self.high_latency and self.stage < len(self._stages) - 1 and now - self._changed >= self.escalate_after:
+                    self._set_stage(self.stage + 1, now)
+            elif self.stage:
+                if self._calm_since is None:
+                    self._calm_since = now
+                if now - self._calm_since >= self.recover_after and now - self._changed >= self.recover_after:
+                    self._set_stage(self.stage - 1, now)
+    
+    def _set_stage(self, stage, now):
+        self.stage = stage
+        self._changed = now
+        self._calm_since = None
+        self._report_due = True
+    
+    def take_report(self, now=None):
+        with self._lock:
+            if not self.shed:
+                self._report_due = False
+                return None
+            if now is not None and not self._report_due and now - self._reported < self.report_interval:
+                return None
+            counts = self.shed
+            self.shed = {}
+            self._reported = time.perf_counter() if now is None else now
+            self._report_due = False
+            return counts
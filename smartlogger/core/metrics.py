@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+import time
+import types
+
+HISTOGRAM_BUCKETS = 32
+
+class Histogram:
+    __slots__ = ('count', 'total', 'max', 'buckets')
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+    
+    def observe(self, seconds):
+        index = int(seconds * 1e6).bit_length()
+        self.buckets[index if index < HISTOGRAM_BUCKETS else HISTOGRAM_BUCKETS - 1] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+    
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'buckets_us': {str(1 << index): count for index, count in enumerate(self.buckets) if count},
+        }
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+    
+    def increment(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+    
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+    
+    def record(self, levelname):
+        self.increment('records.' + levelname)
+    
+    def counter(self, name):
+        return self._counters.get(name, 0)
+    
+    def histogram(self, name):
+        return self._histograms.get(name)
+    
+    def snapshot(self):
+        with self._lock:
+            return {
+                'time': time.time(),
+                'counters': dict(self._counters),
+                'histograms': {name: histogram.snapshot() for name, histogram in self._histograms.items()},
+            }
+    
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+    
+    def write(self, path):
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2, sort_keys=True)
+        os.replace(temporary, path)
+
+def instrument(obj, metrics, wrappers):
+    obj.__dict__['_metrics'] = metrics
+    for name, wrapper in wrappers.items():
+        if metrics is None:
+            obj.__dict__.pop(name, None)
+        else:
+            obj.__dict__[name] = types.MethodType(wrapper, obj)
+
+class MetricsExporter:
+    def __init__(self, metrics, path=None, interval=10.0, address=None):
+        if path is None and address is None:
+            raise ValueError("MetricsExporter needs a path, an address, or both")
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.address = address
+        self._server = None
+        self._threads = []
+        self._stop = threading.Event()
+    
+    def start(self):
+        if self.path is not None:
+            thread = threading.Thread(target=self._write_loop, name='smartlogger-metrics-writer', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        
+        if self.address is not None:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+            metrics = self.metrics
+            
+            class SnapshotHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    body = json.dumps(metrics.snapshot(), sort_keys=True).encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                
+                def log_message(self, format, *args):
+                    pass
+            
+            self._server = ThreadingHTTPServer(self.address, SnapshotHandler)
+            self._server.daemon_threads = True
+            self.address = self._server.server_address
+            thread = threading.Thread(target=self._server.serve_forever, name='smartlogger-metrics-http', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+    
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.metrics.write(self.path)
+            except OSError:
+                pass
+    
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self.path is not None:
+            try:
+                self.metrics.write(self.path)
+            except OSError:
+                pass
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
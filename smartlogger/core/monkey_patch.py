@@ -1,84 +1,267 @@
 import logging
+import os
 import sys
+import threading
+import time
+import types
 from .formatter import ColorFormatter
-from ..utils.terminal import is_terminal_supports_color
-from ..utils.compatibility import ensure_color_support
+from ..utils import terminal
+from ..utils.terminal import get_color_capability
+
+_MISSING = object()
 
 _original_formatter_class = None
-_original_handler_emit = None
-_original_stream_handler_emit = None
+_patched_formatter_class = None
+_original_stream_handler_attrs = {}
 _patched = False
+_metrics = None
+_profiler = None
+
+_SHARED_FORMATTERS_LIMIT = 1024
+_shared_color_formatters = {}
+_shared_color_formatters_lock = threading.Lock()
+
+def _shared_color_formatter(fmt, datefmt, style):
+    key = (fmt, datefmt, style)
+    formatter = _shared_color_formatters.get(key)
+    if formatter is None:
+        with _shared_color_formatters_lock:
+            formatter = _shared_color_formatters.get(key)
+            if formatter is None:
+                formatter = ColorFormatter(fmt, datefmt, style, validate=False)
+                formatter.enable_colors()
+                if _metrics is not None:
+                    formatter.metrics = _metrics
+                if len(_shared_color_formatters) < _SHARED_FORMATTERS_LIMIT:
+                    _shared_color_formatters[key] = formatter
+    return formatter
 
 def _get_color_formatter_class():
+    global _patched_formatter_class
+    
+    if _patched_formatter_class is not None and _patched_formatter_class.__base__ is logging.Formatter:
+        return _patched_formatter_class
+    
     class PatchedFormatter(logging.Formatter):
         def __init__(self, fmt=None, datefmt=None, style='%', validate=True, *, defaults=None):
             super().__init__(fmt, datefmt, style, validate, defaults=defaults)
-            self._color_formatter = ColorFormatter(fmt, datefmt, style, validate, defaults=defaults)
+            self._color_key = (fmt, datefmt, style, defaults)
+            self._own_color_formatter = None
         
-        def format(self, record):
-            if is_terminal_supports_color():
-                return self._color_formatter.format(record)
-            return super().format(record)
+        @property
+        def _color_formatter(self):
+            fmt, datefmt, style, defaults = self._color_key
+            if defaults is None:
+                return _shared_color_formatter(fmt, datefmt, style)
+            
+            if self._own_color_formatter is None:
+                formatter = ColorFormatter(fmt, datefmt, style, validate=False, defaults=defaults)
+                formatter.enable_colors()
+                self._own_color_formatter = formatter
+            return self._own_color_formatter
     
+    _patched_formatter_class = PatchedFormatter
     return PatchedFormatter
 
-def _patched_handler_emit(self, record):
-    if hasattr(self, 'stream') and self.stream in (sys.stdout, sys.stderr):
-        if not hasattr(self.formatter, '_color_formatter'):
-            if is_terminal_supports_color():
-                original_format = self.formatter._fmt if hasattr(self.formatter, '_fmt') else None
-                original_datefmt = self.formatter.datefmt if hasattr(self.formatter, 'datefmt') else None
-                original_style = getattr(self.formatter, '_style', '%')
-                
-                if hasattr(original_style, '_fmt'):
-                    original_style = original_style._fmt
-                elif hasattr(original_style, 'default_format'):
-                    original_style = '%'
-                else:
-                    original_style = '%'
-                
-                self.formatter = ColorFormatter(original_format, original_datefmt, original_style)
+def _style_char(formatter):
+    style = getattr(formatter, '_style', None)
+    for char, (style_class, _) in logging._STYLES.items():
+        if type(style) is style_class:
+            return char
+    return '%'
+
+def _color_formatter_for(formatter):
+    if formatter is None:
+        color_formatter = ColorFormatter()
+    elif isinstance(formatter, ColorFormatter):
+        return None
+    elif type(formatter) is _patched_formatter_class:
+        return formatter._color_formatter
+    elif type(formatter) is _original_formatter_class:
+        color_formatter = ColorFormatter(formatter._fmt, formatter.datefmt, _style_char(formatter))
+    else:
+        return None
     
-    return _original_handler_emit(self, record)
+    color_formatter.enable_colors()
+    return color_formatter
+
+def _is_standard_stream(handler):
+    stream = getattr(handler, 'stream', None)
+    return stream is not None and (stream is sys.stdout or stream is sys.stderr)
+
+def _restore_user_formatter(handler):
+    installed = handler.__dict__.get('_smartlogger_formatter')
+    if installed is None:
+        return
+    if handler.formatter is installed:
+        handler.formatter = handler._smartlogger_original_formatter
+    del handler._smartlogger_formatter
+    del handler._smartlogger_original_formatter
+
+def _bind_handler(handler):
+    _restore_user_formatter(handler)
+    _unwrap_emit(handler)
+    if _is_standard_stream(handler):
+        _wrap_emit(handler, _deferred_bind_emit)
 
-def patch_logging():
-    global _original_formatter_class, _original_handler_emit, _patched
+def _wrap_emit(handler, wrapper):
+    handler._smartlogger_inner_emit = handler.__dict__.get('emit')
+    handler.emit = types.MethodType(wrapper, handler)
+
+def _unwrap_emit(handler):
+    emit = handler.__dict__.get('emit')
+    if getattr(emit, '__func__', None) not in _EMIT_WRAPPERS:
+        return
+    inner = handler.__dict__.pop('_smartlogger_inner_emit', None)
+    if inner is None:
+        del handler.__dict__['emit']
+    else:
+        handler.emit = inner
+
+def _inner_emit(handler, record):
+    inner = handler.__dict__.get('_smartlogger_inner_emit')
+    if inner is None:
+        return type(handler).emit(handler, record)
+    return inner(record)
+
+def _deferred_bind_emit(self, record):
+    _unwrap_emit(self)
+    try:
+        _apply_color(self)
+    except Exception:
+        pass
+    if _metrics is not None:
+        _wrap_emit(self, _measured_emit)
+    return self.emit(record)
+
+def _measured_emit(self, record):
+    metrics = _metrics
+    if metrics is None:
+        return _inner_emit(self, record)
+    metrics.record(record.levelname)
+    start = time.perf_counter()
+    try:
+        return _inner_emit(self, record)
+    finally:
+        metrics.observe('emit_time', time.perf_counter() - start)
+
+_EMIT_WRAPPERS = (_deferred_bind_emit, _measured_emit)
+
+def _set_shared_metrics(metrics):
+    with _shared_color_formatters_lock:
+        for formatter in _shared_color_formatters.values():
+            formatter.metrics = metrics
+
+def _apply_color(handler):
+    if not _is_standard_stream(handler) or not get_color_capability(handler.stream).enabled:
+        return
+    
+    color_formatter = _color_formatter_for(handler.formatter)
+    if color_formatter is not None:
+        handler._smartlogger_original_formatter = handler.formatter
+        handler._smartlogger_formatter = color_formatter
+        handler.formatter = color_formatter
+
+def _unbind_handler(handler):
+    _unwrap_emit(handler)
+    _restore_user_formatter(handler)
+
+def _patched_stream_handler_init(self, *args, **kwargs):
+    _original_stream_handler_attrs['__init__'](self, *args, **kwargs)
+    _bind_handler(self)
+
+def _patched_set_stream(self, stream):
+    result = _original_stream_handler_attrs['setStream'](self, stream)
+    _bind_handler(self)
+    return result
+
+def _patched_set_formatter(self, fmt):
+    logging.Handler.setFormatter(self, fmt)
+    _bind_handler(self)
+
+_STREAM_HANDLER_PATCHES = {
+    '__init__': _patched_stream_handler_init,
+    'setStream': _patched_set_stream,
+    'setFormatter': _patched_set_formatter,
+}
+
+def _stream_handlers():
+    for ref in list(logging._handlerList):
+        handler = ref()
+        if isinstance(handler, logging.StreamHandler):
+            yield handler
+
+def _rebind_handlers():
+    for handler in _stream_handlers():
+        _bind_handler(handler)
+
+def _start_profiler(profiler):
+    global _profiler
+    
+    if profiler is None and os.environ.get('SMARTLOGGER_PROFILE'):
+        from .profiler import CallSiteProfiler
+        profiler = CallSiteProfiler.from_env()
+    if profiler is not None:
+        _profiler = profiler.start(at_exit=True)
+
+def patch_logging(metrics=None, profiler=None):
+    global _original_formatter_class, _patched, _metrics
     
     if _patched:
         return
     
+    _metrics = metrics
+    _set_shared_metrics(metrics)
+    _start_profiler(profiler)
+    
     try:
         _original_formatter_class = logging.Formatter
-        _original_handler_emit = logging.Handler.emit
+        for name in _STREAM_HANDLER_PATCHES:
+            _original_stream_handler_attrs[name] = logging.StreamHandler.__dict__.get(name, _MISSING)
         
         logging.Formatter = _get_color_formatter_class()
-        logging.Handler.emit = _patched_handler_emit
+        for name, function in _STREAM_HANDLER_PATCHES.items():
+            setattr(logging.StreamHandler, name, function)
         
         _patched = True
         
-        if is_terminal_supports_color():
-            ensure_color_support()
+        _rebind_handlers()
+        terminal.add_invalidation_callback(_rebind_handlers)
         
     except Exception:
         _patched = False
 
 def unpatch_logging():
-    global _original_formatter_class, _original_handler_emit, _patched
+    global _original_formatter_class, _patched, _metrics, _profiler
     
     if not _patched:
         return
     
     try:
+        terminal.remove_invalidation_callback(_rebind_handlers)
+        
         if _original_formatter_class:
             logging.Formatter = _original_formatter_class
         
-        if _original_handler_emit:
-            logging.Handler.emit = _original_handler_emit
+        for name, original in _original_stream_handler_attrs.items():
+            if original is _MISSING:
+                delattr(logging.StreamHandler, name)
+            else:
+                setattr(logging.StreamHandler, name, original)
+        _original_stream_handler_attrs.clear()
+        
+        for handler in _stream_handlers():
+            _unbind_handler(handler)
         
+        _metrics = None
+        _set_shared_metrics(None)
+        if _profiler is not None:
+            _profiler.stop()
+            _profiler = None
         _patched = False
         
     except Exception:
         pass
 
 def is_patched():
-    return _patched 
\ No newline at end of file
+    return _patched
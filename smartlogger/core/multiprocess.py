@@ -0,0 +1,194 @@
+import logging
+import os
+import pickle
+import threading
+import time
+from multiprocessing.connection import Client, Listener, wait
+from .handler import ColorHandler
+
+_RECORD_FIELDS = (
+    'name', 'levelno', 'levelname', 'pathname', 'filename', 'module', 'lineno', 'funcName',
+    'created', 'msecs', 'relativeCreated', 'thread', 'threadName', 'process', 'processName',
+)
+
+_STANDARD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {'message', 'asctime'}
+_EXTRA_TYPES = (str, int, float, bool, type(None))
+
+def serialize_record(record, formatter=None):
+    exc_text = record.exc_text
+    if record.exc_info and not exc_text:
+        exc_text = (formatter or logging._defaultFormatter).formatException(record.exc_info)
+    
+    extras = None
+    for key, value in record.__dict__.items():
+        if key not in _STANDARD_ATTRS and isinstance(value, _EXTRA_TYPES):
+            if extras is None:
+                extras = {}
+            extras[key] = value
+    
+    values = tuple(getattr(record, field, None) for field in _RECORD_FIELDS)
+    return values + (record.getMessage(), exc_text, record.stack_info, extras)
+
+def deserialize_record(payload):
+    count = len(_RECORD_FIELDS)
+    attrs = dict(zip(_RECORD_FIELDS, payload[:count]))
+    msg, exc_text, stack_info, extras = payload[count:]
+    if extras:
+        attrs.update(extras)
+    attrs.update(msg=msg, args=None, exc_info=None, exc_text=exc_text, stack_info=stack_info)
+    return logging.makeLogRecord(attrs)
+
+class WorkerHandler(logging.Handler):
+    def __init__(self, address, authkey, level=logging.NOTSET):
+        super().__init__(level)
+        self.address = address
+        self.authkey = authkey
+        self._connection = None
+        self._pid = None
+    
+    def _connect(self):
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = Client(self.address, authkey=self.authkey)
+            self._pid = os.getpid()
+        return self._connection
+    
+    def emit(self, record):
+        try:
+            payload = pickle.dumps(serialize_record(record, self.formatter), pickle.HIGHEST_PROTOCOL)
+            self._connect().send_bytes(payload)
+        except RecursionError:
+            raise
+        except Exception:
+            self._connection = None
+            self.handleError(record)
+    
+    def close(self):
+        self.acquire()
+        try:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+        finally:
+            self.release()
+        super().close()
+
+def install_worker_logging(address, authkey, level=logging.NOTSET):
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(WorkerHandler(address, authkey))
+    if level:
+        root.setLevel(level)
+
+class LogCollector:
+    def __init__(self, handler=None, family=None, authkey=None, level=logging.NOTSET):
+        self.handler = handler if handler is not None else ColorHandler()
+        self.level = level
+        self.received = 0
+        self._authkey = authkey or os.urandom(32)
+        self._listener = None
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._stopping = False
+        self._threads = []
+        self._family = family
+    
+    @property
+    def address(self):
+        return self._listener.address
+    
+    @property
+    def initargs(self):
+        return (self.address, self._authkey, self.level)
+    
+    def start(self):
+        if self._listener is not None:
+            return self
+        self._listener = Listener(family=self._family, authkey=self._authkey)
+        self._stopping = False
+        self._threads = [
+            threading.Thread(target=self._accept_loop, name='smartlogger-collector-accept', daemon=True),
+            threading.Thread(target=self._read_loop, name='smartlogger-collector-read', daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+    
+    def _accept_loop(self):
+        while True:
+            try:
+                connection = self._listener.accept()
+            except Exception:
+                if self._stopping:
+                    return
+                continue
+            with self._connections_lock:
+                self._connections.append(connection)
+            if self._stopping:
+                return
+    
+    def _read_loop(self):
+        accept_thread = self._threads[0]
+        while True:
+            accepting = not self._stopping or accept_thread.is_alive()
+            with self._connections_lock:
+                connections = list(self._connections)
+            if connections:
+                ready = wait(connections, 0.05)
+            else:
+                ready = []
+                time.sleep(0.05)
+            
+            for connection in ready:
+                self._receive(connection)
+            if not ready and not accepting:
+                return
+    
+    def _receive(self, connection):
+        try:
+            payload = connection.recv_bytes()
+        except (EOFError, OSError):
+            with self._connections_lock:
+                if connection in self._connections:
+                    self._connections.remove(connection)
+            connection.close()
+            return
+        
+        self.received += 1
+        try:
+            record = deserialize_record(pickle.loads(payload))
+        except Exception:
+            self.handler.handleError(logging.makeLogRecord({
+                'name': __name__, 'levelno': logging.ERROR, 'levelname': 'ERROR',
+                'msg': 'undecodable record from a worker (%d bytes)', 'args': (len(payload),),
+            }))
+            return
+        try:
+            self.handler.handle(record)
+        except Exception:
+            self.handler.handleError(record)
+    
+    def stop(self, timeout=5.0):
+        if self._listener is None:
+            return
+        self._stopping = True
+        try:
+            Client(self.address, authkey=self._authkey).close()
+        except Exception:
+            pass
+        for thread in self._threads:
+            thread.join(timeout)
+        
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._listener.close()
+        self._listener = None
+        self.handler.flush()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
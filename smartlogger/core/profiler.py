@@ -0,0 +1,213 @@
+import atexit
+import json
+import logging
+import math
+import os
+import random
+import sys
+import threading
+import time
+from ..config.colors import Colors
+from ..utils.terminal import stream_supports_color
+
+PROFILE_ENV = 'SMARTLOGGER_PROFILE'
+PROFILE_OUTPUT_ENV = 'SMARTLOGGER_PROFILE_OUTPUT'
+DEFAULT_OUTPUT = 'smartlogger-profile.json'
+
+SORT_KEYS = ('time', 'records', 'bytes', 'format_time')
+
+class CallSiteProfiler:
+    def __init__(self, sample_rate=0.01, *, top=20, sort='time', output=None, report_stream=None):
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        self.sample_rate = sample_rate
+        self.scale = 1 / sample_rate
+        self.top = top
+        self.sort = sort
+        self.output = output
+        self.report_stream = report_stream
+        self.sampled = 0
+        self.sites = {}
+        
+        self._log_skip = math.log(1 - sample_rate) if sample_rate < 1 else None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._originals = None
+        self._wrappers = None
+        self._at_exit = False
+    
+    @classmethod
+    def from_env(cls):
+        value = os.environ.get(PROFILE_ENV, '').strip()
+        if not value:
+            return None
+        try:
+            sample_rate = float(value)
+        except ValueError:
+            return None
+        if not 0 < sample_rate <= 1:
+            return None
+        return cls(sample_rate, output=os.environ.get(PROFILE_OUTPUT_ENV) or DEFAULT_OUTPUT, report_stream=sys.stderr)
+    
+    def _next_gap(self):
+        if self._log_skip is None:
+            return 1
+        return int(math.log(1.0 - random.random()) / self._log_skip) + 1
+    
+    @property
+    def active(self):
+        return self._originals is not None
+    
+    def start(self, at_exit=False):
+        if self._originals is not None:
+            return self
+        
+        original_handle = logging.Logger.handle
+        original_format = logging.Handler.format
+        profiler = self
+        local = self._local
+        
+        def handle(logger, record):
+            countdown = getattr(local, 'countdown', 0) or profiler._next_gap()
+            if countdown > 1:
+                local.countdown = countdown - 1
+                return original_handle(logger, record)
+            local.countdown = profiler._next_gap()
+            return profiler._profile(original_handle, logger, record)
+        
+        def format(handler, record):
+            if getattr(local, 'record', None) is not record:
+                return original_format(handler, record)
+            start = time.perf_counter()
+            text = original_format(handler, record)
+            local.format_time += time.perf_counter() - start
+            local.bytes += len(text)
+            return text
+        
+        self._originals = (original_handle, original_format)
+        self._wrappers = (handle, format)
+        logging.Logger.handle = handle
+        logging.Handler.format = format
+        
+        if at_exit and not self._at_exit:
+            atexit.register(self.finish)
+            self._at_exit = True
+        return self
+    
+    def _profile(self, original_handle, logger, record):
+        local = self._local
+        local.record = record
+        local.format_time = 0.0
+        local.bytes = 0
+        start = time.perf_counter()
+        try:
+            return original_handle(logger, record)
+        finally:
+            elapsed = time.perf_counter() - start
+            local.record = None
+            site = (record.pathname, record.lineno, record.funcName)
+            with self._lock:
+                stats = self.sites.get(site)
+                if stats is None:
+                    stats = self.sites[site] = [0, 0, 0.0, 0.0]
+                stats[0] += 1
+                stats[1] += local.bytes
+                stats[2] += local.format_time
+                stats[3] += elapsed
+                self.sampled += 1
+    
+    def stop(self):
+        if self._originals is None:
+            return
+        original_handle, original_format = self._originals
+        handle, format = self._wrappers
+        if logging.Logger.__dict__.get('handle') is handle:
+            logging.Logger.handle = original_handle
+        if logging.Handler.__dict__.get('format') is format:
+            logging.Handler.format = original_format
+        self._originals = None
+        self._wrappers = None
+    
+    def reset(self):
+        with self._lock:
+            self.sites = {}
+            self.sampled = 0
+    
+    def rows(self, top=None, sort=None):
+        scale = self.scale
+        with self._lock:
+            rows = [
+                {
+                    'pathname': pathname,
+                    'lineno': lineno,
+                    'funcName': func_name,
+                    'records': round(count * scale),
+                    'bytes': round(size * scale),
+                    'format_time': format_time * scale,
+                    'time': elapsed * scale,
+                }
+                for (pathname, lineno, func_name), (count, size, format_time, elapsed) in self.sites.items()
+            ]
+        rows.sort(key=lambda row: row[sort or self.sort], reverse=True)
+        top = self.top if top is None else top
+        return rows[:top] if top else rows
+    
+    def snapshot(self):
+        return {
+            'sample_rate': self.sample_rate,
+            'sampled': self.sampled,
+            'estimated_records': round(self.sampled * self.scale),
+            'sort': self.sort,
+            'sites': self.rows(top=0),
+        }
+    
+    def write(self, path=None):
+        path = path or self.output
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+    
+    def format_report(self, color=False, top=None):
+        rows = self.rows(top)
+        title = f"smartlogger profile: {self.sampled:,} records sampled, 1 in {self.scale:,.0f} (totals are estimates)"
+        header = f"{'records':>12} {'bytes':>12} {'format ms':>10} {'total ms':>10}  call site"
+        if color:
+            title = Colors.colorize(title, Colors.BOLD)
+            header = Colors.colorize(header, Colors.BOLD)
+        
+        lines = [title, header]
+        for row in rows:
+            path = f"{row['pathname']}:"
+            lineno = str(row['lineno'])
+            func_name = f"({row['funcName']})"
+            if color:
+                path = Colors.colorize(path, Colors.BRIGHT_BLACK)
+                lineno = Colors.colorize(lineno, Colors.BRIGHT_WHITE)
+                func_name = Colors.colorize(func_name, Colors.CYAN)
+            lines.append(
+                f"{row['records']:>12,} {row['bytes']:>12,} {row['format_time'] * 1000:>10.2f} "
+                f"{row['time'] * 1000:>10.2f}  {path}{lineno} {func_name}"
+            )
+        return '\n'.join(lines)
+    
+    def print_report(self, stream=None, top=None):
+        stream = stream or self.report_stream or sys.stderr
+        stream.write(self.format_report(stream_supports_color(stream), top) + '\n')
+        stream.flush()
+    
+    def finish(self):
+        self.stop()
+        if self._at_exit:
+            atexit.unregister(self.finish)
+            self._at_exit = False
+        if self.output:
+            try:
+                self.write()
+            except OSError:
+                pass
+        if self.report_stream is not None and self.sampled:
+            try:
+                self.print_report()
+            except (OSError, ValueError):
+                pass
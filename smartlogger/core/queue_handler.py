@@ -0,0 +1,141 @@
+import collections
+import logging
+import threading
+import weakref
+from .handler import ColorHandler
+
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_DROP_LOWER = 'drop_lower'
+
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_LOWER)
+
+class _Writer:
+    def __init__(self, target):
+        self.target = target
+        self.queue = collections.deque()
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.not_full = threading.Condition(self.mutex)
+        self.all_done = threading.Condition(self.mutex)
+        self.unfinished = 0
+        self.closed = False
+    
+    def run(self, handler_ref):
+        while True:
+            with self.mutex:
+                while not self.queue and not self.closed:
+                    self.not_empty.wait()
+                if not self.queue:
+                    return
+                batch = list(self.queue)
+                self.queue.clear()
+                self.not_full.notify_all()
+            
+            for record in batch:
+                try:
+                    self.target.handle(record)
+                except Exception:
+                    handler = handler_ref()
+                    if handler is not None:
+                        handler.handleError(record)
+                    handler = None
+            
+            with self.mutex:
+                self.unfinished -= len(batch)
+                if self.unfinished <= 0:
+                    self.unfinished = 0
+                    self.all_done.notify_all()
+
+def _shutdown(writer, thread, owns_target):
+    with writer.mutex:
+        writer.closed = True
+        writer.not_empty.notify_all()
+        writer.not_full.notify_all()
+    
+    if threading.current_thread() is not thread:
+        thread.join()
+    writer.target.flush()
+    if owns_target:
+        writer.target.close()
+
+class QueueColorHandler(logging.Handler):
+    def __init__(self, stream=None, maxsize=10000, overflow=OVERFLOW_BLOCK, drop_level=logging.WARNING, target=None):
+        super().__init__()
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+        
+        self.target = ColorHandler(stream) if target is None else target
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.drop_level = drop_level
+        self.dropped = 0
+        
+        self._writer = _Writer(self.target)
+        self._thread = threading.Thread(target=self._writer.run, args=(weakref.ref(self),),
+                                        name='smartlogger-queue-writer', daemon=True)
+        self._thread.start()
+        self._finalizer = weakref.finalize(self, _shutdown, self._writer, self._thread, target is None)
+    
+    @property
+    def closed(self):
+        return self._writer.closed
+    
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+    
+    def queue_depth(self):
+        return len(self._writer.queue)
+    
+    def prepare(self, record):
+        message = record.getMessage()
+        frozen = logging.makeLogRecord(record.__dict__)
+        frozen.msg = message
+        frozen.args = None
+        return frozen
+    
+    def emit(self, record):
+        writer = self._writer
+        try:
+            frozen = self.prepare(record)
+            with writer.mutex:
+                if not writer.closed:
+                    if self.maxsize > 0 and len(writer.queue) >= self.maxsize:
+                        if not self._make_room(record):
+                            return
+                    if not writer.closed:
+                        writer.queue.append(frozen)
+                        writer.unfinished += 1
+                        writer.not_empty.notify()
+                        return
+            self.target.handle(record)
+        except Exception:
+            self.handleError(record)
+    
+    def _make_room(self, record):
+        writer = self._writer
+        if self.overflow == OVERFLOW_DROP_OLDEST:
+            writer.queue.popleft()
+            writer.unfinished -= 1
+            self.dropped += 1
+            return True
+        
+        if self.overflow == OVERFLOW_DROP_LOWER and record.levelno < self.drop_level:
+            self.dropped += 1
+            return False
+        
+        while len(writer.queue) >= self.maxsize and not writer.closed:
+            writer.not_full.wait()
+        return True
+    
+    def flush(self, timeout=None):
+        writer = self._writer
+        if threading.current_thread() is not self._thread:
+            with writer.mutex:
+                writer.all_done.wait_for(lambda: writer.unfinished == 0, timeout)
+        self.target.flush()
+    
+    def close(self):
+        self._finalizer()
+        super().close()
@@ -0,0 +1,67 @@
+from .formatter import ColorFormatter
+from .handler import ColorHandler
+
+class TeeColorHandler(ColorHandler):
+    def __init__(self, stream=None, files=(), *, mode='a', encoding='utf-8', **kwargs):
+        super().__init__(stream, **kwargs)
+        self.sinks = []
+        self._owned_sinks = []
+        for target in files:
+            self.add_sink(target, mode=mode, encoding=encoding)
+    
+    def add_sink(self, target, mode='a', encoding='utf-8'):
+        if isinstance(target, (str, bytes)) or hasattr(target, '__fspath__'):
+            sink = open(target, mode, encoding=encoding)
+            self._owned_sinks.append(sink)
+        else:
+            sink = target
+        self.sinks.append(sink)
+        return sink
+    
+    def _format_segments(self, record):
+        formatter = self.formatter
+        if isinstance(formatter, ColorFormatter):
+            return formatter.format_segments(record)
+        text = self.format(record)
+        return text, text
+    
+    def emit(self, record):
+        try:
+            plain, colored = self._format_segments(record)
+            plain += self.terminator
+            for sink in self.sinks:
+                sink.write(plain)
+                if not self.buffer_size:
+                    sink.flush()
+            self._write(colored + self.terminator, record)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _write_buffer(self):
+        super()._write_buffer()
+        for sink in self.sinks:
+            sink.flush()
+    
+    def flush(self):
+        super().flush()
+        self.acquire()
+        try:
+            for sink in self.sinks:
+                sink.flush()
+        finally:
+            self.release()
+    
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.acquire()
+            try:
+                for sink in self._owned_sinks:
+                    sink.close()
+                self._owned_sinks = []
+                self.sinks = []
+            finally:
+                self.release()
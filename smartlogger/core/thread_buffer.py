@@ -0,0 +1,130 @@
+import collections
+import heapq
+import itertools
+import logging
+import threading
+import time
+import weakref
+from .handler import ColorHandler
+
+class ThreadBufferedColorHandler(ColorHandler):
+    def __init__(self, stream=None, *, window=0.05, max_pending=4096, flush_level=logging.ERROR):
+        super().__init__(stream, flush_level=flush_level)
+        self.window = window
+        self.max_pending = max_pending
+        
+        self._sequence = itertools.count()
+        self._local = threading.local()
+        self._buffers = []
+        self._buffers_lock = threading.Lock()
+        self._merge_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        
+        self._merger = threading.Thread(target=_merge_loop, args=(weakref.ref(self), self._wake, window),
+                                        name='smartlogger-merger', daemon=True)
+        self._merger.start()
+        weakref.finalize(self, self._wake.set)
+    
+    def _register(self):
+        buffer = collections.deque()
+        with self._buffers_lock:
+            self._buffers.append((threading.current_thread(), buffer))
+        self._local.buffer = buffer
+        return buffer
+    
+    def handle(self, record):
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if not rv:
+            return rv
+        
+        try:
+            text = self.format(record) + self.terminator
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+            return rv
+        
+        if self._stopped:
+            self._write_now(text)
+            return rv
+        
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._register()
+        buffer.append((next(self._sequence), time.monotonic(), text))
+        
+        if record.levelno >= self.flush_level or len(buffer) >= self.max_pending:
+            self._drain()
+        return rv
+    
+    def _write_now(self, text):
+        self.acquire()
+        try:
+            if self.stream:
+                self.stream.write(text)
+                if hasattr(self.stream, 'flush'):
+                    self.stream.flush()
+        finally:
+            self.release()
+    
+    def _collect(self, cutoff):
+        with self._buffers_lock:
+            buffers = list(self._buffers)
+        
+        runs = []
+        for thread, buffer in buffers:
+            run = []
+            while buffer and (cutoff is None or buffer[0][1] <= cutoff):
+                run.append(buffer.popleft())
+            if run:
+                runs.append(run)
+            elif not buffer and not thread.is_alive():
+                with self._buffers_lock:
+                    self._buffers.remove((thread, buffer))
+        return runs
+    
+    def _drain(self, cutoff=None):
+        with self._merge_lock:
+            runs = self._collect(cutoff)
+            if not runs:
+                return 0
+            entries = runs[0] if len(runs) == 1 else heapq.merge(*runs)
+            texts = [entry[2] for entry in entries]
+            self._write_now(''.join(texts))
+            return len(texts)
+    
+    def pending(self):
+        with self._buffers_lock:
+            return sum(len(buffer) for _, buffer in self._buffers)
+    
+    def flush(self):
+        self._drain()
+        super().flush()
+    
+    def close(self):
+        self._stopped = True
+        self._wake.set()
+        if self._merger.is_alive() and self._merger is not threading.current_thread():
+            self._merger.join()
+        try:
+            self._drain()
+        finally:
+            super().close()
+
+def _merge_loop(handler_ref, wake, window):
+    while True:
+        woken = wake.wait(window)
+        wake.clear()
+        handler = handler_ref()
+        if handler is None or handler._stopped:
+            return
+        window = handler.window
+        try:
+            handler._drain(None if woken else time.monotonic() - window)
+        except Exception:
+            pass
+        handler = None
@@ -0,0 +1,196 @@
+import builtins
+import linecache
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from ..config.colors import Colors
+
+HEADER = 'Traceback (most recent call last):\n'
+CAUSE = '\nThe above exception was the direct cause of the following exception:\n\n'
+CONTEXT = '\nDuring handling of the above exception, another exception occurred:\n\n'
+
+LOCATION_COLOR = Colors.DIM
+RAISING_LINE_COLOR = Colors.BRIGHT_YELLOW + Colors.BOLD
+EXCEPTION_COLOR = Colors.RED + Colors.BOLD
+
+_RECURSIVE_CUTOFF = 3
+_GROUP_TYPES = getattr(builtins, 'BaseExceptionGroup', ())
+
+def _frames(tb):
+    frames = []
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        frames.append((code.co_filename, tb.tb_lineno, code.co_name))
+        tb = tb.tb_next
+    return tuple(frames)
+
+def exception_chain(value, tb=None):
+    chain = []
+    seen = set()
+    separator = None
+    while value is not None and id(value) not in seen:
+        if isinstance(value, _GROUP_TYPES):
+            return None
+        seen.add(id(value))
+        chain.append((value, tb if not chain else value.__traceback__, separator))
+        if value.__cause__ is not None:
+            value, separator = value.__cause__, CAUSE
+        elif value.__context__ is not None and not value.__suppress_context__:
+            value, separator = value.__context__, CONTEXT
+        else:
+            value = None
+    chain.reverse()
+    return chain
+
+def fingerprint(chain):
+    return tuple((type(value), _frames(tb), separator) for value, tb, separator in chain)
+
+def _repeated_line(count):
+    s = 's' if count > 1 else ''
+    return f"  {LOCATION_COLOR}[Previous line repeated {count} more time{s}]{Colors.RESET}\n"
+
+def _render_colored(frames):
+    lines = []
+    last = None
+    repeated = 0
+    for index, frame in enumerate(frames):
+        if frame == last:
+            repeated += 1
+            if repeated >= _RECURSIVE_CUTOFF:
+                continue
+        else:
+            if repeated >= _RECURSIVE_CUTOFF:
+                lines.append(_repeated_line(repeated - _RECURSIVE_CUTOFF + 1))
+            last = frame
+            repeated = 0
+        
+        filename, lineno, name = frame
+        lines.append(f'  {LOCATION_COLOR}File "{filename}", line {lineno}{Colors.RESET}, in {name}\n')
+        source = linecache.getline(filename, lineno).strip() if lineno else ''
+        if source:
+            color = RAISING_LINE_COLOR if index == len(frames) - 1 else ''
+            lines.append(f"    {color}{source}{Colors.RESET if color else ''}\n")
+    if repeated >= _RECURSIVE_CUTOFF:
+        lines.append(_repeated_line(repeated - _RECURSIVE_CUTOFF + 1))
+    return ''.join(lines)
+
+def _render_blocks(chain, key):
+    blocks = []
+    for (value, tb, separator), (_, frames, _) in zip(chain, key):
+        if tb is None:
+            blocks.append(('', ''))
+        else:
+            plain = ''.join(traceback.format_tb(tb))
+            blocks.append((plain, _render_colored(frames)))
+    return tuple(blocks)
+
+def _exception_lines(value, color):
+    lines = traceback.format_exception_only(type(value), value)
+    if not color:
+        return lines
+    name = type(value).__qualname__
+    colored = []
+    for line in lines:
+        if line.startswith(name) or f'.{name}' in line.partition(':')[0]:
+            line = Colors.colorize(line.rstrip('\n'), EXCEPTION_COLOR) + '\n'
+            name = None
+        colored.append(line)
+    return colored
+
+class _Entry:
+    __slots__ = ('id', 'blocks', 'shown')
+    
+    def __init__(self, entry_id, blocks):
+        self.id = entry_id
+        self.blocks = blocks
+        self.shown = None
+
+class TracebackCache:
+    def __init__(self, maxsize=256, window=None):
+        self.maxsize = maxsize
+        self.window = window
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def render(self, ei, color=False, record=None):
+        value = ei[1]
+        if value is None:
+            return None
+        chain = exception_chain(value, ei[2])
+        if chain is None:
+            return None
+        
+        decision = record.__dict__.get('_traceback_decision') if record is not None else None
+        if decision is not None and decision[0] is self and decision[1] is value:
+            entry, reference = decision[2], decision[3]
+        else:
+            entry, reference = self._lookup(chain)
+            if record is not None:
+                record._traceback_decision = (self, value, entry, reference)
+        
+        if reference:
+            s = self._reference(entry, value, color)
+        else:
+            s = self._assemble(entry, chain, color)
+        if s[-1:] == '\n':
+            s = s[:-1]
+        return s
+    
+    def _lookup(self, chain):
+        key = fingerprint(chain)
+        entry = self._entries.get(key)
+        if entry is None:
+            blocks = _render_blocks(chain, key)
+        
+        with self._lock:
+            if entry is None:
+                entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                entry = _Entry(self._next_id, blocks)
+                self._next_id += 1
+                self._entries[key] = entry
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self.hits += 1
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            
+            now = time.monotonic()
+            reference = self.window is not None and entry.shown is not None and now - entry.shown < self.window
+            if not reference:
+                entry.shown = now
+        return entry, reference
+    
+    def _reference(self, entry, value, color):
+        note = f"[same traceback as #{entry.id}]"
+        if color:
+            note = Colors.colorize(note, LOCATION_COLOR)
+        return note + ' ' + ''.join(_exception_lines(value, color))
+    
+    def _assemble(self, entry, chain, color):
+        parts = []
+        for index, ((value, tb, separator), block) in enumerate(zip(chain, entry.blocks)):
+            frames = block[1] if color else block[0]
+            if frames:
+                if index == 0 and self.window is not None:
+                    parts.append(f'Traceback #{entry.id} (most recent call last):\n')
+                else:
+                    parts.append(HEADER)
+                parts.append(frames)
+            parts.extend(_exception_lines(value, color))
+            if separator is not None:
+                parts.append(separator)
+        return ''.join(parts)
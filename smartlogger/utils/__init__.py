@@ -1,2 +1,5 @@
-from .terminal import is_terminal_supports_color, is_windows, is_colorama_available
+from .terminal import (
+    is_terminal_supports_color, is_windows, is_colorama_available,
+    get_color_capability, stream_supports_color, stream_color_depth, invalidate_color_cache,
+)
 from .compatibility import enable_windows_ansi_support 
\ No newline at end of file
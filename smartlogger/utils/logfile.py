@@ -0,0 +1,87 @@
+import re
+from ..config.colors import Colors, _ansi_escape_bytes
+
+CHUNK_SIZE = 4 * 1024 * 1024
+MAX_ESCAPE_LENGTH = 64
+
+LEVEL_NAMES = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+_level_pattern = re.compile(rb'(?m)^([^\n\x1b]*?)\b(' + b'|'.join(n.encode('ascii') for n in LEVEL_NAMES) + rb')\b')
+
+def _read_chunks(src, chunk_size):
+    read = src.read
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def strip_stream(src, dst, chunk_size=CHUNK_SIZE):
+    write = dst.write
+    carry = b''
+    total = 0
+    
+    for chunk in _read_chunks(src, chunk_size):
+        if carry:
+            chunk = carry + chunk
+            carry = b''
+        
+        esc = chunk.rfind(b'\x1b', max(0, len(chunk) - MAX_ESCAPE_LENGTH))
+        if esc != -1:
+            carry = chunk[esc:]
+            chunk = chunk[:esc]
+        
+        if b'\x1b' in chunk:
+            chunk = _ansi_escape_bytes.sub(b'', chunk)
+        write(chunk)
+        total += len(chunk)
+    
+    if carry:
+        carry = _ansi_escape_bytes.sub(b'', carry)
+        write(carry)
+        total += len(carry)
+    return total
+
+def _level_replacements():
+    replacements = {}
+    for name in LEVEL_NAMES:
+        replacements[name.encode('ascii')] = Colors.colorize(name, Colors.get_color_for_level(name)).encode('ascii')
+    return replacements
+
+def colorize_stream(src, dst, chunk_size=CHUNK_SIZE):
+    replacements = _level_replacements()
+    
+    def replace(match):
+        return match.group(1) + replacements[match.group(2)]
+    
+    write = dst.write
+    carry = b''
+    total = 0
+    
+    for chunk in _read_chunks(src, chunk_size):
+        if carry:
+            chunk = carry + chunk
+        
+        end = chunk.rfind(b'\n') + 1
+        if not end:
+            carry = chunk
+            continue
+        carry = chunk[end:]
+        
+        colored = _level_pattern.sub(replace, chunk[:end])
+        write(colored)
+        total += len(colored)
+    
+    if carry:
+        colored = _level_pattern.sub(replace, carry)
+        write(colored)
+        total += len(colored)
+    return total
+
+def strip_file(src_path, dst_path, chunk_size=CHUNK_SIZE):
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        return strip_stream(src, dst, chunk_size)
+
+def colorize_file(src_path, dst_path, chunk_size=CHUNK_SIZE):
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        return colorize_stream(src, dst, chunk_size)
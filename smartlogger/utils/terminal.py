@@ -1,9 +1,17 @@
 import os
 import sys
-import platform
+import threading
+import weakref
+
+DEPTH_NONE = 0
+DEPTH_16 = 16
+DEPTH_256 = 256
+DEPTH_TRUECOLOR = 1 << 24
+
+_TRUECOLOR_PROGRAMS = ('iTerm.app', 'WezTerm', 'vscode', 'Hyper')
 
 def is_windows():
-    return platform.system().lower() == 'windows'
+    return sys.platform == 'win32'
 
 def is_colorama_available():
     try:
@@ -13,7 +21,16 @@ def is_colorama_available():
         return False
 
 def is_tty():
-    return hasattr(sys.stdout, 'isatty') and sys.stdout.isatty()
+    return is_stream_tty(sys.stdout)
+
+def is_stream_tty(stream):
+    try:
+        return bool(stream.isatty())
+    except Exception:
+        return False
+
+def is_standard_stream(stream):
+    return stream is not None and any(stream is std for std in (sys.stdout, sys.stderr, sys.__stdout__, sys.__stderr__))
 
 def has_color_env_var():
     term = os.environ.get('TERM', '')
@@ -89,9 +106,15 @@ def supports_ansi_colors():
     return True
 
 def is_terminal_supports_color():
-    if not is_tty() and not is_ide_environment():
+    return is_stream_supports_color(sys.stdout)
+
+def is_stream_supports_color(stream):
+    if os.environ.get('NO_COLOR'):
         return False
     
+    if not is_stream_tty(stream):
+        return is_standard_stream(stream) and is_ide_environment()
+    
     if has_color_env_var():
         return True
     
@@ -101,4 +124,125 @@ def is_terminal_supports_color():
     if supports_ansi_colors():
         return True
     
-    return False 
\ No newline at end of file
+    return False
+
+def color_depth_from_env():
+    force_color = os.environ.get('FORCE_COLOR', '')
+    if force_color == '3':
+        return DEPTH_TRUECOLOR
+    if force_color == '2':
+        return DEPTH_256
+    
+    if os.environ.get('COLORTERM', '').lower() in ('truecolor', '24bit'):
+        return DEPTH_TRUECOLOR
+    if os.environ.get('TERM_PROGRAM', '') in _TRUECOLOR_PROGRAMS or os.environ.get('WT_SESSION'):
+        return DEPTH_TRUECOLOR
+    
+    term = os.environ.get('TERM', '')
+    if term.endswith('-direct'):
+        return DEPTH_TRUECOLOR
+    if '256color' in term:
+        return DEPTH_256
+    return DEPTH_16
+
+class ColorCapability:
+    __slots__ = ('_stream_ref', 'standard_stream', 'enabled', 'depth', '__weakref__')
+    
+    def __init__(self, stream=None, standard_stream=None):
+        self._stream_ref = _make_ref(stream) if stream is not None else None
+        self.standard_stream = standard_stream
+        self.enabled = False
+        self.depth = DEPTH_NONE
+        self.refresh()
+    
+    @property
+    def stream(self):
+        if self.standard_stream is not None:
+            return getattr(sys, self.standard_stream, None)
+        return self._stream_ref() if self._stream_ref is not None else None
+    
+    def refresh(self):
+        stream = self.stream
+        self.enabled = stream is not None and is_stream_supports_color(stream)
+        self.depth = color_depth_from_env() if self.enabled else DEPTH_NONE
+        return self.enabled
+
+class _StrongRef:
+    __slots__ = ('obj',)
+    
+    def __init__(self, obj):
+        self.obj = obj
+    
+    def __call__(self):
+        return self.obj
+
+def _make_ref(stream):
+    try:
+        return weakref.ref(stream)
+    except TypeError:
+        return _StrongRef(stream)
+
+_capabilities = {}
+_standard_capabilities = {}
+_capabilities_lock = threading.Lock()
+_invalidation_callbacks = []
+
+def get_color_capability(stream=None):
+    if stream is None:
+        return _get_standard_capability('stdout')
+    
+    key = id(stream)
+    capability = _capabilities.get(key)
+    if capability is not None and capability.stream is stream:
+        return capability
+    
+    with _capabilities_lock:
+        capability = _capabilities.get(key)
+        if capability is None or capability.stream is not stream:
+            capability = ColorCapability(stream)
+            _capabilities[key] = capability
+            if isinstance(capability._stream_ref, weakref.ref):
+                weakref.finalize(stream, _discard_capability, key, capability)
+    return capability
+
+def _get_standard_capability(name):
+    capability = _standard_capabilities.get(name)
+    if capability is None:
+        with _capabilities_lock:
+            capability = _standard_capabilities.get(name)
+            if capability is None:
+                capability = ColorCapability(standard_stream=name)
+                _standard_capabilities[name] = capability
+    return capability
+
+def _discard_capability(key, capability):
+    if _capabilities.get(key) is capability:
+        _capabilities.pop(key, None)
+
+def stream_supports_color(stream=None):
+    return get_color_capability(stream).enabled
+
+def stream_color_depth(stream=None):
+    return get_color_capability(stream).depth
+
+def invalidate_color_cache(stream=None):
+    with _capabilities_lock:
+        if stream is None:
+            capabilities = list(_capabilities.values()) + list(_standard_capabilities.values())
+        else:
+            capabilities = [c for c in _capabilities.values() if c.stream is stream]
+            capabilities += [c for c in _standard_capabilities.values() if c.stream is stream]
+    
+    for capability in capabilities:
+        capability.refresh()
+    
+    for callback in list(_invalidation_callbacks):
+        callback()
+
+def add_invalidation_callback(callback):
+    if callback not in _invalidation_callbacks:
+        _invalidation_callbacks.append(callback)
+
+def remove_invalidation_callback(callback):
+    if callback in _invalidation_callbacks:
+        _invalidation_callbacks.remove(callback)
@@ -0,0 +1,121 @@
+import unittest
+import asyncio
+import os
+import logging
+import threading
+import time
+from io import StringIO
+from smartlogger.core.async_handler import AsyncColorHandler
+
+def make_record(msg, level=logging.INFO):
+    return logging.LogRecord('test', level, 'test.py', 1, msg, (), None)
+
+class TestAsyncColorHandler(unittest.TestCase):
+    
+    def test_thread_mode_aflush_is_awaitable(self):
+        stream = StringIO()
+        
+        async def main():
+            handler = AsyncColorHandler(stream)
+            self.assertFalse(handler.nonblocking)
+            for i in range(50):
+                handler.handle(make_record(f"record {i}"))
+            await handler.aflush()
+            self.assertEqual(len(stream.getvalue().splitlines()), 50)
+            handler.handle(make_record("record 50"))
+            self.assertIsNone(handler.flush())
+            self.assertEqual(len(stream.getvalue().splitlines()), 51)
+            await handler.aclose()
+        
+        asyncio.run(main())
+    
+    def test_flush_outside_loop_is_synchronous(self):
+        stream = StringIO()
+        handler = AsyncColorHandler(stream)
+        handler.handle(make_record("sync flush"))
+        self.assertIsNone(handler.flush())
+        self.assertIn("sync flush", stream.getvalue())
+        handler.close()
+    
+    @unittest.skipUnless(os.name == 'posix', 'requires POSIX pipes')
+    def test_nonblocking_pipe_mode(self):
+        read_fd, write_fd = os.pipe()
+        stream = os.fdopen(write_fd, 'w')
+        chunks = []
+        reader = threading.Thread(target=lambda: chunks.extend(iter(lambda: os.read(read_fd, 65536), b'')))
+        reader.start()
+        
+        async def main():
+            handler = AsyncColorHandler(stream, nonblocking=True)
+            self.assertTrue(handler.nonblocking)
+            self.assertTrue(os.get_blocking(write_fd))
+            for i in range(2000):
+                handler.handle(make_record(f"record {i} " + "x" * 200))
+            await handler.aflush()
+            self.assertEqual(handler.queue_depth(), 0)
+            handler.handle(make_record("record 2000"))
+            self.assertIsNone(handler.flush())
+            self.assertEqual(handler.queue_depth(), 0)
+            await handler.aclose()
+            self.assertTrue(os.get_blocking(write_fd))
+        
+        asyncio.run(main())
+        stream.close()
+        reader.join(5)
+        os.close(read_fd)
+        
+        lines = b''.join(chunks).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 2001)
+        self.assertTrue(lines[-1].endswith("record 2000"))
+    
+    @unittest.skipUnless(os.name == 'posix', 'requires POSIX pipes')
+    def test_overflow_drops_whole_records_only(self):
+        read_fd, write_fd = os.pipe()
+        stream = os.fdopen(write_fd, 'w')
+        chunks = []
+        
+        def read_slowly():
+            while True:
+                chunk = os.read(read_fd, 4096)
+                if not chunk:
+                    return
+                chunks.append(chunk)
+                time.sleep(0.001)
+        
+        reader = threading.Thread(target=read_slowly)
+        reader.start()
+        
+        async def main():
+            handler = AsyncColorHandler(stream, nonblocking=True, max_buffer=20000)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            for i in range(5000):
+                handler.handle(make_record(f"record {i:05d} " + "x" * 100))
+                if i % 50 == 0:
+                    await asyncio.sleep(0)
+            start = time.monotonic()
+            handler.flush()
+            self.assertLess(time.monotonic() - start, 0.5)
+            await handler.aclose()
+            return handler.dropped
+        
+        dropped = asyncio.run(main())
+        stream.close()
+        reader.join(10)
+        os.close(read_fd)
+        
+        lines = b''.join(chunks).decode('utf-8').splitlines()
+        self.assertGreater(dropped, 0)
+        self.assertEqual(len(lines) + dropped, 5000)
+        for line in lines:
+            self.assertRegex(line, r'^record \d{5} x{100}$')
+    
+    def test_nonblocking_falls_back_to_thread_for_regular_streams(self):
+        async def main():
+            handler = AsyncColorHandler(StringIO(), nonblocking=True)
+            self.assertFalse(handler.nonblocking)
+            await handler.aclose()
+        
+        asyncio.run(main())
+
+if __name__ == '__main__':
+    unittest.main()
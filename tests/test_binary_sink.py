@@ -0,0 +1,132 @@
+import unittest
+import os
+import sys
+import logging
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from smartlogger.__main__ import main
+from smartlogger.config.colors import Colors
+from smartlogger.core.binary_sink import (
+    BinaryLogHandler, BinaryLogReader, index_path, MAGIC, FRAME_RECORD, FLAG_ABSOLUTE_TIME, _frame
+)
+
+class TestBinaryLogSink(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'app.slog')
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def write(self, count, mode='w', start=1000.0, **kwargs):
+        handler = BinaryLogHandler(self.path, mode, **kwargs)
+        for i in range(count):
+            level = (logging.DEBUG, logging.INFO, logging.WARNING)[i % 3]
+            record = logging.LogRecord('app.db' if i % 2 else 'app.web', level, 'test.py', 1,
+                                       'request %s #%d took %.1fms ok=%s', ('/users', i, 1.5, True), None)
+            record.created = start + i
+            handler.handle(record)
+        handler.close()
+    
+    def test_round_trip_interns_names_and_templates(self):
+        self.write(50)
+        records = list(BinaryLogReader(self.path))
+        self.assertEqual(len(records), 50)
+        self.assertEqual(records[7].getMessage(), 'request /users #7 took 1.5ms ok=True')
+        self.assertEqual(records[7].name, 'app.db')
+        self.assertEqual(records[7].created, 1007.0)
+        self.assertEqual(records[7].levelno, logging.INFO)
+        
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        self.assertEqual(data.count(b'request %s #%d'), 1)
+        self.assertEqual(data.count(b'app.web'), 1)
+    
+    def test_unpackable_args_and_exceptions_are_rendered(self):
+        handler = BinaryLogHandler(self.path, 'w')
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord('app', logging.ERROR, 'test.py', 1, 'failed for %r', ({'id': 1},), sys.exc_info())
+        handler.handle(record)
+        handler.close()
+        
+        restored = next(iter(BinaryLogReader(self.path)))
+        self.assertEqual(restored.getMessage(), "failed for {'id': 1}")
+        self.assertIn('ValueError: boom', restored.exc_text)
+    
+    def test_filters_and_index_seek(self):
+        self.write(100, index_interval=10)
+        self.assertTrue(os.path.exists(index_path(self.path)))
+        
+        reader = BinaryLogReader(self.path)
+        records = list(reader.records(level=logging.WARNING, loggers=['app.db'], since=1050.0, until=1080.0))
+        self.assertTrue(records)
+        for record in records:
+            self.assertEqual(record.levelno, logging.WARNING)
+            self.assertEqual(record.name, 'app.db')
+            self.assertTrue(1050.0 <= record.created <= 1080.0)
+        self.assertEqual([r.created for r in records], [1053.0, 1059.0, 1065.0, 1071.0, 1077.0])
+    
+    def test_append_reuses_string_table_and_truncates_partial_frame(self):
+        self.write(5)
+        with open(self.path, 'ab') as f:
+            f.write(b'\x40\x00\x00\x00\x02partial')
+        self.write(5, mode='a', start=2000.0)
+        
+        records = list(BinaryLogReader(self.path))
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[-1].created, 2004.0)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read().count(b'app.web'), 1)
+    
+    def test_append_after_truncation_drops_stale_index_points(self):
+        self.write(100, index_interval=10)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) * 6 // 10 - 3)
+        survivors = len(list(BinaryLogReader(self.path)))
+        self.write(50, mode='a', start=3000.0, index_interval=10)
+        
+        reader = BinaryLogReader(self.path)
+        self.assertEqual(len(list(reader)), survivors + 50)
+        self.assertEqual([r.created for r in reader.records(since=3045.0)], [3045.0 + i for i in range(5)])
+        self.assertEqual(len(list(reader.records(since=1010.0, until=1019.0))), 10)
+        self.assertEqual(len(list(reader.records(since=1095.0))), 50)
+        
+        output = StringIO()
+        with patch.object(sys, 'stdout', output):
+            self.assertEqual(main(['view', self.path, '--since', '1095', '--color', 'never']), 0)
+        self.assertEqual(len(output.getvalue().splitlines()), 50)
+        
+        with open(self.path, 'wb') as f:
+            f.write(MAGIC + _frame(bytes([FRAME_RECORD | FLAG_ABSOLUTE_TIME]) + bytes(8) + bytes([20, 5])))
+        with self.assertRaises(ValueError):
+            list(BinaryLogReader(self.path))
+    
+    def test_view_command_renders_colored_lines(self):
+        self.write(6)
+        output = StringIO()
+        with patch.object(sys, 'stdout', output):
+            self.assertEqual(main(['view', self.path, '--level', 'info', '--color', 'always', '--format', '%(levelname)s %(name)s %(message)s']), 0)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0], f"{Colors.colorize('INFO', Colors.GREEN)} app.db request /users #1 took 1.5ms ok=True")
+    
+    def test_mismatched_args_are_not_stored_and_view_reports_errors(self):
+        handler = BinaryLogHandler(self.path, 'w')
+        with patch.object(handler, 'handleError') as handle_error:
+            for args in ((1,), (1, 2)):
+                handler.handle(logging.LogRecord('app', logging.INFO, 'test.py', 1, 'x %s %s', args, None))
+        handler.close()
+        self.assertEqual(handle_error.call_count, 1)
+        self.assertEqual([r.getMessage() for r in BinaryLogReader(self.path)], ['x 1 2'])
+        
+        errors = StringIO()
+        with patch.object(sys, 'stderr', errors):
+            self.assertEqual(main(['view', os.path.join(self.directory.name, 'missing.slog')]), 2)
+        self.assertIn('error:', errors.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import logging
+from io import StringIO
+from smartlogger.config.colors import Colors
+from smartlogger.core.handler import ColorHandler
+from smartlogger.core.dedup_handler import DedupHandler
+
+class TestDedupHandler(unittest.TestCase):
+    
+    def setUp(self):
+        self.stream = StringIO()
+        self.target = ColorHandler(self.stream)
+        self.target.formatter.disable_colors()
+        self.handler = DedupHandler(self.target, window=10.0, maxsize=4)
+    
+    def make_record(self, created, msg='Retrying %s', args=('db',), lineno=1):
+        record = logging.LogRecord('test', logging.WARNING, 'test.py', lineno, msg, args, None)
+        record.created = created
+        return record
+    
+    def lines(self):
+        return self.stream.getvalue().splitlines()
+    
+    def test_repeats_are_summarized_when_window_expires(self):
+        for i in range(5):
+            self.handler.handle(self.make_record(100.0 + i))
+        self.assertEqual(len(self.lines()), 1)
+        self.assertEqual(self.handler.suppressed, 4)
+        
+        self.handler.handle(self.make_record(111.0))
+        lines = self.lines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn('Retrying db [repeated 4 times in 4s]', lines[1])
+        self.assertIn('Retrying db', lines[2])
+    
+    def test_call_site_is_part_of_the_key(self):
+        self.handler.handle(self.make_record(100.0, lineno=1))
+        self.handler.handle(self.make_record(100.0, lineno=2))
+        self.assertEqual(len(self.lines()), 2)
+    
+    def test_eviction_and_flush_emit_pending_summaries(self):
+        self.handler.handle(self.make_record(100.0))
+        self.handler.handle(self.make_record(100.5))
+        for lineno in range(2, 6):
+            self.handler.handle(self.make_record(101.0, lineno=lineno))
+        self.assertIn('[repeated 1 time in 0s]', self.stream.getvalue())
+        self.assertLessEqual(len(self.handler._windows), 4)
+        
+        self.handler.handle(self.make_record(101.5, lineno=5))
+        self.handler.flush()
+        self.assertEqual(self.stream.getvalue().count('repeated'), 2)
+    
+    def test_summary_is_colored_on_color_formatter(self):
+        self.target.formatter.enable_colors()
+        self.handler.handle(self.make_record(100.0))
+        self.handler.handle(self.make_record(100.0))
+        self.handler.flush()
+        self.assertIn(Colors.colorize('repeated 1 time in 0s', Colors.MAGENTA), self.stream.getvalue())
+    
+    def test_any_later_record_flushes_every_expired_summary(self):
+        for lineno in (1, 2):
+            for i in range(3):
+                self.handler.handle(self.make_record(100.25 + i, lineno=lineno))
+        self.handler.handle(self.make_record(103.0, lineno=3))
+        self.assertEqual(self.stream.getvalue().count('repeated'), 0)
+        
+        summaries = []
+        self.target.addFilter(lambda record: summaries.append(record) or True)
+        self.handler.handle(self.make_record(112.5, msg='unrelated', args=()))
+        self.assertEqual(len(summaries), 3)
+        self.assertEqual(self.stream.getvalue().count('repeated 2 times in 2s'), 2)
+        self.assertEqual(summaries[0].created, 102.25)
+        self.assertAlmostEqual(summaries[0].msecs, 250.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import logging
+from io import StringIO
+from smartlogger.config.colors import Colors
+from smartlogger.core.handler import ColorHandler
+from smartlogger.core.flight_recorder import FlightRecorder
+
+class TestFlightRecorder(unittest.TestCase):
+    
+    def setUp(self):
+        self.stream = StringIO()
+        self.target = ColorHandler(self.stream)
+        self.target.formatter.enable_colors()
+        self.recorder = FlightRecorder(3, self.target)
+    
+    def make_record(self, level, msg, args=()):
+        return logging.LogRecord('app.db', level, 'test.py', 1, msg, args, None)
+    
+    def test_context_is_buffered_until_error(self):
+        self.recorder.handle(self.make_record(logging.DEBUG, 'query %s', ('SELECT 1',)))
+        self.recorder.handle(self.make_record(logging.INFO, 'connected'))
+        self.assertEqual(self.stream.getvalue(), '')
+        self.assertEqual(len(self.recorder), 2)
+        
+        self.recorder.handle(self.make_record(logging.ERROR, 'lost connection'))
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn('query SELECT 1', lines[0])
+        self.assertIn(Colors.colorize('DEBUG', Colors.BLUE), lines[0])
+        self.assertIn('app.db', lines[1])
+        self.assertIn('lost connection', lines[2])
+        self.assertEqual(len(self.recorder), 0)
+        self.assertEqual(self.recorder.dumps, 1)
+    
+    def test_ring_keeps_only_the_last_records(self):
+        for i in range(10):
+            self.recorder.handle(self.make_record(logging.DEBUG, 'step %d', (i,)))
+        messages = [record.getMessage() for record in self.recorder.records()]
+        self.assertEqual(messages, ['step 7', 'step 8', 'step 9'])
+    
+    def test_timestamps_and_mapping_args_are_preserved(self):
+        record = self.make_record(logging.INFO, '%(user)s logged in', ({'user': 'ada'},))
+        record.created = 1700000000.25
+        self.recorder.handle(record)
+        restored = next(self.recorder.records())
+        self.assertEqual(restored.getMessage(), 'ada logged in')
+        self.assertEqual(restored.created, 1700000000.25)
+        self.assertAlmostEqual(restored.msecs, 250.0)
+    
+    def test_render_args_stores_text_only(self):
+        recorder = FlightRecorder(2, self.target, render_args=True)
+        payload = ['mutable']
+        recorder.handle(self.make_record(logging.DEBUG, 'payload %s', (payload,)))
+        payload.append('changed')
+        restored = next(recorder.records())
+        self.assertEqual(restored.getMessage(), "payload ['mutable']")
+        self.assertIsNone(recorder._args[0])
+
+if __name__ == '__main__':
+    unittest.main()
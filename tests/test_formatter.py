@@ -1,7 +1,10 @@
 import unittest
 import logging
+import os
+import time
 from unittest.mock import patch, MagicMock
 from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core.highlighter import Highlighter, KEYWORD_COLOR
 from smartlogger.config.colors import Colors
 
 class TestColorFormatter(unittest.TestCase):
@@ -47,6 +50,79 @@ class TestColorFormatter(unittest.TestCase):
         formatter = ColorFormatter()
         formatter.format(self.record)
         self.assertEqual(self.record.levelname, original_levelname)
+    
+    def test_compiled_output_matches_mutating_format(self):
+        formats = [None, '%(levelname)-8s|%(name)s:%(lineno)d %% %(message)r', "{%(module)s} '%(funcName)s' \\ %% %(message)s"]
+        for fmt in formats:
+            for colored in (True, False):
+                with self.subTest(fmt=fmt, colored=colored):
+                    compiled = ColorFormatter(fmt)
+                    mutating = ColorFormatter(fmt, compiled=False)
+                    for formatter in (compiled, mutating):
+                        formatter.enable_colors() if colored else formatter.disable_colors()
+                    self.assertIsNotNone(compiled._render)
+                    self.assertEqual(compiled.format(self.record), mutating.format(self.record))
+    
+    def test_compiled_format_does_not_write_to_record(self):
+        formatter = ColorFormatter()
+        formatter.enable_colors()
+        before = dict(self.record.__dict__)
+        formatted = formatter.format(self.record)
+        self.assertIn(Colors.colorize('INFO', Colors.GREEN), formatted)
+        self.assertEqual(self.record.__dict__, before)
+    
+    def test_renderer_follows_feature_changes(self):
+        formatter = ColorFormatter('%(levelname)s %(message)s')
+        formatter.disable_colors()
+        plain = formatter._render
+        self.assertEqual(formatter.format(self.record), 'INFO Test message')
+        
+        formatter.color_enabled = True
+        formatter.highlighter = Highlighter(keywords=['message'])
+        self.assertIsNot(formatter._render, plain)
+        self.assertEqual(formatter.format(self.record), Colors.colorize('INFO', Colors.GREEN) + ' Test ' + Colors.colorize('message', KEYWORD_COLOR))
+        
+        formatter.highlighter = None
+        self.assertEqual(formatter.format(self.record), Colors.colorize('INFO', Colors.GREEN) + ' Test message')
+        formatter.color_enabled = False
+        self.assertIs(formatter._render, plain)
+    
+    def test_cached_asctime_matches_stdlib(self):
+        plain = logging.Formatter()
+        for datefmt in (None, '%H:%M:%S', '%Y-%m-%d %H:%M:%S %Z'):
+            formatter = ColorFormatter(datefmt=datefmt)
+            formatter.datefmt = datefmt
+            for created in (1700000000.0, 1700000000.25, 1700000000.999, 1700000001.5, 1700000000.5):
+                with self.subTest(datefmt=datefmt, created=created):
+                    self.record.created = created
+                    self.record.msecs = int((created - int(created)) * 1000) + 0.0
+                    self.assertEqual(formatter.formatTime(self.record, datefmt), plain.formatTime(self.record, datefmt))
+    
+    @unittest.skipUnless(hasattr(time, 'tzset'), 'requires time.tzset')
+    def test_cached_asctime_follows_timezone_and_dst_changes(self):
+        original_tz = os.environ.get('TZ')
+        plain = logging.Formatter()
+        formatter = ColorFormatter()
+        try:
+            for tz in ('UTC', 'America/New_York', 'Asia/Tehran'):
+                os.environ['TZ'] = tz
+                time.tzset()
+                for created in (1710054000.0, 1710054000.5, 1710057599.0, 1710057600.0):
+                    with self.subTest(tz=tz, created=created):
+                        self.record.created = created
+                        self.assertEqual(formatter.formatTime(self.record, formatter.datefmt),
+                                         plain.formatTime(self.record, formatter.datefmt))
+        finally:
+            if original_tz is None:
+                os.environ.pop('TZ', None)
+            else:
+                os.environ['TZ'] = original_tz
+            time.tzset()
+    
+    def test_brace_style_falls_back(self):
+        formatter = ColorFormatter('{levelname} {message}', style='{')
+        self.assertIsNone(formatter._render)
+        self.assertIn('Test message', formatter.format(self.record))
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
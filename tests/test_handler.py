@@ -1,10 +1,19 @@
 import unittest
+import gc
 import sys
+import time
 import logging
+import weakref
 from io import StringIO
 from unittest.mock import patch
 from smartlogger.core.handler import ColorHandler
 from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core.async_handler import AsyncColorHandler
+from smartlogger.utils.terminal import invalidate_color_cache
+
+class FakeTTY(StringIO):
+    def isatty(self):
+        return True
 
 class TestColorHandler(unittest.TestCase):
     
@@ -44,6 +53,88 @@ class TestColorHandler(unittest.TestCase):
         self.handler.emit(self.record)
         output = self.stream.getvalue()
         self.assertIn('Test message', output)
+    
+    def test_buffered_mode_coalesces_writes(self):
+        stream = StringIO()
+        handler = ColorHandler(stream, buffer_size=10000)
+        for _ in range(3):
+            handler.handle(self.record)
+        self.assertEqual(stream.getvalue(), '')
+        
+        handler.flush()
+        self.assertEqual(stream.getvalue().count('Test message'), 3)
+    
+    def test_buffered_mode_flushes_at_size_threshold(self):
+        stream = StringIO()
+        handler = ColorHandler(stream, buffer_size=1)
+        handler.handle(self.record)
+        self.assertIn('Test message', stream.getvalue())
+    
+    def test_buffered_mode_flushes_on_error(self):
+        stream = StringIO()
+        handler = ColorHandler(stream, buffer_size=10000)
+        handler.handle(self.record)
+        error = logging.LogRecord('test', logging.ERROR, 'test.py', 1, 'Crash', (), None)
+        handler.handle(error)
+        
+        output = stream.getvalue()
+        self.assertIn('Test message', output)
+        self.assertIn('Crash', output)
+    
+    def test_buffered_mode_flushes_after_interval(self):
+        stream = StringIO()
+        handler = ColorHandler(stream, buffer_size=10000, flush_interval=0.01)
+        handler.handle(self.record)
+        deadline = time.monotonic() + 2
+        while 'Test message' not in stream.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIn('Test message', stream.getvalue())
+        handler.close()
+    
+    def test_buffered_handlers_are_freed(self):
+        for close in (True, False):
+            handler = ColorHandler(StringIO(), buffer_size=10000, flush_interval=0.01)
+            handler.handle(self.record)
+            if close:
+                handler.close()
+            thread = handler._flusher
+            ref = weakref.ref(handler)
+            del handler
+            gc.collect()
+            self.assertIsNone(ref())
+            thread.join(1)
+            self.assertFalse(thread.is_alive())
+    
+    def test_color_follows_handler_stream_not_stdout(self):
+        self.addCleanup(invalidate_color_cache)
+        with patch.dict('os.environ', {'FORCE_COLOR': '1', 'NO_COLOR': ''}), patch.object(sys, 'stdout', FakeTTY()):
+            invalidate_color_cache()
+            stream = StringIO()
+            handler = ColorHandler(stream)
+            handler.handle(self.record)
+            self.assertNotIn('\x1b[', stream.getvalue())
+            
+            handler.setFormatter(ColorFormatter())
+            handler.handle(self.record)
+            self.assertNotIn('\x1b[', stream.getvalue())
+            
+            tty = FakeTTY()
+            handler.setStream(tty)
+            handler.handle(self.record)
+            self.assertIn('\x1b[', tty.getvalue())
+            
+            handler = AsyncColorHandler(stream)
+            handler.handle(self.record)
+            handler.close()
+            self.assertNotIn('\x1b[', stream.getvalue())
+    
+    def test_forced_colors_survive_stream_change(self):
+        handler = ColorHandler(StringIO())
+        handler.formatter.enable_colors()
+        stream = StringIO()
+        handler.setStream(stream)
+        handler.handle(self.record)
+        self.assertIn('\x1b[', stream.getvalue())
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
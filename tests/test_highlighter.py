@@ -0,0 +1,66 @@
+import unittest
+import logging
+from smartlogger.config.colors import Colors
+from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core.highlighter import Highlighter
+
+class TestHighlighter(unittest.TestCase):
+    
+    def setUp(self):
+        self.highlighter = Highlighter(keywords=['timeout', ('retrying', Colors.YELLOW)])
+    
+    def test_each_rule_is_colored(self):
+        text = self.highlighter.highlight(
+            'GET https://api.example.com/v1 from 10.0.0.7 id 123e4567-e89b-12d3-a456-426614174000 '
+            'user "ada" took 42ms Timeout, retrying')
+        self.assertIn(Colors.colorize('https://api.example.com/v1', Colors.CYAN), text)
+        self.assertIn(Colors.colorize('10.0.0.7', Colors.BRIGHT_MAGENTA), text)
+        self.assertIn(Colors.colorize('123e4567-e89b-12d3-a456-426614174000', Colors.MAGENTA), text)
+        self.assertIn(Colors.colorize('"ada"', Colors.GREEN), text)
+        self.assertIn(Colors.colorize('42', Colors.BRIGHT_CYAN) + 'ms', text)
+        self.assertIn(Colors.colorize('Timeout', Colors.BRIGHT_RED + Colors.BOLD), text)
+        self.assertIn(Colors.colorize('retrying', Colors.YELLOW), text)
+    
+    def test_plain_text_and_existing_escapes_are_left_alone(self):
+        for text in ("don't touch it's fine", 'version v1.2 of abc123', Colors.colorize('done', Colors.GREEN)):
+            self.assertEqual(self.highlighter.highlight(text), text)
+        self.assertEqual(Colors.strip_colors(self.highlighter.highlight('took 42ms')), 'took 42ms')
+    
+    def test_rules_and_keywords_can_be_changed(self):
+        self.highlighter.add_rule('ticket', r'\bJIRA-\d+\b', Colors.BLUE, first=True)
+        self.highlighter.remove_rule('number')
+        self.highlighter.remove_keyword('timeout')
+        text = self.highlighter.highlight('JIRA-42 timeout after 3 tries')
+        self.assertEqual(text, Colors.colorize('JIRA-42', Colors.BLUE) + ' timeout after 3 tries')
+        with self.assertRaises(ValueError):
+            self.highlighter.add_rule('bad name', 'x', Colors.RED)
+    
+    def test_results_are_cached(self):
+        self.highlighter.highlight('took 42ms')
+        self.highlighter.highlight('took 42ms')
+        self.assertEqual(self.highlighter.cache_info().hits, 1)
+    
+    def test_long_messages_are_not_cached(self):
+        text = 'payload ' + 'x' * 300 + ' 42'
+        self.assertIn(Colors.BRIGHT_CYAN + '42', self.highlighter.highlight(text))
+        self.assertEqual(self.highlighter.cache_info().currsize, 0)
+        recolored = Highlighter(cache_max_length=1000).recolored({})
+        recolored.highlight(text)
+        self.assertEqual(recolored.cache_info().currsize, 1)
+    
+    def test_formatter_highlights_only_when_colored(self):
+        record = logging.LogRecord('test', logging.INFO, 'test.py', 1, 'took %dms', (42,), None)
+        for compiled in (True, False):
+            formatter = ColorFormatter('%(levelname)s %(message)s', compiled=compiled, highlighter=self.highlighter)
+            formatter.enable_colors()
+            expected = Colors.colorize('INFO', Colors.GREEN) + ' took ' + Colors.colorize('42', Colors.BRIGHT_CYAN) + 'ms'
+            self.assertEqual(formatter.format(record), expected)
+            plain, colored = formatter.format_segments(record)
+            self.assertEqual((plain, colored), ('INFO took 42ms', expected))
+            self.assertEqual(record.msg, 'took %dms')
+            
+            formatter.disable_colors()
+            self.assertEqual(formatter.format(record), 'INFO took 42ms')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import sys
+import json
+import logging
+from smartlogger.config.colors import Colors
+from smartlogger.core.json_formatter import JSONFormatter
+
+class TestJSONFormatter(unittest.TestCase):
+    
+    def setUp(self):
+        self.formatter = JSONFormatter()
+        self.formatter.disable_colors()
+        self.record = logging.LogRecord('app.api', logging.WARNING, 'test.py', 1, 'Slow "%s" request', ('/users',), None)
+        self.record.created = 1700000000.5
+        self.record.user = 'ada'
+        self.record.elapsed_ms = 812.5
+        self.record.tags = ['db', 'slow']
+    
+    def test_json_line_with_extras(self):
+        line = self.formatter.format(self.record)
+        self.assertNotIn('\n', line)
+        self.assertEqual(json.loads(line), {
+            'time': 1700000000.5,
+            'level': 'WARNING',
+            'logger': 'app.api',
+            'message': 'Slow "/users" request',
+            'user': 'ada',
+            'elapsed_ms': 812.5,
+            'tags': ['db', 'slow'],
+        })
+    
+    def test_matches_json_dumps_for_awkward_values(self):
+        self.record.blob = object()
+        self.record.ratio = float('nan')
+        self.record.unicode = 'café ✓'
+        self.record._private = 'hidden'
+        data = json.loads(self.formatter.format(self.record))
+        self.assertEqual(data['blob'], str(self.record.blob))
+        self.assertIsNone(data['ratio'])
+        self.assertEqual(data['unicode'], 'café ✓')
+        self.assertNotIn('_private', data)
+    
+    def test_json_by_default_and_valid_for_nested_values(self):
+        formatter = JSONFormatter()
+        self.assertFalse(formatter.color_enabled)
+        self.record.level = 'shadowed'
+        self.record.nested = {'ratio': float('inf'), 'items': [float('nan'), 1]}
+        line = formatter.format(self.record)
+        data = json.loads(line, parse_constant=lambda name: self.fail(name))
+        self.assertEqual(data['level'], 'WARNING')
+        self.assertEqual(line.count('"level"'), 1)
+        self.assertEqual(data['nested'], {'ratio': None, 'items': [None, 1]})
+    
+    def test_custom_fields_and_exception(self):
+        formatter = JSONFormatter({'lvl': 'levelname', 'line': 'lineno'}, extras=False)
+        formatter.disable_colors()
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.record.exc_info = sys.exc_info()
+        data = json.loads(formatter.format(self.record))
+        self.assertEqual(set(data), {'lvl', 'line', 'exc_info'})
+        self.assertEqual(data['line'], 1)
+        self.assertIn('ValueError: boom', data['exc_info'])
+    
+    def test_colored_key_value_view(self):
+        self.formatter.enable_colors()
+        line = self.formatter.format(self.record)
+        self.assertIn(Colors.colorize('level', Colors.CYAN) + '=' + Colors.colorize('WARNING', Colors.YELLOW), line)
+        self.assertIn(Colors.colorize('message', Colors.CYAN) + '=Slow "/users" request', line)
+        self.assertIn(Colors.colorize('user', Colors.CYAN) + '=ada', line)
+        self.assertTrue(Colors.strip_colors(line).startswith('time=' + self.formatter.formatTime(self.record)))
+
+if __name__ == '__main__':
+    unittest.main()
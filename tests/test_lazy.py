@@ -0,0 +1,92 @@
+import unittest
+import logging
+from io import StringIO
+from smartlogger.core.flight_recorder import FlightRecorder
+from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core.handler import ColorHandler
+from smartlogger.core.highlighter import Highlighter
+from smartlogger.core.lazy import Lazy, LazyLogRecord, lazy, enable_lazy_messages, disable_lazy_messages, lazy_messages_enabled
+
+class TestLazyMessages(unittest.TestCase):
+    
+    def setUp(self):
+        self.original_factory = logging.getLogRecordFactory()
+        enable_lazy_messages()
+        self.calls = 0
+        self.terminal = StringIO()
+        self.file = StringIO()
+        self.logger = logging.Logger('test_lazy', logging.DEBUG)
+        self.terminal_handler = ColorHandler(self.terminal)
+        self.file_handler = logging.StreamHandler(self.file)
+        self.logger.addHandler(self.terminal_handler)
+        self.logger.addHandler(self.file_handler)
+    
+    def tearDown(self):
+        self.logger.removeHandler(self.terminal_handler)
+        self.logger.removeHandler(self.file_handler)
+        disable_lazy_messages()
+        logging.setLogRecordFactory(self.original_factory)
+    
+    def expensive(self):
+        self.calls += 1
+        return 'payload'
+    
+    def test_callable_rendered_once_for_several_handlers(self):
+        self.logger.debug("state: %s", lazy(self.expensive))
+        self.assertEqual(self.calls, 1)
+        self.assertIn('state: payload', self.terminal.getvalue())
+        self.assertIn('state: payload', self.file.getvalue())
+    
+    def test_not_evaluated_when_every_handler_drops_the_record(self):
+        self.terminal_handler.setLevel(logging.INFO)
+        self.file_handler.addFilter(lambda record: False)
+        self.logger.debug("state: %r", lazy(self.expensive))
+        self.assertEqual(self.calls, 0)
+    
+    def test_plain_callables_are_not_called(self):
+        def needs_argument(value):
+            raise AssertionError("called")
+        
+        self.logger.info("callback=%s %s", self.expensive, needs_argument)
+        self.assertEqual(self.calls, 0)
+        self.assertIn('callback=<bound method', self.file.getvalue())
+        self.assertIn('needs_argument', self.file.getvalue())
+    
+    def test_lazy_wrapper_supports_conversions(self):
+        count = Lazy(len, [1, 2, 3])
+        self.assertEqual('%d items, %s, %r, %.1f' % (count, count, count, count), '3 items, 3, 3, 3.0')
+        self.assertTrue(count.evaluated)
+        record = LazyLogRecord('test', logging.INFO, 'test.py', 1, '%(user)s', ({'user': lazy(lambda: 'ada')},), None)
+        self.assertEqual(record.getMessage(), 'ada')
+    
+    def test_cache_follows_msg_and_args(self):
+        record = logging.getLogRecordFactory()('test', logging.INFO, 'test.py', 1, 'a %s', (1,), None)
+        self.assertIsInstance(record, LazyLogRecord)
+        self.assertEqual(record.getMessage(), 'a 1')
+        record.msg, record.args = 'b %s', (2,)
+        self.assertEqual(record.getMessage(), 'b 2')
+        
+        disable_lazy_messages()
+        self.assertFalse(lazy_messages_enabled())
+        self.assertIs(logging.getLogRecordFactory(), self.original_factory)
+    
+    def test_highlighting_fallback_and_flight_recorder_replay(self):
+        formatter = ColorFormatter('{levelname} {message}', style='{', highlighter=Highlighter())
+        formatter.enable_colors()
+        self.terminal_handler.setFormatter(formatter)
+        self.logger.info("state: %s", lazy(self.expensive))
+        self.assertEqual(self.calls, 1)
+        self.assertIn('state: payload', self.file.getvalue())
+        
+        output = StringIO()
+        recorder = FlightRecorder(10, target=logging.StreamHandler(output))
+        self.logger.addHandler(recorder)
+        try:
+            self.logger.info("context: %s", lazy(self.expensive))
+            self.logger.error("failed")
+        finally:
+            self.logger.removeHandler(recorder)
+        self.assertIn('context: payload', output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
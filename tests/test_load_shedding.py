@@ -0,0 +1,116 @@
+import unittest
+import logging
+import sys
+import threading
+import time
+from io import StringIO
+from smartlogger.config.colors import Colors
+from smartlogger.core.handler import ColorHandler
+from smartlogger.core.load_shedding import LoadShedder
+
+class TestLoadShedder(unittest.TestCase):
+    
+    def setUp(self):
+        self.start = time.perf_counter()
+    
+    def make_shedder(self, **kwargs):
+        options = dict(high_latency=0.01, low_latency=0.001, smoothing=1.0, escalate_after=0.0, recover_after=0.0)
+        options.update(kwargs)
+        return LoadShedder(**options)
+    
+    def test_stages_escalate_debug_before_info(self):
+        shedder = self.make_shedder()
+        shedder.observe(0.05, self.start + 1.0)
+        self.assertEqual(shedder.stage, 1)
+        admitted = sum(shedder.admit(logging.DEBUG) for _ in range(100))
+        self.assertEqual(admitted, 10)
+        self.assertTrue(all(shedder.admit(logging.INFO) for _ in range(10)))
+        
+        shedder.observe(0.05, self.start + 2.0)
+        shedder.observe(0.05, self.start + 3.0)
+        self.assertEqual(shedder.stage, 3)
+        self.assertFalse(shedder.admit(logging.DEBUG))
+        self.assertFalse(shedder.admit(logging.INFO))
+        self.assertTrue(shedder.admit(logging.WARNING))
+        self.assertTrue(shedder.admit(logging.CRITICAL))
+    
+    def test_hysteresis_between_thresholds(self):
+        shedder = self.make_shedder(recover_after=5.0)
+        shedder.observe(0.05, self.start + 10.0)
+        shedder.observe(0.005, self.start + 20.0)
+        self.assertEqual(shedder.stage, 1)
+        shedder.observe(0.0001, self.start + 21.0)
+        self.assertEqual(shedder.stage, 1)
+        shedder.observe(0.0001, self.start + 26.0)
+        self.assertEqual(shedder.stage, 0)
+    
+    def test_handler_reports_shed_records_per_level(self):
+        stream = StringIO()
+        shedder = self.make_shedder(report_interval=3600.0)
+        for now in (1.0, 2.0, 3.0):
+            shedder.observe(0.05, self.start + now)
+        shedder.recover_after = 3600.0
+        handler = ColorHandler(stream, shedder=shedder)
+        handler.formatter.disable_colors()
+        logger = logging.getLogger('test_load_shedding')
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(handler)
+        try:
+            for _ in range(3):
+                logger.debug("noise")
+            logger.info("progress")
+            logger.warning("disk almost full")
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+        
+        output = stream.getvalue()
+        self.assertNotIn('noise', output)
+        self.assertNotIn('progress', output)
+        self.assertIn('disk almost full', output)
+        self.assertIn('shed 3 DEBUG, 1 INFO records under load', output)
+    
+    def test_marker_is_colored(self):
+        stream = StringIO()
+        handler = ColorHandler(stream, shedder=self.make_shedder())
+        handler.formatter.enable_colors()
+        handler._write_shed_marker({logging.DEBUG: 1234}, 2)
+        self.assertIn(Colors.colorize('smartlogger: shed 1,234 DEBUG records under load (stage 2)', Colors.MAGENTA), stream.getvalue())
+    
+    def test_counts_survive_concurrent_reports(self):
+        shedder = self.make_shedder(recover_after=3600.0)
+        for now in (1.0, 2.0, 3.0):
+            shedder.observe(0.05, self.start + now)
+        reported = []
+        done = threading.Event()
+        
+        def report():
+            while not done.is_set():
+                reported.append(shedder.take_report() or {})
+        
+        def produce():
+            for _ in range(20000):
+                shedder.admit(logging.DEBUG)
+        
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            reporter = threading.Thread(target=report)
+            reporter.start()
+            producers = [threading.Thread(target=produce) for _ in range(4)]
+            for thread in producers:
+                thread.start()
+            for thread in producers:
+                thread.join()
+            done.set()
+            reporter.join()
+        finally:
+            sys.setswitchinterval(interval)
+        
+        reported.append(shedder.take_report() or {})
+        self.assertEqual(shedder.total_shed, 80000)
+        self.assertEqual(sum(counts.get(logging.DEBUG, 0) for counts in reported), 80000)
+
+if __name__ == '__main__':
+    unittest.main()
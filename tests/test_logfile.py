@@ -0,0 +1,68 @@
+import unittest
+import os
+import sys
+import tempfile
+from io import BytesIO, StringIO
+from unittest.mock import patch
+from smartlogger.__main__ import main
+from smartlogger.config.colors import Colors
+from smartlogger.utils.logfile import strip_stream, colorize_stream
+
+COLORED = (
+    b'2024-01-01 - app - \x1b[32mINFO\x1b[0m - started\n'
+    b'2024-01-01 - app - \x1b[91m\x1b[1mCRITICAL\x1b[0m - down\n'
+    b'plain line without level\n'
+    b'2024-01-01 - app - \x1b[33mWARNING\x1b[0m - no newline at end'
+)
+
+class TestLogFileTools(unittest.TestCase):
+    
+    def strip(self, data, chunk_size):
+        out = BytesIO()
+        strip_stream(BytesIO(data), out, chunk_size)
+        return out.getvalue()
+    
+    def colorize(self, data, chunk_size):
+        out = BytesIO()
+        colorize_stream(BytesIO(data), out, chunk_size)
+        return out.getvalue()
+    
+    def test_strip_matches_strip_colors_across_chunk_sizes(self):
+        expected = Colors.strip_colors(COLORED)
+        for chunk_size in (1, 3, 7, 64, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.strip(COLORED, chunk_size), expected)
+    
+    def test_colorize_round_trip(self):
+        plain = Colors.strip_colors(COLORED)
+        for chunk_size in (1, 5, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                colored = self.colorize(plain, chunk_size)
+                self.assertEqual(colored, COLORED)
+    
+    def test_colorize_only_first_level_per_line(self):
+        colored = self.colorize(b'app - ERROR - request ERROR\n', 1024)
+        self.assertEqual(colored.count(b'\x1b[31m'), 1)
+    
+    def test_command_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            src = os.path.join(directory, 'colored.log')
+            dst = os.path.join(directory, 'plain.log')
+            with open(src, 'wb') as f:
+                f.write(COLORED)
+            
+            self.assertEqual(main(['strip', src, '-o', dst]), 0)
+            with open(dst, 'rb') as f:
+                self.assertNotIn(b'\x1b', f.read())
+            
+            for argv in (['strip', os.path.join(directory, 'missing.log')],
+                         ['colorize', src, '-o', os.path.join(directory, 'no', 'such', 'dir.log')],
+                         ['colorize', directory]):
+                errors = StringIO()
+                with patch.object(sys, 'stderr', errors):
+                    self.assertEqual(main(argv), 2)
+                self.assertTrue(errors.getvalue().startswith(f'python -m smartlogger {argv[0]}: error: '))
+                self.assertEqual(errors.getvalue().count('\n'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
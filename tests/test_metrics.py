@@ -0,0 +1,84 @@
+import unittest
+import os
+import json
+import logging
+import tempfile
+import urllib.request
+from io import StringIO
+from smartlogger.core.handler import ColorHandler
+from smartlogger.core.load_shedding import LoadShedder
+from smartlogger.core.metrics import Histogram, Metrics, MetricsExporter
+
+class TestMetrics(unittest.TestCase):
+    
+    def setUp(self):
+        self.metrics = Metrics()
+        self.stream = StringIO()
+    
+    def make_record(self, level=logging.INFO, msg='Test message'):
+        return logging.LogRecord('test', level, 'test.py', 1, msg, (), None)
+    
+    def test_histogram_buckets_and_quantiles(self):
+        histogram = Histogram()
+        for _ in range(99):
+            histogram.observe(0.000003)
+        histogram.observe(0.002)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 100)
+        self.assertEqual(snapshot['p50'], 0.000004)
+        self.assertEqual(snapshot['p99'], 0.000004)
+        self.assertEqual(snapshot['max'], 0.002)
+        self.assertEqual(snapshot['buckets_us'], {'4': 99, '2048': 1})
+    
+    def test_handler_records_counts_bytes_and_timings(self):
+        handler = ColorHandler(self.stream, metrics=self.metrics)
+        handler.handle(self.make_record())
+        handler.handle(self.make_record(logging.ERROR))
+        
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['counters']['records.INFO'], 1)
+        self.assertEqual(snapshot['counters']['records.ERROR'], 1)
+        self.assertEqual(snapshot['counters']['chars_written'], len(self.stream.getvalue()))
+        for name in ('format_time', 'write_time', 'lock_wait'):
+            self.assertEqual(snapshot['histograms'][name]['count'], 2, name)
+    
+    def test_disabled_metrics_leave_no_instance_overrides(self):
+        handler = ColorHandler(self.stream)
+        self.assertNotIn('emit', handler.__dict__)
+        self.assertNotIn('format', handler.formatter.__dict__)
+        
+        handler.metrics = self.metrics
+        self.assertIn('emit', handler.__dict__)
+        handler.metrics = None
+        for name in ('acquire', 'emit', '_write', '_write_buffer'):
+            self.assertNotIn(name, handler.__dict__)
+        handler.handle(self.make_record())
+        self.assertEqual(self.metrics.snapshot()['counters'], {})
+    
+    def test_buffer_flushes_and_shed_records_are_counted(self):
+        shedder = LoadShedder(0.01, 0.001, smoothing=1.0, escalate_after=0.0, recover_after=3600.0)
+        handler = ColorHandler(self.stream, buffer_size=1 << 20, shedder=shedder, metrics=self.metrics)
+        shedder.stage = 3
+        handler.handle(self.make_record(logging.DEBUG))
+        handler.handle(self.make_record(logging.WARNING))
+        handler.flush()
+        
+        self.assertEqual(self.metrics.counter('dropped.DEBUG'), 1)
+        self.assertEqual(self.metrics.counter('records.WARNING'), 1)
+        self.assertEqual(self.metrics.histogram('flush_time').count, 1)
+    
+    def test_exporter_writes_file_and_serves_http(self):
+        self.metrics.increment('records.INFO', 3)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'metrics.json')
+            with MetricsExporter(self.metrics, path, interval=60.0, address=('127.0.0.1', 0)) as exporter:
+                host, port = exporter.address
+                with urllib.request.urlopen(f'http://{host}:{port}/') as response:
+                    served = json.loads(response.read())
+            with open(path, encoding='utf-8') as f:
+                written = json.load(f)
+        self.assertEqual(served['counters'], {'records.INFO': 3})
+        self.assertEqual(written['counters'], {'records.INFO': 3})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+import os
+import sys
+import logging
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core import monkey_patch
+from smartlogger.core.metrics import Metrics
+from smartlogger.core.monkey_patch import patch_logging, unpatch_logging
+from smartlogger.utils.terminal import invalidate_color_cache
+
+class FakeTTY(StringIO):
+    def isatty(self):
+        return True
+
+class TestTargetedPatching(unittest.TestCase):
+    
+    def setUp(self):
+        unpatch_logging()
+        self.tty = FakeTTY()
+        self.env = patch.dict(os.environ, {'FORCE_COLOR': '1', 'NO_COLOR': ''})
+        self.stderr = patch.object(sys, 'stderr', self.tty)
+        self.env.start()
+        self.stderr.start()
+    
+    def emit(self, handler):
+        handler.handle(logging.LogRecord('test', logging.INFO, 'test.py', 1, 'Test message', (), None))
+    
+    def tearDown(self):
+        unpatch_logging()
+        self.stderr.stop()
+        self.env.stop()
+        invalidate_color_cache()
+    
+    def test_handler_emit_is_not_replaced(self):
+        original_emit = logging.Handler.emit
+        original_stream_emit = logging.StreamHandler.emit
+        patch_logging()
+        self.assertIs(logging.Handler.emit, original_emit)
+        self.assertIs(logging.StreamHandler.emit, original_stream_emit)
+    
+    def test_terminal_handler_gets_color_formatter(self):
+        patch_logging()
+        handler = logging.StreamHandler()
+        self.assertIsNone(handler.formatter)
+        self.emit(handler)
+        self.assertIsInstance(handler.formatter, ColorFormatter)
+        
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        self.emit(handler)
+        self.assertIsInstance(handler.formatter, ColorFormatter)
+        self.assertEqual(handler.formatter._fmt, '%(levelname)s %(message)s')
+    
+    def test_terminal_probing_waits_for_first_record(self):
+        patch_logging()
+        handler = logging.StreamHandler()
+        with patch.object(monkey_patch, 'get_color_capability') as mock_capability:
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            mock_capability.assert_not_called()
+            self.emit(handler)
+            self.emit(handler)
+            mock_capability.assert_called_once_with(self.tty)
+    
+    def test_non_terminal_handlers_are_untouched(self):
+        patch_logging()
+        formatter = logging.Formatter('%(message)s')
+        
+        stream_handler = logging.StreamHandler(StringIO())
+        stream_handler.setFormatter(formatter)
+        self.assertIs(stream_handler.formatter, formatter)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            file_handler = logging.FileHandler(os.path.join(directory, 'app.log'))
+            file_handler.setFormatter(formatter)
+            self.assertIs(file_handler.formatter, formatter)
+            file_handler.close()
+    
+    def test_set_stream_rebinds(self):
+        patch_logging()
+        formatter = logging.Formatter('%(message)s')
+        handler = logging.StreamHandler(StringIO())
+        handler.setFormatter(formatter)
+        
+        handler.setStream(sys.stderr)
+        self.emit(handler)
+        self.assertIsInstance(handler.formatter, ColorFormatter)
+        handler.setStream(StringIO())
+        self.assertIs(handler.formatter, formatter)
+    
+    def test_color_delegate_is_lazy_and_shared(self):
+        patch_logging()
+        fmt = '%(name)s :: %(message)s'
+        first = logging.Formatter(fmt)
+        second = logging.Formatter(fmt)
+        self.assertNotIn((fmt, None, '%'), monkey_patch._shared_color_formatters)
+        
+        self.assertIs(first._color_formatter, second._color_formatter)
+        self.assertIsNot(first._color_formatter, logging.Formatter('%(message)s')._color_formatter)
+    
+    def test_unpatch_restores_everything(self):
+        formatter = logging.Formatter('%(message)s')
+        handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
+        original_attrs = dict(logging.StreamHandler.__dict__)
+        
+        patch_logging()
+        self.emit(handler)
+        self.assertIsInstance(handler.formatter, ColorFormatter)
+        unpatch_logging()
+        
+        self.assertIs(handler.formatter, formatter)
+        self.assertNotIn('emit', handler.__dict__)
+        self.assertEqual(dict(logging.StreamHandler.__dict__), original_attrs)
+        self.assertNotIn('_smartlogger_formatter', handler.__dict__)
+    
+    def test_metrics_cover_patched_emit_path(self):
+        metrics = Metrics()
+        patch_logging(metrics=metrics)
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        self.emit(handler)
+        self.emit(handler)
+        
+        self.assertEqual(metrics.counter('records.INFO'), 2)
+        self.assertEqual(metrics.histogram('emit_time').count, 2)
+        self.assertEqual(metrics.histogram('format_time').count, 2)
+        
+        unpatch_logging()
+        self.assertNotIn('emit', handler.__dict__)
+        self.assertIsNone(monkey_patch._shared_color_formatter('%(levelname)s %(message)s', None, '%').metrics)
+    
+    def test_handler_metrics_survive_patching(self):
+        from smartlogger.core.handler import ColorHandler
+        handler_metrics = Metrics()
+        patch_logging(metrics=Metrics())
+        handlers = [ColorHandler(StringIO(), metrics=handler_metrics), ColorHandler(metrics=handler_metrics)]
+        for handler in handlers:
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.emit(handler)
+        
+        unpatch_logging()
+        for handler in handlers:
+            self.emit(handler)
+        self.assertEqual(handler_metrics.counter('records.INFO'), 4)
+        self.assertNotIn('_smartlogger_inner_emit', handlers[1].__dict__)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import sys
+import logging
+import multiprocessing
+import pickle
+import time
+from multiprocessing.connection import Client
+from io import StringIO
+from smartlogger.core.handler import ColorHandler
+from smartlogger.core.multiprocess import (
+    LogCollector, install_worker_logging, serialize_record, deserialize_record
+)
+
+def worker(initargs, worker_id, count, crash):
+    install_worker_logging(*initargs)
+    logger = logging.getLogger('worker')
+    for i in range(count):
+        logger.warning("worker %d record %d", worker_id, i, extra={'request_id': f'r{i}'})
+    if crash:
+        os._exit(1)
+
+class TestMultiprocessLogging(unittest.TestCase):
+    
+    def run_workers(self, method):
+        stream = StringIO()
+        collector = LogCollector(ColorHandler(stream)).start()
+        context = multiprocessing.get_context(method)
+        processes = [
+            context.Process(target=worker, args=(collector.initargs, worker_id, 20, worker_id == 1))
+            for worker_id in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+        collector.stop()
+        return collector, stream.getvalue().splitlines()
+    
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), 'requires fork')
+    def test_fork_workers_are_collected(self):
+        collector, lines = self.run_workers('fork')
+        self.assertEqual(collector.received, 60)
+        self.assertEqual(len(lines), 60)
+    
+    def test_spawn_workers_are_collected_even_when_one_dies(self):
+        collector, lines = self.run_workers('spawn')
+        self.assertEqual(len(lines), 60)
+        for worker_id in range(3):
+            self.assertTrue(any(line.endswith(f"worker {worker_id} record 19") for line in lines))
+    
+    def test_bad_payloads_are_reported_and_reading_continues(self):
+        stream = StringIO()
+        handler = ColorHandler(stream)
+        errors = []
+        handler.handleError = lambda record: errors.append((record.getMessage(), sys.exc_info()[0]))
+        record = logging.LogRecord('app', logging.WARNING, 'app.py', 1, 'still here', (), None)
+        
+        with LogCollector(handler) as collector:
+            connection = Client(collector.address, authkey=collector.initargs[1])
+            connection.send_bytes(b'not a pickle')
+            connection.send_bytes(pickle.dumps(('too', 'short')))
+            connection.send_bytes(pickle.dumps(serialize_record(record)))
+            connection.close()
+            for _ in range(200):
+                if 'still here' in stream.getvalue():
+                    break
+                time.sleep(0.01)
+        
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(errors[0][0], 'undecodable record from a worker (12 bytes)')
+        self.assertIsNotNone(errors[1][1])
+        self.assertIn('still here', stream.getvalue())
+    
+    def test_record_round_trip(self):
+        try:
+            raise KeyError('missing')
+        except KeyError:
+            record = logging.LogRecord('app', logging.ERROR, 'app.py', 7, 'lookup %s', ('x',), sys.exc_info())
+        record.request_id = 'abc'
+        record.unpicklable = object()
+        
+        restored = deserialize_record(serialize_record(record))
+        self.assertEqual(restored.getMessage(), 'lookup x')
+        self.assertEqual(restored.levelno, logging.ERROR)
+        self.assertEqual(restored.lineno, 7)
+        self.assertEqual(restored.request_id, 'abc')
+        self.assertFalse(hasattr(restored, 'unpicklable'))
+        self.assertIn("KeyError: 'missing'", restored.exc_text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import os
+import json
+import logging
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from smartlogger.core import monkey_patch
+from smartlogger.core.profiler import CallSiteProfiler
+
+def log_noisy(logger):
+    logger.info("noisy %s", 'x' * 100)
+
+def log_quiet(logger):
+    logger.info("quiet")
+
+class TestCallSiteProfiler(unittest.TestCase):
+    
+    def setUp(self):
+        self.stream = StringIO()
+        self.logger = logging.getLogger('test_profiler')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.handler = logging.StreamHandler(self.stream)
+        self.logger.addHandler(self.handler)
+        self.original_handle = logging.Logger.handle
+        self.original_format = logging.Handler.format
+    
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        logging.Logger.handle = self.original_handle
+        logging.Handler.format = self.original_format
+    
+    def test_costs_are_attributed_to_call_sites(self):
+        profiler = CallSiteProfiler(1.0).start()
+        try:
+            for _ in range(5):
+                log_noisy(self.logger)
+            log_quiet(self.logger)
+        finally:
+            profiler.stop()
+        
+        self.assertIs(logging.Logger.handle, self.original_handle)
+        self.assertIs(logging.Handler.format, self.original_format)
+        top, second = profiler.rows(sort='bytes')
+        self.assertEqual(top['funcName'], 'log_noisy')
+        self.assertEqual(top['records'], 5)
+        self.assertEqual(top['bytes'], 5 * len('noisy ' + 'x' * 100))
+        self.assertEqual(second['funcName'], 'log_quiet')
+        self.assertEqual(top['pathname'], __file__)
+    
+    def test_sampling_scales_estimates(self):
+        profiler = CallSiteProfiler(0.1).start()
+        try:
+            for _ in range(1000):
+                log_quiet(self.logger)
+                log_noisy(self.logger)
+                log_quiet(self.logger)
+                log_quiet(self.logger)
+        finally:
+            profiler.stop()
+        self.assertTrue(250 < profiler.sampled < 550, profiler.sampled)
+        records = {row['funcName']: row['records'] for row in profiler.rows()}
+        self.assertEqual(set(records), {'log_quiet', 'log_noisy'})
+        self.assertTrue(500 < records['log_noisy'] < 1500, records)
+        self.assertEqual(profiler.snapshot()['estimated_records'], profiler.sampled * 10)
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 4000)
+    
+    def test_report_table_and_json_output(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.json')
+            report = StringIO()
+            profiler = CallSiteProfiler(1.0, output=path, report_stream=report).start(at_exit=True)
+            log_noisy(self.logger)
+            profiler.finish()
+            
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        self.assertEqual(data['sampled'], 1)
+        self.assertEqual(data['sites'][0]['funcName'], 'log_noisy')
+        self.assertIn('(log_noisy)', report.getvalue())
+        self.assertNotIn('\033[', report.getvalue())
+        self.assertIn('\033[', profiler.format_report(color=True))
+    
+    def test_enabled_from_environment_by_patch_logging(self):
+        monkey_patch.unpatch_logging()
+        with tempfile.TemporaryDirectory() as directory:
+            env = {'SMARTLOGGER_PROFILE': '0.5', 'SMARTLOGGER_PROFILE_OUTPUT': os.path.join(directory, 'p.json')}
+            with patch.dict(os.environ, env):
+                monkey_patch.patch_logging()
+            try:
+                profiler = monkey_patch._profiler
+                self.assertEqual(profiler.scale, 2.0)
+                self.assertIsNot(logging.Logger.handle, self.original_handle)
+            finally:
+                monkey_patch.unpatch_logging()
+                profiler.report_stream = None
+                profiler.finish()
+        self.assertIs(logging.Logger.handle, self.original_handle)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import gc
+import logging
+import threading
+import weakref
+from io import StringIO
+from smartlogger.core.queue_handler import QueueColorHandler
+
+class BlockingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.messages = []
+    
+    def emit(self, record):
+        self.started.set()
+        self.release.wait()
+        self.messages.append(record.getMessage())
+
+def make_record(msg, level=logging.INFO):
+    return logging.LogRecord('test', level, 'test.py', 1, msg, (), None)
+
+class TestQueueColorHandler(unittest.TestCase):
+    
+    def test_records_are_written_by_background_thread(self):
+        stream = StringIO()
+        handler = QueueColorHandler(stream)
+        for i in range(100):
+            handler.handle(make_record(f"message {i}"))
+        handler.flush()
+        
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 100)
+        self.assertTrue(lines[0].endswith("message 0"))
+        self.assertTrue(lines[-1].endswith("message 99"))
+        self.assertEqual(handler.queue_depth(), 0)
+        handler.close()
+    
+    def test_drop_oldest_policy(self):
+        target = BlockingHandler()
+        handler = QueueColorHandler(maxsize=2, overflow='drop_oldest', target=target)
+        handler.handle(make_record("in flight"))
+        target.started.wait(1)
+        
+        for msg in ("a", "b", "c"):
+            handler.handle(make_record(msg))
+        self.assertEqual(handler.queue_depth(), 2)
+        self.assertEqual(handler.dropped, 1)
+        
+        target.release.set()
+        handler.close()
+        self.assertEqual(target.messages, ["in flight", "b", "c"])
+    
+    def test_drop_lower_policy_keeps_warnings(self):
+        target = BlockingHandler()
+        handler = QueueColorHandler(maxsize=1, overflow='drop_lower', target=target)
+        handler.handle(make_record("in flight"))
+        target.started.wait(1)
+        
+        handler.handle(make_record("queued"))
+        handler.handle(make_record("dropped", logging.DEBUG))
+        self.assertEqual(handler.dropped, 1)
+        
+        producer = threading.Thread(target=handler.handle, args=(make_record("kept", logging.ERROR),))
+        producer.start()
+        target.release.set()
+        producer.join(1)
+        handler.close()
+        self.assertEqual(target.messages, ["in flight", "queued", "kept"])
+    
+    def test_emit_after_close_writes_synchronously(self):
+        stream = StringIO()
+        handler = QueueColorHandler(stream)
+        handler.close()
+        handler.handle(make_record("late message"))
+        self.assertIn("late message", stream.getvalue())
+    
+    def test_message_is_frozen_before_queuing(self):
+        target = BlockingHandler()
+        handler = QueueColorHandler(target=target)
+        handler.handle(make_record("in flight"))
+        target.started.wait(1)
+        
+        items = ['a']
+        record = logging.LogRecord('test', logging.INFO, 'test.py', 1, 'items=%s', (items,), None)
+        handler.handle(record)
+        items.append('b')
+        self.assertEqual(record.args, (items,))
+        
+        target.release.set()
+        handler.close()
+        self.assertEqual(target.messages, ["in flight", "items=['a']"])
+    
+    def test_handlers_are_freed(self):
+        for close in (True, False):
+            handler = QueueColorHandler(StringIO())
+            handler.handle(make_record("message"))
+            if close:
+                handler.close()
+            thread = handler._thread
+            ref = weakref.ref(handler)
+            del handler
+            gc.collect()
+            self.assertIsNone(ref())
+            thread.join(1)
+            self.assertFalse(thread.is_alive())
+    
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            QueueColorHandler(overflow='unknown')
+
+if __name__ == '__main__':
+    unittest.main()
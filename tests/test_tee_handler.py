@@ -0,0 +1,80 @@
+import unittest
+import os
+import sys
+import logging
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from smartlogger.config.colors import Colors
+from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core.highlighter import Highlighter
+from smartlogger.core.tee_handler import TeeColorHandler
+
+class TestTeeColorHandler(unittest.TestCase):
+    
+    def setUp(self):
+        self.terminal = StringIO()
+        self.file_sink = StringIO()
+        self.handler = TeeColorHandler(self.terminal, [self.file_sink])
+        self.handler.formatter.enable_colors()
+        self.record = logging.LogRecord('test', logging.WARNING, 'test.py', 1, 'Disk %d%% full', (91,), None)
+    
+    def test_colored_terminal_and_plain_file(self):
+        self.handler.handle(self.record)
+        colored = self.terminal.getvalue()
+        plain = self.file_sink.getvalue()
+        
+        self.assertIn(Colors.colorize('WARNING', Colors.YELLOW), colored)
+        self.assertNotIn('\033[', plain)
+        self.assertEqual(Colors.strip_colors(colored), plain)
+    
+    def test_segments_match_single_format_passes(self):
+        formatter = ColorFormatter('%(levelname)-8s|%(name)s %(message)s [%(levelname)s]')
+        formatter.enable_colors()
+        plain, colored = formatter.format_segments(self.record)
+        self.assertEqual(colored, formatter.format(self.record))
+        
+        formatter.disable_colors()
+        self.assertEqual(plain, formatter.format(self.record))
+    
+    def test_segments_include_exception_text(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord('test', logging.ERROR, 'test.py', 1, 'Failed', (), sys.exc_info())
+        self.handler.handle(record)
+        self.assertIn('ValueError: boom', self.file_sink.getvalue())
+        self.assertIn('ValueError: boom', self.terminal.getvalue())
+    
+    def test_file_paths_are_opened_and_closed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'app.log')
+            handler = TeeColorHandler(self.terminal, [path])
+            handler.formatter.enable_colors()
+            handler.handle(self.record)
+            handler.close()
+            
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+            self.assertIn('Disk 91% full', content)
+            self.assertNotIn('\033[', content)
+    
+    def test_segments_are_rendered_once(self):
+        with patch.object(ColorFormatter, 'format', side_effect=AssertionError('formatted twice')):
+            self.handler.handle(self.record)
+        self.assertIn('Disk 91% full', self.file_sink.getvalue())
+    
+    def test_highlighted_and_themed_segments_are_rendered_once(self):
+        formatter = ColorFormatter('%(levelname)s %(name)s: %(message)s', highlighter=Highlighter(), theme='nord')
+        formatter.enable_colors()
+        expected = formatter.format(self.record)
+        self.handler.setFormatter(formatter)
+        with patch.object(ColorFormatter, 'format', side_effect=AssertionError('formatted twice')):
+            self.handler.handle(self.record)
+        
+        self.assertEqual(self.terminal.getvalue(), expected + '\n')
+        self.assertEqual(self.file_sink.getvalue(), 'WARNING test: Disk 91% full\n')
+        self.assertNotEqual(Colors.strip_colors(expected), expected)
+
+if __name__ == '__main__':
+    unittest.main()
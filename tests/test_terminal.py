@@ -0,0 +1,68 @@
+import unittest
+import os
+import sys
+from io import StringIO
+from unittest.mock import patch
+from smartlogger.utils import terminal
+from smartlogger.utils.terminal import (
+    get_color_capability, stream_supports_color, invalidate_color_cache, is_stream_tty
+)
+
+class FakeTTY(StringIO):
+    def isatty(self):
+        return True
+
+class TestColorCapability(unittest.TestCase):
+    
+    def tearDown(self):
+        invalidate_color_cache()
+    
+    def test_non_tty_stream_has_no_color(self):
+        with patch.object(terminal, 'is_ide_environment', return_value=False):
+            stream = StringIO()
+            self.assertFalse(is_stream_tty(stream))
+            self.assertFalse(stream_supports_color(stream))
+    
+    def test_capability_is_cached_per_stream(self):
+        stream = FakeTTY()
+        capability = get_color_capability(stream)
+        self.assertIs(get_color_capability(stream), capability)
+        self.assertIsNot(get_color_capability(FakeTTY()), capability)
+    
+    def test_detection_runs_once_per_stream(self):
+        stream = FakeTTY()
+        with patch.object(terminal, 'is_stream_supports_color', return_value=True) as mock_detect:
+            for _ in range(10):
+                stream_supports_color(stream)
+            self.assertEqual(mock_detect.call_count, 1)
+    
+    def test_invalidate_after_env_change(self):
+        stream = FakeTTY()
+        with patch.dict(os.environ, {'FORCE_COLOR': '1', 'NO_COLOR': ''}):
+            capability = get_color_capability(stream)
+            self.assertTrue(capability.enabled)
+            
+            os.environ['NO_COLOR'] = '1'
+            self.assertTrue(capability.enabled)
+            invalidate_color_cache()
+            self.assertFalse(capability.enabled)
+    
+    def test_standard_capability_follows_replaced_stdout(self):
+        capability = get_color_capability()
+        with patch.dict(os.environ, {'FORCE_COLOR': '1', 'NO_COLOR': ''}):
+            with patch.object(sys, 'stdout', FakeTTY()):
+                invalidate_color_cache(sys.stdout)
+                self.assertTrue(capability.enabled)
+            with patch.object(terminal, 'is_ide_environment', return_value=False):
+                with patch.object(sys, 'stdout', StringIO()):
+                    invalidate_color_cache()
+                    self.assertFalse(capability.enabled)
+    
+    def test_ide_heuristic_only_applies_to_standard_streams(self):
+        with patch.dict(os.environ, {'TERM_PROGRAM': 'vscode', 'FORCE_COLOR': '', 'NO_COLOR': ''}):
+            self.assertFalse(terminal.is_stream_supports_color(StringIO()))
+            with patch.object(sys, 'stdout', StringIO()):
+                self.assertTrue(terminal.is_stream_supports_color(sys.stdout))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import json
+import logging
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from smartlogger.config.colors import Colors
+from smartlogger.config.themes import Theme, parse_style, load_theme, get_theme
+from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core.highlighter import DEFAULT_RULES, Highlighter
+from smartlogger.utils.terminal import DEPTH_NONE, DEPTH_16, DEPTH_256, DEPTH_TRUECOLOR, stream_color_depth, invalidate_color_cache
+
+class FakeTTY(StringIO):
+    def isatty(self):
+        return True
+
+class TestTheme(unittest.TestCase):
+    
+    def tearDown(self):
+        invalidate_color_cache()
+    
+    def test_styles_degrade_to_terminal_depth(self):
+        style = parse_style('bold #ff8700')
+        self.assertEqual(style.escape(DEPTH_TRUECOLOR), '\033[1;38;2;255;135;0m')
+        self.assertEqual(style.escape(DEPTH_256), '\033[1;38;5;208m')
+        self.assertEqual(style.escape(DEPTH_16), '\033[1;33m')
+        self.assertEqual(style.escape(DEPTH_NONE), '')
+        self.assertEqual(parse_style('bright_red on color(236)').escape(DEPTH_16), '\033[91;40m')
+        self.assertEqual(parse_style('red').escape(DEPTH_TRUECOLOR), Colors.RED)
+        with self.assertRaises(ValueError):
+            parse_style('#zzzzzz')
+    
+    def test_compiled_tables(self):
+        theme = Theme('test', levels={'INFO': 'green', 'ERROR': 'red', 'NOTICE': 'cyan'}, loggers={'app.db': 'blue', '*': 'white'})
+        compiled = theme.compile(DEPTH_16)
+        self.assertIs(theme.compile(DEPTH_16), compiled)
+        self.assertEqual(compiled.level_codes[logging.DEBUG], '')
+        self.assertEqual(compiled.level_codes[25], Colors.GREEN)
+        self.assertEqual(compiled.level_code(logging.CRITICAL + 10), Colors.RED)
+        self.assertEqual(compiled.level_names['ERROR'], Colors.colorize('ERROR', Colors.RED))
+        self.assertEqual(compiled.color_level('NOTICE'), Colors.colorize('NOTICE', Colors.CYAN))
+        
+        self.assertEqual(compiled.color_logger('app.db.pool'), Colors.colorize('app.db.pool', Colors.BLUE))
+        self.assertEqual(compiled.color_logger('app.web'), Colors.colorize('app.web', Colors.WHITE))
+        self.assertIn('app.db.pool', compiled.logger_names)
+    
+    def test_load_from_json_and_toml(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, 'ocean.json')
+            with open(json_path, 'w') as f:
+                json.dump({'levels': {'WARNING': '#ffaf00'}, 'highlights': {'number': 141}}, f)
+            theme = load_theme(json_path)
+            self.assertEqual(theme.name, 'ocean')
+            self.assertEqual(theme.compile(DEPTH_256).level_codes[logging.WARNING], '\033[38;5;214m')
+            self.assertIsInstance(get_theme(json_path), Theme)
+            
+            toml_path = os.path.join(tmp, 'dusk.toml')
+            with open(toml_path, 'w') as f:
+                f.write('name = "dusk"\n[levels]\nERROR = "bold color(197)"\n[loggers]\n"app" = "cyan"\n')
+            try:
+                theme = load_theme(toml_path)
+            except ImportError:
+                self.skipTest('no TOML parser available')
+            self.assertEqual(theme.name, 'dusk')
+            self.assertEqual(theme.compile(DEPTH_256).level_names['ERROR'], '\033[1;38;5;197mERROR\033[0m')
+        
+        with self.assertRaises(ValueError):
+            Theme.from_dict({'colours': {}})
+        with self.assertRaises(ValueError):
+            get_theme('no-such-theme')
+    
+    def test_depth_is_detected_once_per_stream(self):
+        stream = FakeTTY()
+        with patch.dict(os.environ, {'FORCE_COLOR': '1', 'NO_COLOR': '', 'COLORTERM': 'truecolor'}):
+            self.assertEqual(stream_color_depth(stream), DEPTH_TRUECOLOR)
+            os.environ['COLORTERM'] = ''
+            os.environ['TERM'] = 'xterm-256color'
+            self.assertEqual(stream_color_depth(stream), DEPTH_TRUECOLOR)
+            invalidate_color_cache(stream)
+            self.assertEqual(stream_color_depth(stream), DEPTH_256)
+        self.assertEqual(stream_color_depth(StringIO()), DEPTH_NONE)
+    
+    def test_formatter_applies_theme(self):
+        record = logging.LogRecord('app.db', logging.WARNING, 'test.py', 1, 'took %dms', (42,), None)
+        stream = FakeTTY()
+        with patch.dict(os.environ, {'FORCE_COLOR': '2', 'NO_COLOR': ''}):
+            for compiled in (True, False):
+                highlighter = Highlighter()
+                formatter = ColorFormatter('%(levelname)s %(name)s %(message)s', compiled=compiled, theme='monokai', stream=stream, highlighter=highlighter)
+                expected = ('\033[38;5;208mWARNING\033[0m \033[38;5;81mapp.db\033[0m took '
+                            '\033[38;5;141m42\033[0mms')
+                self.assertEqual(formatter.format(record), expected)
+                self.assertEqual(formatter.format_segments(record), ('WARNING app.db took 42ms', expected))
+                self.assertEqual(record.name, 'app.db')
+                
+                formatter.theme = None
+                formatter.highlighter = None
+                self.assertEqual(formatter.format(record), Colors.colorize('WARNING', Colors.YELLOW) + ' app.db took 42ms')
+    
+    def test_shared_highlighter_and_custom_levels(self):
+        highlighter = Highlighter()
+        nord = ColorFormatter('%(levelname)s %(message)s', theme='nord', highlighter=highlighter)
+        default = ColorFormatter('%(levelname)s %(message)s', theme='default', highlighter=highlighter)
+        for formatter in (nord, default):
+            formatter.enable_colors()
+        record = logging.LogRecord('app', 25, 'test.py', 1, 'took %dms', (42,), None)
+        
+        number = nord._palette.highlights['number']
+        self.assertNotEqual(number, Colors.BRIGHT_CYAN)
+        self.assertIn(f"{number}42{Colors.RESET}", nord.format(record))
+        self.assertIn(Colors.colorize('42', Colors.BRIGHT_CYAN), default.format(record))
+        self.assertIn(('number', DEFAULT_RULES[-1][1], Colors.BRIGHT_CYAN), highlighter.rules)
+        
+        self.assertTrue(default.format(record).startswith(Colors.colorize('Level 25', Colors.GREEN)))
+        nord.theme = None
+        self.assertIs(nord.highlighter, highlighter)
+
+if __name__ == '__main__':
+    unittest.main()
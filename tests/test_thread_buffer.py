@@ -0,0 +1,101 @@
+import unittest
+import gc
+import logging
+import threading
+import weakref
+from io import StringIO
+from smartlogger.core.thread_buffer import ThreadBufferedColorHandler
+
+class TestThreadBufferedColorHandler(unittest.TestCase):
+    
+    def setUp(self):
+        self.stream = StringIO()
+    
+    def make_handler(self, **kwargs):
+        handler = ThreadBufferedColorHandler(self.stream, **kwargs)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        return handler
+    
+    def record(self, msg, level=logging.INFO):
+        return logging.LogRecord('test', level, 'test.py', 1, msg, (), None)
+    
+    def test_per_thread_order_is_preserved(self):
+        handler = self.make_handler(window=0.005, max_pending=64)
+        
+        def work(worker):
+            for i in range(300):
+                handler.handle(self.record(f"{worker} {i}"))
+        
+        threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        handler.close()
+        
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 8 * 300)
+        seen = {}
+        for line in lines:
+            worker, i = map(int, line.split())
+            self.assertEqual(seen.get(worker, -1) + 1, i)
+            seen[worker] = i
+    
+    def test_records_wait_for_window_until_flush(self):
+        handler = self.make_handler(window=60.0)
+        handler.handle(self.record("first"))
+        handler.handle(self.record("second"))
+        self.assertEqual(self.stream.getvalue(), '')
+        self.assertEqual(handler.pending(), 2)
+        
+        handler.flush()
+        self.assertEqual(self.stream.getvalue(), 'first\nsecond\n')
+        handler.close()
+    
+    def test_max_pending_bounds_the_buffer(self):
+        handler = self.make_handler(window=60.0, max_pending=10)
+        for i in range(25):
+            handler.handle(self.record(f"record {i}"))
+            self.assertLess(handler.pending(), 10)
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 20)
+        handler.close()
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 25)
+    
+    def test_merge_follows_sequence_across_threads(self):
+        handler = self.make_handler(window=60.0)
+        order = []
+        for index in range(6):
+            thread = threading.Thread(target=lambda index=index: handler.handle(self.record(f"record {index}")))
+            thread.start()
+            thread.join()
+            order.append(f"record {index}")
+        handler.close()
+        self.assertEqual(self.stream.getvalue().splitlines(), order)
+    
+    def test_error_is_written_before_handle_returns(self):
+        handler = self.make_handler(window=60.0)
+        handler.handle(self.record("context"))
+        handler.handle(self.record("failure", logging.ERROR))
+        self.assertEqual(self.stream.getvalue(), 'context\nfailure\n')
+        self.assertEqual(handler.pending(), 0)
+        
+        handler.close()
+        handler.handle(self.record("late"))
+        self.assertTrue(self.stream.getvalue().endswith('late\n'))
+    
+    def test_handlers_are_freed(self):
+        for close in (True, False):
+            handler = ThreadBufferedColorHandler(StringIO(), window=60.0)
+            handler.handle(self.record("message"))
+            if close:
+                handler.close()
+            thread = handler._merger
+            ref = weakref.ref(handler)
+            del handler
+            gc.collect()
+            self.assertIsNone(ref())
+            thread.join(1)
+            self.assertFalse(thread.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import gc
+import logging
+import sys
+import weakref
+from smartlogger.config.colors import Colors
+from smartlogger.core.formatter import ColorFormatter
+from smartlogger.core.tracebacks import TracebackCache
+
+def fail(item):
+    raise ValueError(f"bad item {item}")
+
+def fail_chained(item):
+    try:
+        fail(item)
+    except ValueError as e:
+        raise RuntimeError('lookup failed') from e
+
+def capture(func, *args):
+    try:
+        func(*args)
+    except Exception:
+        return sys.exc_info()
+
+def make_record(ei):
+    return logging.LogRecord('test', logging.ERROR, __file__, 1, 'failed', None, ei)
+
+class TestTracebackCache(unittest.TestCase):
+    
+    def test_plain_output_matches_stdlib(self):
+        formatter = ColorFormatter()
+        stdlib = logging.Formatter()
+        for func in (fail, fail_chained):
+            for item in range(3):
+                ei = capture(func, item)
+                self.assertEqual(formatter.formatException(ei), stdlib.formatException(ei))
+        self.assertEqual((formatter.tracebacks.misses, formatter.tracebacks.hits), (2, 4))
+    
+    def test_colored_frames(self):
+        record = make_record(capture(fail, 1))
+        for compiled in (True, False):
+            formatter = ColorFormatter('%(message)s', compiled=compiled)
+            formatter.enable_colors()
+            text = formatter.format(record)
+            self.assertIn(f'{Colors.DIM}File "{__file__}", line {fail.__code__.co_firstlineno + 1}{Colors.RESET}, in fail', text)
+            self.assertIn(Colors.BRIGHT_YELLOW + Colors.BOLD + 'raise ValueError(f"bad item {item}")' + Colors.RESET, text)
+            self.assertTrue(text.endswith(Colors.colorize('ValueError: bad item 1', Colors.RED + Colors.BOLD)))
+            self.assertIsNone(record.exc_text)
+        
+        plain, colored = formatter.format_segments(record)
+        self.assertEqual(plain, 'failed\n' + logging.Formatter().formatException(record.exc_info))
+        self.assertIn('in fail', Colors.strip_colors(colored))
+    
+    def test_repeats_within_window_are_referenced(self):
+        formatter = ColorFormatter('%(message)s', traceback_window=60.0)
+        first = make_record(capture(fail, 1))
+        self.assertTrue(formatter.format(first).startswith('failed\nTraceback #1 (most recent call last):'))
+        
+        second = make_record(capture(fail, 2))
+        formatter.enable_colors()
+        plain, colored = formatter.format_segments(second)
+        self.assertEqual(plain, 'failed\n[same traceback as #1] ValueError: bad item 2')
+        self.assertEqual(Colors.strip_colors(colored), plain)
+        
+        other = make_record(capture(fail_chained, 3))
+        self.assertIn('Traceback #2 (most recent call last):', formatter.format(other))
+        
+        formatter.tracebacks.window = 0.0
+        self.assertIn('Traceback #1', formatter.format(make_record(capture(fail, 4))))
+    
+    def test_frames_are_not_kept_alive(self):
+        class Payload:
+            pass
+        
+        def fail_holding(payload):
+            raise ValueError('boom')
+        
+        payload = Payload()
+        ref = weakref.ref(payload)
+        formatter = ColorFormatter('%(message)s', traceback_window=60.0)
+        record = make_record(capture(fail_holding, payload))
+        formatter.format(record)
+        formatter.formatException(record.exc_info)
+        del payload, record
+        gc.collect()
+        self.assertIsNone(ref())
+    
+    def test_cache_is_bounded(self):
+        cache = TracebackCache(maxsize=2)
+        for func in (fail, fail_chained, lambda item: {}[item]):
+            self.assertIsNotNone(cache.render(capture(func, 1)))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.render((None, None, None)))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+    
+    def test_cache_can_be_disabled(self):
+        formatter = ColorFormatter('%(message)s', traceback_cache=0)
+        formatter.enable_colors()
+        self.assertIsNone(formatter.tracebacks)
+        record = make_record(capture(fail, 1))
+        self.assertEqual(formatter.format(record), 'failed\n' + logging.Formatter().formatException(record.exc_info))
+
+if __name__ == '__main__':
+    unittest.main()